@@ -0,0 +1,217 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measures the time taken, and the memory allocated, to emulate a single clock cycle for each
+instruction type and variant. Run from the root of the repository with:
+
+    python -m benchmarks.microbenchmarks --output results.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import pioemu
+from pioemu import State
+from pioemu.emulation import create_state_machine
+
+
+@dataclass(frozen=True)
+class Case:
+    """A single instruction together with the options and state needed to emulate it."""
+
+    name: str
+    opcode: int
+    options: Dict[str, Any] = field(default_factory=dict)
+    initial_state: State = field(default_factory=State)
+
+
+_FULL_TRANSMIT_FIFO = State(transmit_fifo=deque([1, 2, 3, 4]))
+_FULL_RECEIVE_FIFO = State(receive_fifo=deque([1, 2, 3, 4]))
+
+CASES = [
+    *[
+        Case(f"jmp_{condition}", 0x0000 | (index << 5) | 2, {"jmp_pin": 0})
+        for index, condition in enumerate(
+            ["always", "not_x", "x_dec", "not_y", "y_dec", "x_ne_y", "pin", "not_osre"]
+        )
+    ],
+    Case("wait_gpio_met", 0x20A0, initial_state=State(pin_values=1)),
+    Case("wait_gpio_stalled", 0x20A0),
+    Case("wait_pin_met", 0x2020),
+    Case("wait_irq_met", 0x20C0, initial_state=State(irq_flags=1)),
+    Case("wait_irq_stalled", 0x20C0),
+    *[
+        Case(f"in_{source}", 0x4000 | (index << 5) | 8)
+        for index, source in enumerate(["pins", "x", "y", "null"])
+    ],
+    Case("in_isr", 0x40C8),
+    Case("in_osr", 0x40E8),
+    *[
+        Case(f"out_{destination}", 0x6000 | (index << 5) | 8)
+        for index, destination in enumerate(
+            ["pins", "x", "y", "null", "pindirs", "pc", "isr", "exec"]
+        )
+    ],
+    Case("out_x_auto_pull", 0x6028, {"auto_pull": True}, _FULL_TRANSMIT_FIFO),
+    Case("in_x_auto_push", 0x4028, {"auto_push": True, "push_threshold": 8}),
+    Case("push_block", 0x8020),
+    Case("push_noblock", 0x8000),
+    Case("push_iffull", 0x8040),
+    Case("push_block_stalled", 0x8020, initial_state=_FULL_RECEIVE_FIFO),
+    Case("pull_block", 0x80A0, initial_state=_FULL_TRANSMIT_FIFO),
+    Case("pull_noblock", 0x8080),
+    Case("pull_ifempty", 0x80C0, initial_state=_FULL_TRANSMIT_FIFO),
+    Case("pull_block_stalled", 0x80A0),
+    *[
+        Case(f"mov_x_y_{operation}", 0xA022 | (index << 3))
+        for index, operation in enumerate(["none", "invert", "bit_reverse"])
+    ],
+    Case("mov_pins_isr", 0xA006),
+    Case("mov_osr_null", 0xA0E3),
+    Case("mov_pc_x", 0xA0A1),
+    Case("mov_x_status", 0xA025, {"status_n": 1}),
+    Case("mov_exec_x", 0xA081),
+    Case("executed_set_x", 0xA042, initial_state=State(exec_opcode=0xE021)),
+    Case("irq_set", 0xC000),
+    Case("irq_clear", 0xC040, initial_state=State(irq_flags=1)),
+    Case("irq_wait_stalled", 0xC020, initial_state=State(irq_flags=1)),
+    *[
+        Case(f"set_{destination}", 0xE000 | (index << 5) | 1)
+        for index, destination in [(0, "pins"), (1, "x"), (2, "y"), (4, "pindirs")]
+    ],
+    Case("set_x_with_delay", 0xE701),
+    Case("set_x_side_set", 0xF021, {"side_set_count": 1}),
+    Case("set_x_side_set_opt", 0xF821, {"side_set_count": 2}),
+]
+
+
+def measure(case: Case, iterations: int) -> Dict[str, Any]:
+    """Returns the mean time taken, the blocks of memory retained and the largest peak in memory
+    allocated, by a single step of the case."""
+
+    # The instruction is followed by others so that it can be re-emulated from the same state
+    opcodes = [case.opcode, 0xA042, 0xA042, 0xA042]
+    state_machine = create_state_machine(opcodes, **case.options)
+    state = case.initial_state
+
+    if state_machine.step(state) is None:
+        return {"supported": False}
+
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        state_machine.step(state)
+
+    nanoseconds = (time.perf_counter() - start) * 1e9 / iterations
+
+    # Allocations are measured separately as tracing them slows down the emulation considerably.
+    # The new states are kept so that their allocations are retained, within a list allocated
+    # beforehand so that its growth is not mistaken for that of the emulation.
+    new_states: List[State | None] = [None] * iterations
+    peak_bytes = 0
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    for index in range(iterations):
+        current_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        new_states[index] = state_machine.step(state)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        peak_bytes = max(peak_bytes, peak_memory - current_memory)
+
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    statistics = after.compare_to(before, "filename")
+
+    return {
+        "supported": True,
+        "nanoseconds_per_step": nanoseconds,
+        "retained_blocks_per_step": sum(stat.count_diff for stat in statistics)
+        / iterations,
+        "peak_bytes_per_step": peak_bytes,
+    }
+
+
+def run_microbenchmarks(
+    iterations: int, names: List[str] | None = None
+) -> Dict[str, Any]:
+    """Runs the selected microbenchmarks, or all of them, and returns the results."""
+
+    return {
+        "pioemu_version": pioemu.__version__,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "iterations": iterations,
+        "microbenchmarks": {
+            case.name: measure(case, iterations)
+            for case in CASES
+            if not names or case.name in names
+        },
+    }
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Returns a human-readable table of the results."""
+
+    lines = [f"{'Instruction':<24} {'ns/step':>10} {'Blocks':>8} {'Peak B':>8}"]
+
+    for name, result in results["microbenchmarks"].items():
+        if result["supported"]:
+            lines.append(
+                f"{name:<24} {result['nanoseconds_per_step']:>10,.0f} "
+                f"{result['retained_blocks_per_step']:>8.1f} "
+                f"{result['peak_bytes_per_step']:>8}"
+            )
+        else:
+            lines.append(f"{name:<24} {'not supported':>28}")
+
+    return "\n".join(lines)
+
+
+def main(arguments: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--iterations", type=int, default=10_000, help="steps to emulate per case"
+    )
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument(
+        "names", nargs="*", help="names of the cases to run, defaults to all"
+    )
+    options = parser.parse_args(arguments)
+
+    unknown_names = set(options.names) - {case.name for case in CASES}
+
+    if unknown_names:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown_names))}")
+
+    results = run_microbenchmarks(options.iterations, options.names)
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    print(format_results(results))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import dataclass, field
+from itertools import cycle, islice
+from typing import Any, Callable, Dict, List
+
+from pioemu import ReceiveSink, State, TransmitFeed
+
+
+@dataclass(frozen=True)
+class Program:
+    """A PIO program together with the options needed to emulate it."""
+
+    name: str
+    opcodes: List[int]
+    options: Dict[str, Any] = field(default_factory=dict)
+    initial_state: State = field(default_factory=State)
+
+    # Creates any per-run keyword arguments, such as FIFO feeds, for the given cycle count
+    create_run_options: Callable[[int], Dict[str, Any]] = lambda _: {}
+
+
+def _uart_waveform(clock: int) -> int:
+    """Serial data at 8 clock cycles per bit: idle, start bit, 0x55 and stop bit."""
+
+    bit_number = (clock // 8) % 12
+    frame = [1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 1]
+
+    return frame[bit_number]
+
+
+def _quadrature_waveform(clock: int) -> int:
+    """Gray code sequence on GPIO 0 and 1, advancing every 16 clock cycles."""
+
+    return (0b00, 0b01, 0b11, 0b10)[(clock // 16) % 4]
+
+
+def _words(count: int) -> List[int]:
+    return list(islice(cycle([0x0123_4567, 0x89AB_CDEF, 0xFEDC_BA98]), count))
+
+
+PROGRAMS = [
+    Program(
+        "square_wave",
+        # set pindirs, 1 / set pins, 1 [1] / set pins, 0 / jmp 1
+        [0xE081, 0xE101, 0xE000, 0x0001],
+    ),
+    Program(
+        "countdown_with_delays",
+        # set x, 31 [7] / jmp x-- 1 [15] / set pins, 1 [3] / jmp 0
+        [0xE73F, 0x0F41, 0xE301, 0x0000],
+    ),
+    Program(
+        "uart_tx",
+        # pull block / set pins, 0 [7] / set x, 7 / out pins, 1 [6] / jmp x-- 3 / set pins, 1 [7]
+        [0x80A0, 0xE700, 0xE027, 0x6601, 0x0043, 0xE701],
+        {"out_count": 1},
+        State(pin_directions=1, pin_values=1),
+        lambda cycles: {"transmit_feed": TransmitFeed(_words(cycles // 80 + 1))},
+    ),
+    Program(
+        "uart_rx",
+        # wait 0 pin 0 / set x, 7 [10] / in pins, 1 / jmp x-- 2 [6]
+        [0x2020, 0xEA27, 0x4001, 0x0642],
+        {"input_source": _uart_waveform, "auto_push": True, "push_threshold": 8},
+        State(),
+        lambda _: {"receive_sink": ReceiveSink([])},
+    ),
+    Program(
+        "spi",
+        # out pins, 1 side 0 [1] / in pins, 1 side 1 [1]
+        [0x6101, 0x5101],
+        {
+            "auto_pull": True,
+            "auto_push": True,
+            "pull_threshold": 8,
+            "push_threshold": 8,
+            "shift_isr_right": False,
+            "shift_osr_right": False,
+            "out_count": 1,
+            "side_set_base": 1,
+            "side_set_count": 1,
+        },
+        State(pin_directions=0b11),
+        lambda cycles: {
+            "transmit_feed": TransmitFeed(_words(cycles // 16 + 1)),
+            "receive_sink": ReceiveSink([]),
+        },
+    ),
+    Program(
+        "spi_lsb_first",
+        # pull block side 0 / mov osr, ::osr side 0 / out pins, 1 side 0 [1] / in pins, 1 side 1 /
+        # jmp !osre 2 side 1 / mov isr, ::isr side 0 / push block side 0
+        [0x80A0, 0xA0F7, 0x6101, 0x5001, 0x10E2, 0xA0D6, 0x8020],
+        {
+            "shift_isr_right": False,
+            "shift_osr_right": False,
+            "out_count": 1,
+            "side_set_base": 1,
+            "side_set_count": 1,
+        },
+        State(pin_directions=0b11),
+        lambda cycles: {
+            "transmit_feed": TransmitFeed(_words(cycles // 132 + 1)),
+            "receive_sink": ReceiveSink([]),
+        },
+    ),
+    Program(
+        "ws2812",
+        # out x, 1 side 0 [2] / jmp !x 3 side 1 [1] / jmp 0 side 1 [4] / nop side 0 [4]
+        [0x6221, 0x1123, 0x1400, 0xA442],
+        {
+            "auto_pull": True,
+            "pull_threshold": 24,
+            "shift_osr_right": False,
+            "side_set_count": 1,
+        },
+        State(pin_directions=1),
+        lambda cycles: {"transmit_feed": TransmitFeed(_words(cycles // 240 + 1))},
+    ),
+    Program(
+        "quadrature_decoder",
+        # mov isr, null / in pins, 2 / mov y, isr / jmp x!=y 5 / jmp 0 / mov x, y / push noblock
+        [0xA0C3, 0x4002, 0xA046, 0x00A5, 0x0000, 0xA022, 0x8000],
+        {"input_source": _quadrature_waveform},
+        State(),
+        lambda _: {"receive_sink": ReceiveSink([])},
+    ),
+    Program(
+        "bit_banged_shift_out",
+        # pull noblock / out pins, 1 / jmp !osre 1
+        [0x8080, 0x6001, 0x00E1],
+        {"out_count": 1},
+        State(pin_directions=1, x_register=0xA5A5_A5A5),
+    ),
+    Program(
+        "counted_input",
+        # set x, 31 / in pins, 1 / jmp x-- 1 / push noblock
+        [0xE03F, 0x4001, 0x0041, 0x8000],
+        {"shift_isr_right": False},
+        State(pin_values=0x0000_0001),
+    ),
+    Program(
+        "auto_pull_auto_push_stream",
+        # out x, 8 / in x, 8
+        [0x6028, 0x4028],
+        {"auto_pull": True, "auto_push": True},
+        State(),
+        lambda cycles: {
+            "transmit_feed": TransmitFeed(_words(cycles // 8 + 1)),
+            "receive_sink": ReceiveSink([]),
+        },
+    ),
+]
@@ -0,0 +1,181 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measures the number of clock cycles emulated per second, and the peak memory used, for each of
+the canonical programs. Run from the root of the repository with:
+
+    python -m benchmarks.run_benchmarks --output results.json
+
+Results from a previous run can be passed using --compare to show the relative change. By
+default each program is emulated by iterating over emulate(), use --engine emulate_until to obtain
+only the final state instead (which allows instructions to be fused).
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import pioemu
+from pioemu import clock_cycles_reached, emulate, emulate_until
+
+from .programs import PROGRAMS, Program
+
+
+def run_program(program: Program, cycle_count: int, engine: str = "emulate") -> int:
+    """Emulates the program for the given number of clock cycles and returns the final clock."""
+
+    if engine == "emulate_until":
+        return emulate_until(
+            program.opcodes,
+            clock=cycle_count,
+            initial_state=program.initial_state,
+            **program.options,
+            **program.create_run_options(cycle_count),
+        ).clock
+
+    state = program.initial_state
+
+    for _, state in emulate(
+        program.opcodes,
+        stop_when=clock_cycles_reached(cycle_count),
+        initial_state=program.initial_state,
+        **program.options,
+        **program.create_run_options(cycle_count),
+    ):
+        pass
+
+    return state.clock
+
+
+def measure(
+    program: Program, cycle_count: int, repeat: int, engine: str = "emulate"
+) -> Dict[str, Any]:
+    """Returns the best throughput of several runs and the peak memory used by a single run."""
+
+    best_seconds = float("inf")
+    clock = 0
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        clock = run_program(program, cycle_count, engine)
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+
+    # Memory is measured separately as tracing allocations slows down the emulation considerably
+    tracemalloc.start()
+    run_program(program, cycle_count, engine)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "cycles": clock,
+        "seconds": best_seconds,
+        "cycles_per_second": clock / best_seconds if best_seconds else 0.0,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run_benchmarks(
+    cycle_count: int,
+    repeat: int,
+    names: List[str] | None = None,
+    engine: str = "emulate",
+) -> Dict[str, Any]:
+    """Runs the selected benchmarks, or all of them, and returns the results."""
+
+    return {
+        "pioemu_version": pioemu.__version__,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "cycle_count": cycle_count,
+        "repeat": repeat,
+        "engine": engine,
+        "benchmarks": {
+            program.name: measure(program, cycle_count, repeat, engine)
+            for program in PROGRAMS
+            if not names or program.name in names
+        },
+    }
+
+
+def format_results(results: Dict[str, Any], baseline: Dict[str, Any] | None) -> str:
+    """Returns a human-readable table of the results, relative to the baseline if provided."""
+
+    lines = [f"{'Benchmark':<28} {'Cycles/s':>12} {'Peak KiB':>10} {'Change':>8}"]
+    baseline_benchmarks = baseline["benchmarks"] if baseline else {}
+
+    for name, result in results["benchmarks"].items():
+        change = ""
+
+        if name in baseline_benchmarks:
+            previous = baseline_benchmarks[name]["cycles_per_second"]
+            change = f"{(result['cycles_per_second'] / previous - 1) * 100:+.1f}%"
+
+        lines.append(
+            f"{name:<28} {result['cycles_per_second']:>12,.0f} "
+            f"{result['peak_memory_bytes'] / 1024:>10,.1f} {change:>8}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(arguments: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--cycles", type=int, default=100_000, help="clock cycles to emulate per run"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="number of timed runs per benchmark"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["emulate", "emulate_until"],
+        default="emulate",
+        help="function used to emulate the programs",
+    )
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--compare", help="JSON results from a previous run")
+    parser.add_argument(
+        "names", nargs="*", help="names of the benchmarks to run, defaults to all"
+    )
+    options = parser.parse_args(arguments)
+
+    unknown_names = set(options.names) - {program.name for program in PROGRAMS}
+
+    if unknown_names:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown_names))}")
+
+    baseline = None
+
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = run_benchmarks(
+        options.cycles, options.repeat, options.names, options.engine
+    )
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    print(format_results(results, baseline))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
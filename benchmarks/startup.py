@@ -0,0 +1,175 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measures the fixed cost of creating an emulator and running it for only a few clock cycles, as
+unit tests typically do. Run from the root of the repository with:
+
+    python -m benchmarks.startup --output results.json
+
+When --budget is given the exit status is non-zero if any scenario exceeds that many
+microseconds per call. The time taken by a new process to import pioemu and emulate its first
+clock cycle, as happens for each CI shard or pytest-xdist worker, is also reported.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import pioemu
+from pioemu import State, StateMachineConfig, clock_cycles_reached, emulate
+from pioemu.emulation import create_state_machine
+
+# set x, 1 / nop
+_PROGRAM = [0xE021, 0xA042]
+
+_CONFIG = StateMachineConfig(auto_pull=True, shift_osr_right=False, side_set_count=1)
+
+
+def _input_source(clock: int) -> int:
+    return clock & 1
+
+
+def _create_state_machine():
+    create_state_machine(_PROGRAM)
+
+
+def _emulate_first_cycle():
+    next(emulate(_PROGRAM, stop_when=clock_cycles_reached(1)))
+
+
+def _emulate_first_cycle_with_options():
+    next(
+        emulate(
+            _PROGRAM,
+            stop_when=clock_cycles_reached(1),
+            initial_state=State(),
+            input_source=_input_source,
+            auto_pull=True,
+            shift_osr_right=False,
+            side_set_count=1,
+            out_count=8,
+        )
+    )
+
+
+def _emulate_first_cycle_with_config():
+    next(emulate(_PROGRAM, stop_when=clock_cycles_reached(1), config=_CONFIG))
+
+
+def _emulate_ten_cycles():
+    for _ in emulate(_PROGRAM, stop_when=clock_cycles_reached(10)):
+        pass
+
+
+SCENARIOS: Dict[str, Callable[[], None]] = {
+    "create_state_machine": _create_state_machine,
+    "emulate_first_cycle": _emulate_first_cycle,
+    "emulate_first_cycle_with_options": _emulate_first_cycle_with_options,
+    "emulate_first_cycle_with_config": _emulate_first_cycle_with_config,
+    "emulate_ten_cycles": _emulate_ten_cycles,
+}
+
+
+def measure(scenario: Callable[[], None], iterations: int) -> float:
+    """Returns the mean number of microseconds taken by the scenario."""
+
+    scenario()
+
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        scenario()
+
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def measure_cold_start(code: str, runs: int) -> float:
+    """Returns the fewest milliseconds taken by a new interpreter process to run the code."""
+
+    # The new process must import this copy of pioemu, whatever its working directory
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(pioemu.__file__)))
+    python_path = [package_root, os.environ.get("PYTHONPATH", "")]
+    environment = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, python_path))}
+
+    best_seconds = float("inf")
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=environment)
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+
+    return best_seconds * 1e3
+
+
+def run_startup_benchmarks(iterations: int, cold_runs: int = 5) -> Dict[str, Any]:
+    """Runs each of the scenarios and returns the results."""
+
+    return {
+        "pioemu_version": pioemu.__version__,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "iterations": iterations,
+        "microseconds_per_call": {
+            name: measure(scenario, iterations) for name, scenario in SCENARIOS.items()
+        },
+        "cold_start_milliseconds": {
+            "interpreter": measure_cold_start("pass", cold_runs),
+            "import_and_first_cycle": measure_cold_start(
+                "from pioemu import clock_cycles_reached, emulate; "
+                f"next(emulate({_PROGRAM}, stop_when=clock_cycles_reached(1)))",
+                cold_runs,
+            ),
+        },
+    }
+
+
+def main(arguments: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--iterations", type=int, default=10_000, help="calls to make per scenario"
+    )
+    parser.add_argument(
+        "--cold-runs", type=int, default=5, help="new processes to start per cold start"
+    )
+    parser.add_argument(
+        "--budget", type=float, help="maximum microseconds allowed per call"
+    )
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    options = parser.parse_args(arguments)
+
+    results = run_startup_benchmarks(options.iterations, options.cold_runs)
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    over_budget = False
+
+    for name, microseconds in results["microseconds_per_call"].items():
+        exceeded = options.budget is not None and microseconds > options.budget
+        over_budget |= exceeded
+        print(f"{name:<34} {microseconds:>8.1f} us{'  OVER BUDGET' if exceeded else ''}")
+
+    for name, milliseconds in results["cold_start_milliseconds"].items():
+        print(f"cold start: {name:<22} {milliseconds:>8.1f} ms")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
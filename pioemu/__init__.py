@@ -13,7 +13,33 @@
 # limitations under the License.
 __version__ = "0.88.0"
 
+from typing import TYPE_CHECKING
+
+from .commands import OverridePins, PokeState, TakeSnapshot, WriteTransmitFifo
 from .conditions import clock_cycles_reached
-from .emulation import emulate
+from .config import StateMachineConfig
+from .deadlock import DeadlockError
+from .debugger import Debugger
+from .dma import DmaChannel
+from .emulation import create_state_machine, emulate, emulate_until
+from .feeds import ReceiveSink, TransmitFeed
+from .hooks import Hooks
+from .pio_block import emulate_block
+from .profiler import Profiler, StallCause
+from .program_cache import ProgramCache, ProgramCacheInfo, program_cache
 from .shift_register import ShiftRegister
 from .state import State
+
+if TYPE_CHECKING:
+    from .async_emulation import AsyncEmulator
+
+
+def __getattr__(name: str):
+    # Importing asyncio accounts for a significant part of the time taken to import this package,
+    # so it is deferred until AsyncEmulator is first used
+    if name == "AsyncEmulator":
+        from .async_emulation import AsyncEmulator
+
+        return AsyncEmulator
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
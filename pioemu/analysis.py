@@ -0,0 +1,748 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import heapq
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from .bit_operations import reverse_bits_32
+from .config import StateMachineConfig
+from .instruction import (
+    InInstruction,
+    Instruction,
+    IrqInstruction,
+    JmpInstruction,
+    OutInstruction,
+    PullInstruction,
+    PushInstruction,
+    WaitInstruction,
+)
+
+# Limits the number of abstract states explored, beyond which the cycle counts are not determined
+_MAXIMUM_STATES = 65536
+
+# Register values above this are treated as unknown, which bounds the number of abstract states
+_MAXIMUM_KNOWN_VALUE = 1023
+
+
+class Bounds(NamedTuple):
+    """Smallest and largest values over all of the paths through a program."""
+
+    minimum: int
+    maximum: Optional[int]  # None when unbounded, such as a loop that waits for a pin
+
+
+@dataclass(frozen=True)
+class InstructionNode:
+    """An instruction within the control-flow graph of a program."""
+
+    program_counter: int
+    opcode: int
+
+    # Decoded form of the opcode, which is None for MOV, SET and invalid opcodes
+    instruction: Optional[Instruction]
+
+    # Clock cycles consumed, including delay cycles but excluding stalls
+    cycles: int
+
+    # Program counter values that can follow this instruction
+    successors: Tuple[int, ...]
+
+    supported: bool  # False for opcodes that are invalid/not supported, which stop emulation
+    may_stall: bool  # True for WAIT and IRQ WAIT, which stall until an external event
+    dynamic: bool  # True for OUT/MOV to PC or EXEC, whose effect depends upon data
+
+
+@dataclass(frozen=True)
+class ControlFlowGraph:
+    """Instructions of a program linked by the program counter values that can follow them."""
+
+    nodes: Tuple[InstructionNode, ...]
+    wrap_target: int
+    wrap_top: int
+
+    def reachable_from(self, program_counter: int = 0) -> FrozenSet[int]:
+        """Returns the program counter values that can be reached from the given one."""
+
+        reachable = {program_counter}
+        pending = [program_counter]
+
+        while pending:
+            for successor in self.nodes[pending.pop()].successors:
+                if successor not in reachable:
+                    reachable.add(successor)
+                    pending.append(successor)
+
+        return frozenset(reachable)
+
+
+class _AbstractState(NamedTuple):
+    program_counter: int
+    x_register: Optional[int]  # None when unknown
+    y_register: Optional[int]
+    output_shift_counter: int
+    input_shift_counter: int
+
+
+class _Transition(NamedTuple):
+    target: _AbstractState
+    cycles: int
+    pulls: int
+    pushes: int
+    bits_out: int
+    bits_in: int
+
+
+@dataclass(frozen=True)
+class ProgramAnalysis:
+    """
+    Timing of a program determined from its opcodes without emulating it.
+
+    Cycle counts assume that the FIFOs are serviced quickly enough that they never stall the
+    state machine, and exclude stalls caused by WAIT and IRQ WAIT instructions (see may_wait).
+    They are measured between recurring events, such as successive words being pulled from the
+    transmit FIFO, once the program has reached its steady state and are None when they cannot be
+    determined statically.
+    """
+
+    graph: ControlFlowGraph
+
+    # True when a WAIT or IRQ WAIT instruction is reachable
+    may_wait: bool
+
+    # True when an OUT or MOV to PC or EXEC is reachable, in which case no cycle counts are given
+    has_dynamic_control_flow: bool
+
+    # Clock cycles between successive words being pulled from / pushed into the FIFOs
+    cycles_per_transmit_word: Optional[Bounds]
+    cycles_per_receive_word: Optional[Bounds]
+
+    # Number of bits shifted out of the OSR / into the ISR for each of those words
+    bits_per_transmit_word: Optional[Bounds]
+    bits_per_receive_word: Optional[Bounds]
+
+    # Clock cycles between successive executions of the instruction at wrap_target
+    cycles_per_iteration: Optional[Bounds]
+
+    _transitions: Optional[Dict[_AbstractState, List[_Transition]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def cycles_between_visits(self, program_counter: int) -> Optional[Bounds]:
+        """
+        Returns the clock cycles between successive executions of the instruction at the given
+        program counter, or None when they cannot be determined.
+
+        Parameters:
+        program_counter (int): Location of the instruction within the program.
+
+        Returns:
+        Bounds: Smallest and largest number of clock cycles.
+        """
+        if self._transitions is None:
+            return None
+
+        return _bounds_between_events(
+            self._transitions,
+            lambda state, _: state.program_counter == program_counter,
+            lambda transition: transition.cycles,
+        )
+
+
+def build_control_flow_graph(
+    opcodes: List[int], config: StateMachineConfig | None = None
+) -> ControlFlowGraph:
+    """
+    Builds the control-flow graph of a program, honouring its wrap_target and wrap_top.
+
+    Parameters
+    ----------
+    opcodes : List[int]
+        PIO program to analyse.
+    config : StateMachineConfig, optional
+        Configuration of the state machine, defaults to that used by emulate().
+
+    Returns
+    -------
+    ControlFlowGraph
+    """
+    config = config if config is not None else StateMachineConfig()
+    compiled_program = config.compile(opcodes)
+    new_instruction_decoder, _ = config.instruction_decoders
+
+    wrap_target = config.wrap_target
+    wrap_top = config.wrap_top or len(opcodes) - 1
+
+    nodes = []
+
+    for program_counter, opcode in enumerate(opcodes):
+        compiled_instruction = compiled_program[program_counter]
+        instruction = new_instruction_decoder.decode(opcode)
+        next_program_counter = (
+            wrap_target if program_counter == wrap_top else program_counter + 1
+        )
+
+        if compiled_instruction is None:
+            nodes.append(
+                InstructionNode(
+                    program_counter, opcode, instruction, 0, (), False, False, False
+                )
+            )
+            continue
+
+        dynamic = _is_dynamic(opcode)
+
+        match instruction:
+            case JmpInstruction(condition=0, target_address=target_address):
+                successors: Tuple[int, ...] = (target_address,)
+            case JmpInstruction(target_address=target_address):
+                successors = tuple(dict.fromkeys((target_address, next_program_counter)))
+            case _ if dynamic:
+                successors = ()
+            case _:
+                successors = (next_program_counter,)
+
+        nodes.append(
+            InstructionNode(
+                program_counter,
+                opcode,
+                instruction,
+                1 + compiled_instruction.delay_value,
+                successors,
+                True,
+                _may_stall(instruction),
+                dynamic,
+            )
+        )
+
+    return ControlFlowGraph(tuple(nodes), wrap_target, wrap_top)
+
+
+def analyse_program(
+    opcodes: List[int], config: StateMachineConfig | None = None
+) -> ProgramAnalysis:
+    """
+    Determines the timing of a program, such as the clock cycles consumed for each word written
+    to the transmit FIFO, from its opcodes without emulating it.
+
+    Loops are followed using the values of the X and Y registers where these are known, such as
+    when set by a SET instruction prior to a JMP X-- loop, and the shift counters of the ISR and
+    OSR. The values of the X and Y registers are unknown when the program starts.
+
+    Parameters
+    ----------
+    opcodes : List[int]
+        PIO program to analyse.
+    config : StateMachineConfig, optional
+        Configuration of the state machine, defaults to that used by emulate().
+
+    Returns
+    -------
+    ProgramAnalysis
+    """
+    return _analyse_program(
+        tuple(opcodes), config if config is not None else StateMachineConfig()
+    )
+
+
+@lru_cache(maxsize=64)
+def _analyse_program(
+    opcodes: Tuple[int, ...], config: StateMachineConfig
+) -> ProgramAnalysis:
+    graph = build_control_flow_graph(list(opcodes), config)
+    reachable = graph.reachable_from(0)
+
+    may_wait = any(graph.nodes[index].may_stall for index in reachable)
+    has_dynamic_control_flow = any(graph.nodes[index].dynamic for index in reachable)
+
+    transitions = None if has_dynamic_control_flow else _explore(graph, config)
+
+    if transitions is None:
+        return ProgramAnalysis(
+            graph, may_wait, has_dynamic_control_flow, None, None, None, None, None
+        )
+
+    def pulls(_: _AbstractState, transition: _Transition) -> bool:
+        return transition.pulls > 0
+
+    def pushes(_: _AbstractState, transition: _Transition) -> bool:
+        return transition.pushes > 0
+
+    def visits_wrap_target(state: _AbstractState, _: _Transition) -> bool:
+        return state.program_counter == graph.wrap_target
+
+    return ProgramAnalysis(
+        graph,
+        may_wait,
+        has_dynamic_control_flow,
+        _bounds_between_events(transitions, pulls, lambda t: t.cycles),
+        _bounds_between_events(transitions, pushes, lambda t: t.cycles),
+        _bounds_between_events(transitions, pulls, lambda t: t.bits_out),
+        _bounds_between_events(transitions, pushes, lambda t: t.bits_in),
+        _bounds_between_events(transitions, visits_wrap_target, lambda t: t.cycles),
+        transitions,
+    )
+
+
+def _is_dynamic(opcode: int) -> bool:
+    # OUT PC, OUT EXEC, MOV PC and MOV EXEC
+    return (opcode & 0xE0E0) in (0x60A0, 0x60E0, 0xA0A0, 0xA080)
+
+
+def _may_stall(instruction: Optional[Instruction]) -> bool:
+    match instruction:
+        case WaitInstruction():
+            return True
+        case IrqInstruction(clear=False, wait=True):
+            return True
+        case _:
+            return False
+
+
+def _known(value: int) -> Optional[int]:
+    return value if value <= _MAXIMUM_KNOWN_VALUE else None
+
+
+def _explore(
+    graph: ControlFlowGraph, config: StateMachineConfig
+) -> Optional[Dict[_AbstractState, List[_Transition]]]:
+    """Returns the transitions between the reachable abstract states of a program."""
+
+    initial_state = _AbstractState(0, None, None, 32, 0)
+    transitions: Dict[_AbstractState, List[_Transition]] = {}
+    pending = [initial_state]
+
+    while pending:
+        state = pending.pop()
+
+        if state in transitions:
+            continue
+
+        if len(transitions) >= _MAXIMUM_STATES:
+            return None
+
+        transitions[state] = _transitions_from(graph, state, config)
+
+        pending.extend(transition.target for transition in transitions[state])
+
+    return transitions
+
+
+def _transitions_from(
+    graph: ControlFlowGraph, state: _AbstractState, config: StateMachineConfig
+) -> List[_Transition]:
+    # Mirrors the behaviour of StateMachine.step() for each type of instruction
+    node = graph.nodes[state.program_counter]
+
+    if not node.supported:
+        return []
+
+    opcode = node.opcode
+    next_state = state._replace(
+        program_counter=(
+            graph.wrap_target
+            if state.program_counter == graph.wrap_top
+            else state.program_counter + 1
+        )
+    )
+
+    match node.instruction:
+        case JmpInstruction(condition=condition, target_address=target_address):
+            return [
+                _Transition(
+                    state._replace(program_counter=target_address, **changes)
+                    if condition_met
+                    else next_state._replace(**changes),
+                    node.cycles,
+                    0,
+                    0,
+                    0,
+                    0,
+                )
+                for condition_met, changes in _jmp_outcomes(condition, state)
+            ]
+
+        case OutInstruction(destination=destination, bit_count=bit_count):
+            if (
+                config.auto_pull
+                and state.output_shift_counter >= config.pull_threshold
+            ):
+                # Stalls for one clock cycle whilst the OSR is refilled
+                return [
+                    _Transition(state._replace(output_shift_counter=0), 1, 1, 0, 0, 0)
+                ]
+
+            output_shift_counter = min(32, state.output_shift_counter + bit_count)
+            pulls = 0
+
+            if config.auto_pull and output_shift_counter >= config.pull_threshold:
+                output_shift_counter = 0
+                pulls = 1
+
+            next_state = next_state._replace(output_shift_counter=output_shift_counter)
+
+            if destination == 1:
+                next_state = next_state._replace(x_register=None)
+            elif destination == 2:
+                next_state = next_state._replace(y_register=None)
+            elif destination == 6:
+                next_state = next_state._replace(input_shift_counter=bit_count)
+
+            return [_Transition(next_state, node.cycles, pulls, 0, bit_count, 0)]
+
+        case InInstruction(bit_count=bit_count):
+            input_shift_counter = min(32, state.input_shift_counter + bit_count)
+            pushes = 0
+
+            if config.auto_push and input_shift_counter >= config.push_threshold:
+                input_shift_counter = 0
+                pushes = 1
+
+            return [
+                _Transition(
+                    next_state._replace(input_shift_counter=input_shift_counter),
+                    node.cycles,
+                    0,
+                    pushes,
+                    0,
+                    bit_count,
+                )
+            ]
+
+        case PullInstruction(if_empty=True) if state.output_shift_counter != 32:
+            # Delay cycles only apply when the condition is met
+            return [_Transition(next_state, 1, 0, 0, 0, 0)]
+
+        case PullInstruction():
+            return [
+                _Transition(
+                    next_state._replace(output_shift_counter=0), node.cycles, 1, 0, 0, 0
+                )
+            ]
+
+        case PushInstruction(if_full=True) if state.input_shift_counter != 32:
+            return [_Transition(next_state, 1, 0, 0, 0, 0)]
+
+        case PushInstruction():
+            return [
+                _Transition(
+                    next_state._replace(input_shift_counter=0), node.cycles, 0, 1, 0, 0
+                )
+            ]
+
+        case None if (opcode >> 13) == 5:  # MOV
+            return [_Transition(_mov(opcode, next_state), node.cycles, 0, 0, 0, 0)]
+
+        case None if (opcode >> 13) == 7:  # SET
+            destination = (opcode >> 5) & 7
+
+            if destination == 1:
+                next_state = next_state._replace(x_register=opcode & 0x1F)
+            elif destination == 2:
+                next_state = next_state._replace(y_register=opcode & 0x1F)
+
+            return [_Transition(next_state, node.cycles, 0, 0, 0, 0)]
+
+        case _:
+            # WAIT and IRQ, assuming that any stalls have ended
+            return [_Transition(next_state, node.cycles, 0, 0, 0, 0)]
+
+
+def _jmp_outcomes(
+    condition: int, state: _AbstractState
+) -> List[Tuple[bool, Dict[str, Optional[int]]]]:
+    """Returns whether the condition is met, with the changes to the registers, for each outcome."""
+
+    x = state.x_register
+    y = state.y_register
+
+    match condition:
+        case 0:
+            return [(True, {})]
+        case 1 if x is None:
+            return [(True, {"x_register": 0}), (False, {})]
+        case 1:
+            return [(x == 0, {})]
+        case 2 if x is None:
+            return [(True, {}), (False, {"x_register": None})]
+        case 2:
+            return [(x != 0, {"x_register": _known((x - 1) & 0xFFFF_FFFF)})]
+        case 3 if y is None:
+            return [(True, {"y_register": 0}), (False, {})]
+        case 3:
+            return [(y == 0, {})]
+        case 4 if y is None:
+            return [(True, {}), (False, {"y_register": None})]
+        case 4:
+            return [(y != 0, {"y_register": _known((y - 1) & 0xFFFF_FFFF)})]
+        case 5 if x is not None and y is not None:
+            return [(x != y, {})]
+        case 7:
+            return [(state.output_shift_counter != 32, {})]
+        case _:
+            # X != Y with unknown values and PIN
+            return [(True, {}), (False, {})]
+
+
+def _mov(opcode: int, state: _AbstractState) -> _AbstractState:
+    source = opcode & 7
+    operation = (opcode >> 3) & 3
+    destination = (opcode >> 5) & 7
+
+    value: Optional[int]
+
+    if source == 1:
+        value = state.x_register
+    elif source == 2:
+        value = state.y_register
+    elif source == 3:
+        value = 0
+    else:
+        value = None
+
+    if value is not None and operation == 1:
+        value = _known(value ^ 0xFFFF_FFFF)
+    elif value is not None and operation == 2:
+        value = _known(reverse_bits_32(value))
+
+    if destination == 1:
+        return state._replace(x_register=value)
+    elif destination == 2:
+        return state._replace(y_register=value)
+    elif destination == 6:
+        return state._replace(input_shift_counter=0)
+    elif destination == 7:
+        return state._replace(output_shift_counter=0)
+
+    return state
+
+
+def _bounds_between_events(
+    transitions: Dict[_AbstractState, List[_Transition]],
+    is_event: Callable[[_AbstractState, _Transition], bool],
+    weight: Callable[[_Transition], int],
+) -> Optional[Bounds]:
+    """
+    Returns the smallest and largest total weight of the transitions between successive events,
+    measured from the start of one event to the start of the next, once in the steady state.
+    """
+    recurrent = _recurrent_states(transitions)
+
+    # Smallest and largest weights from each state until the start of the next event
+    minimum = _minimum_until_event(transitions, is_event, weight)
+    maximum = _maximum_until_event(transitions, is_event, weight)
+
+    smallest: Optional[int] = None
+    largest: Optional[int] = 0
+    found = False
+
+    for state in recurrent:
+        for transition in transitions[state]:
+            if not is_event(state, transition):
+                continue
+
+            found = True
+            target = transition.target
+
+            if target in minimum:
+                total = weight(transition) + minimum[target]
+                smallest = total if smallest is None else min(smallest, total)
+
+            if largest is not None:
+                target_maximum = maximum[target]
+                largest = (
+                    None
+                    if target_maximum is None
+                    else max(largest, weight(transition) + target_maximum)
+                )
+
+    if not found or smallest is None:
+        return None
+
+    return Bounds(smallest, largest)
+
+
+def _minimum_until_event(
+    transitions: Dict[_AbstractState, List[_Transition]],
+    is_event: Callable[[_AbstractState, _Transition], bool],
+    weight: Callable[[_Transition], int],
+) -> Dict[_AbstractState, int]:
+    # Dijkstra's algorithm over the reversed transitions, from every state with an event
+    predecessors: Dict[_AbstractState, List[Tuple[_AbstractState, int]]] = {}
+    distances: Dict[_AbstractState, int] = {}
+
+    for state, state_transitions in transitions.items():
+        for transition in state_transitions:
+            if is_event(state, transition):
+                distances[state] = 0
+            else:
+                predecessors.setdefault(transition.target, []).append(
+                    (state, weight(transition))
+                )
+
+    queue = [(0, index, state) for index, state in enumerate(distances)]
+    counter = len(queue)
+    visited = set()
+
+    while queue:
+        distance, _, state = heapq.heappop(queue)
+
+        if state in visited:
+            continue
+
+        visited.add(state)
+
+        for predecessor, cost in predecessors.get(state, ()):
+            candidate = distance + cost
+
+            if candidate < distances.get(predecessor, candidate + 1):
+                distances[predecessor] = candidate
+                heapq.heappush(queue, (candidate, counter, predecessor))
+                counter += 1
+
+    return distances
+
+
+def _maximum_until_event(
+    transitions: Dict[_AbstractState, List[_Transition]],
+    is_event: Callable[[_AbstractState, _Transition], bool],
+    weight: Callable[[_Transition], int],
+) -> Dict[_AbstractState, Optional[int]]:
+    # Longest path by depth-first search, which is unbounded (None) should a state be able to
+    # reach a loop without an event or an instruction that stops emulation
+    maximum: Dict[_AbstractState, Optional[int]] = {}
+
+    for root in transitions:
+        if root in maximum:
+            continue
+
+        in_progress = {root}
+        stack: List[list] = [[root, iter(transitions[root]), 0, None]]
+
+        while stack:
+            frame = stack[-1]
+            state, remaining, value, pending = frame
+
+            if pending is not None:
+                target_maximum = maximum[pending.target]
+
+                if value is not None:
+                    value = (
+                        None
+                        if target_maximum is None
+                        else max(value, weight(pending) + target_maximum)
+                    )
+
+                pending = None
+
+            descended = False
+
+            for transition in remaining:
+                if is_event(state, transition):
+                    continue
+
+                target = transition.target
+
+                if target in in_progress:
+                    value = None
+                elif target not in maximum:
+                    frame[2], frame[3] = value, transition
+                    in_progress.add(target)
+                    stack.append([target, iter(transitions[target]), 0, None])
+                    descended = True
+                    break
+                elif value is not None:
+                    target_maximum = maximum[target]
+                    value = (
+                        None
+                        if target_maximum is None
+                        else max(value, weight(transition) + target_maximum)
+                    )
+
+            if descended:
+                continue
+
+            if not transitions[state]:
+                value = None
+
+            maximum[state] = value
+            in_progress.discard(state)
+            stack.pop()
+
+    return maximum
+
+
+def _recurrent_states(
+    transitions: Dict[_AbstractState, List[_Transition]]
+) -> List[_AbstractState]:
+    """Returns the states that can be reached again from themselves, using Tarjan's algorithm."""
+
+    index: Dict[_AbstractState, int] = {}
+    lowlink: Dict[_AbstractState, int] = {}
+    on_stack = set()
+    component_stack: List[_AbstractState] = []
+    recurrent: List[_AbstractState] = []
+
+    for root in transitions:
+        if root in index:
+            continue
+
+        work = [(root, iter(transitions[root]))]
+        index[root] = lowlink[root] = len(index)
+        component_stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            state, remaining = work[-1]
+            descended = False
+
+            for transition in remaining:
+                target = transition.target
+
+                if target not in index:
+                    index[target] = lowlink[target] = len(index)
+                    component_stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(transitions[target])))
+                    descended = True
+                    break
+                elif target in on_stack:
+                    lowlink[state] = min(lowlink[state], index[target])
+
+            if descended:
+                continue
+
+            work.pop()
+
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[state])
+
+            if lowlink[state] == index[state]:
+                component = []
+
+                while True:
+                    member = component_stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+
+                    if member == state:
+                        break
+
+                if len(component) > 1 or any(
+                    transition.target == state for transition in transitions[state]
+                ):
+                    recurrent.extend(component)
+
+    return recurrent
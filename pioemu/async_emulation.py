@@ -0,0 +1,333 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+from collections import deque
+from dataclasses import replace
+from typing import Any, Callable, Deque, List, Tuple
+
+from .emulation import create_state_machine
+from .pio_block import PioBlock
+from .state import State
+from .state_machine import StateMachine
+
+
+class AsyncEmulator:
+    """
+    Emulates up to four state machines alongside asyncio tasks that interact with them.
+
+    State machines are added with add_state_machine() before run() is awaited. Clock cycles are
+    emulated in batches and control is only returned to the event loop when one of the FIFO
+    operations or cycle targets being awaited by another task has completed.
+    """
+
+    def __init__(self, *, irq_flags: int = 0):
+        """
+        Parameters
+        ----------
+        irq_flags : int, optional
+            Initial value of the IRQ flags shared by the state machines.
+        """
+        self.irq_flags = irq_flags
+        self.state_machines: List[AsyncStateMachine] = []
+        self._pio_block: PioBlock | None = None
+
+    def add_state_machine(
+        self, opcodes: List[int], *, initial_state: State | None = None, **options: Any
+    ) -> "AsyncStateMachine":
+        """
+        Adds a state machine to be emulated.
+
+        Parameters
+        ----------
+        opcodes : List[int]
+            PIO program to emulate.
+        initial_state : State, optional
+            Initial values to use.
+        **options
+            Keyword arguments accepted by emulate(), excluding stop_when, initial_state and
+            state_machine_number, together with clkdiv as for emulate_block().
+
+        Returns
+        -------
+        AsyncStateMachine
+        """
+        if self._pio_block is not None:
+            raise RuntimeError("state machines cannot be added once running")
+
+        if len(self.state_machines) == 4:
+            raise ValueError("a PIO block contains a maximum of four state machines")
+
+        number = len(self.state_machines)
+        state_machine = AsyncStateMachine(
+            self,
+            number,
+            create_state_machine(opcodes, state_machine_number=number, **options),
+            initial_state if initial_state else State(),
+        )
+
+        self.state_machines.append(state_machine)
+
+        return state_machine
+
+    async def run(
+        self,
+        *,
+        stop_when: Callable[[Tuple[State, ...]], bool],
+        batch_size: int = 10_000,
+    ) -> Tuple[State, ...]:
+        """
+        Emulates the state machines until the stop condition is met, or an opcode that is
+        invalid/not supported is reached. Any FIFO operations and wait_cycles() calls that are
+        still being awaited when it returns are cancelled.
+
+        Parameters
+        ----------
+        stop_when : function
+            Predicate used to determine if the emulation should stop or continue. It is invoked
+            with the states of all of the state machines.
+        batch_size : int, optional
+            Maximum number of clock cycles to emulate before returning control to the event loop
+            when nothing is being awaited.
+
+        Returns
+        -------
+        Tuple[State, ...]
+            Final states of the state machines.
+        """
+        if not self.state_machines:
+            raise ValueError("AsyncEmulator.run() requires at least one state machine")
+
+        self._pio_block = PioBlock(
+            [state_machine.core for state_machine in self.state_machines],
+            [state_machine.state for state_machine in self.state_machines],
+            self.irq_flags,
+        )
+
+        pio_block = self._pio_block
+
+        try:
+            # Allow the other tasks to start before the first clock cycle
+            await asyncio.sleep(0)
+
+            while not stop_when(tuple(pio_block.states)):
+                for _ in range(batch_size):
+                    if not pio_block.step():
+                        return tuple(pio_block.states)
+
+                    if self._service_waiters() or stop_when(tuple(pio_block.states)):
+                        break
+
+                await asyncio.sleep(0)
+
+            return tuple(pio_block.states)
+        finally:
+            # Otherwise the tasks awaiting them would never resume
+            for state_machine in self.state_machines:
+                state_machine.cancel_waiters()
+
+    def _service_waiters(self) -> bool:
+        serviced = False
+
+        for state_machine in self.state_machines:
+            if state_machine.has_waiters():
+                serviced |= state_machine.service_waiters()
+
+        return serviced
+
+
+class AsyncStateMachine:
+    """
+    A state machine being emulated by an AsyncEmulator.
+
+    Attributes
+    ----------
+    tx : AsyncTransmitFifo
+        Transmit FIFO of the state machine.
+    rx : AsyncReceiveFifo
+        Receive FIFO of the state machine.
+    """
+
+    def __init__(
+        self,
+        emulator: AsyncEmulator,
+        number: int,
+        core: StateMachine,
+        initial_state: State,
+    ):
+        self.core = core
+        self.tx = AsyncTransmitFifo(self)
+        self.rx = AsyncReceiveFifo(self)
+        self._emulator = emulator
+        self._number = number
+        self._initial_state = initial_state
+        self._cycle_waiters: List[Tuple[int, asyncio.Future]] = []
+
+    @property
+    def state(self) -> State:
+        """Return the current state of this state machine."""
+        pio_block = self._emulator._pio_block
+
+        return pio_block.states[self._number] if pio_block else self._initial_state
+
+    @state.setter
+    def state(self, new_state: State):
+        pio_block = self._emulator._pio_block
+
+        if pio_block:
+            pio_block.states[self._number] = new_state
+        else:
+            self._initial_state = new_state
+
+    async def wait_cycles(self, cycle_count: int) -> State:
+        """Waits until this state machine has been emulated for a number of clock cycles."""
+
+        target = self.state.clock + cycle_count
+
+        if self.state.clock >= target:
+            return self.state
+
+        future = asyncio.get_running_loop().create_future()
+        self._cycle_waiters.append((target, future))
+
+        return await future
+
+    def has_waiters(self) -> bool:
+        return bool(self._cycle_waiters or self.tx.waiters or self.rx.waiters)
+
+    def service_waiters(self) -> bool:
+        serviced = self.tx.service_waiters()
+        serviced |= self.rx.service_waiters()
+
+        if self._cycle_waiters:
+            clock = self.state.clock
+            remaining = []
+
+            for target, future in self._cycle_waiters:
+                if future.cancelled():
+                    continue
+
+                if clock >= target:
+                    future.set_result(self.state)
+                    serviced = True
+                else:
+                    remaining.append((target, future))
+
+            self._cycle_waiters = remaining
+
+        return serviced
+
+    def cancel_waiters(self):
+        self.tx.cancel_waiters()
+        self.rx.cancel_waiters()
+
+        for _, future in self._cycle_waiters:
+            future.cancel()
+
+        self._cycle_waiters = []
+
+
+class AsyncTransmitFifo:
+    """Transmit FIFO of a state machine which can be written to by asyncio tasks."""
+
+    def __init__(self, state_machine: AsyncStateMachine):
+        self.waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+        self._state_machine = state_machine
+
+    async def put(self, word: int):
+        """Writes a word into the FIFO, waiting until it has space when full."""
+
+        if not self.waiters and self._try_put(word):
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append((word, future))
+
+        await future
+
+    def service_waiters(self) -> bool:
+        serviced = False
+
+        while self.waiters:
+            word, future = self.waiters[0]
+
+            if not future.cancelled():
+                if not self._try_put(word):
+                    break
+
+                future.set_result(None)
+                serviced = True
+
+            self.waiters.popleft()
+
+        return serviced
+
+    def cancel_waiters(self):
+        while self.waiters:
+            _, future = self.waiters.popleft()
+            future.cancel()
+
+    def _try_put(self, word: int) -> bool:
+        state = self._state_machine.state
+
+        if len(state.transmit_fifo) >= 4:
+            return False
+
+        new_transmit_fifo = state.transmit_fifo.copy()
+        new_transmit_fifo.append(word & 0xFFFF_FFFF)
+        self._state_machine.state = replace(state, transmit_fifo=new_transmit_fifo)
+
+        return True
+
+
+class AsyncReceiveFifo:
+    """Receive FIFO of a state machine which can be read from by asyncio tasks."""
+
+    def __init__(self, state_machine: AsyncStateMachine):
+        self.waiters: Deque[asyncio.Future] = deque()
+        self._state_machine = state_machine
+
+    async def get(self) -> int:
+        """Reads a word from the FIFO, waiting until one is available when empty."""
+
+        if not self.waiters and self._state_machine.state.receive_fifo:
+            return self._take()
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+
+        return await future
+
+    def service_waiters(self) -> bool:
+        serviced = False
+
+        while self.waiters and self._state_machine.state.receive_fifo:
+            future = self.waiters.popleft()
+
+            if not future.cancelled():
+                future.set_result(self._take())
+                serviced = True
+
+        return serviced
+
+    def cancel_waiters(self):
+        while self.waiters:
+            self.waiters.popleft().cancel()
+
+    def _take(self) -> int:
+        state = self._state_machine.state
+        new_receive_fifo = state.receive_fifo.copy()
+        word = new_receive_fifo.popleft()
+        self._state_machine.state = replace(state, receive_fifo=new_receive_fifo)
+
+        return word
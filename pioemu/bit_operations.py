@@ -13,6 +13,21 @@
 # limitations under the License.
 
 
+# Each byte value with the order of its bits reversed
+_REVERSED_BYTES = bytes(int(f"{value:08b}"[::-1], 2) for value in range(256))
+
+
+def reverse_bits_32(value):
+    """Reverses the order of the least-significant 32 bits of a value."""
+
+    return (
+        (_REVERSED_BYTES[value & 0xFF] << 24)
+        | (_REVERSED_BYTES[(value >> 8) & 0xFF] << 16)
+        | (_REVERSED_BYTES[(value >> 16) & 0xFF] << 8)
+        | _REVERSED_BYTES[(value >> 24) & 0xFF]
+    )
+
+
 def update_bits_32(value, new_value, bit_position=0, bit_count=32):
     """Updates an existing value with up to 32 bits from another value."""
 
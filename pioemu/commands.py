@@ -0,0 +1,115 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from .state import State
+
+
+@dataclass(frozen=True)
+class Command(ABC):
+    """Base class for commands that can be sent into the generator returned by emulate()."""
+
+    @abstractmethod
+    def apply(self, state: State) -> State:
+        """Returns the given state with this command applied to it."""
+
+
+@dataclass(frozen=True)
+class WriteTransmitFifo(Command):
+    """Writes words into the transmit FIFO. Words written whilst the FIFO is full are discarded."""
+
+    words: Tuple[int, ...]
+
+    def __init__(self, *words: int):
+        object.__setattr__(self, "words", tuple(word & 0xFFFF_FFFF for word in words))
+
+    def apply(self, state: State) -> State:
+        space = 4 - len(state.transmit_fifo)
+
+        if space <= 0 or not self.words:
+            return state
+
+        new_transmit_fifo = state.transmit_fifo.copy()
+        new_transmit_fifo.extend(self.words[:space])
+
+        return replace(state, transmit_fifo=new_transmit_fifo)
+
+
+@dataclass(frozen=True)
+class OverridePins(Command):
+    """Overrides the values of the GPIO pins selected by the mask.
+
+    The override only lasts until the input pins are next sampled. When emulate() was given an
+    input_source it determines the values of the input pins again before the next instruction,
+    so only pins configured as outputs remain overridden.
+    """
+
+    values: int
+    mask: int = 0xFFFF_FFFF
+
+    def apply(self, state: State) -> State:
+        return replace(
+            state,
+            pin_values=(state.pin_values & ~self.mask) | (self.values & self.mask),
+        )
+
+
+@dataclass(frozen=True)
+class PokeState(Command):
+    """Replaces the values of the given fields of the State, such as x_register."""
+
+    changes: Dict[str, Any] = field(default_factory=dict)
+
+    def __init__(self, **changes: Any):
+        object.__setattr__(self, "changes", changes)
+
+    def apply(self, state: State) -> State:
+        return replace(state, **self.changes)
+
+
+@dataclass(frozen=True)
+class TakeSnapshot(Command):
+    """Passes a snapshot of the emulation to the callback, from which another emulation can be
+    resumed with the snapshot argument of emulate() or emulate_until(). Commands sent before this
+    one, within the same call to send(), are included within the snapshot.
+    """
+
+    callback: Callable[[bytes], Any]
+
+    def apply(self, state: State) -> State:
+        raise ValueError(
+            "TakeSnapshot can only be sent into the generator returned by emulate()"
+        )
+
+
+def apply_commands(
+    commands: Command | Iterable[Command],
+    state: State,
+    take_snapshot: Callable[[State], bytes] | None = None,
+) -> State:
+    """Returns the given state with a command, or sequence of commands, applied to it. Snapshots
+    requested by TakeSnapshot are obtained from take_snapshot, when given."""
+
+    if isinstance(commands, Command):
+        commands = (commands,)
+
+    for command in commands:
+        if isinstance(command, TakeSnapshot) and take_snapshot is not None:
+            command.callback(take_snapshot(state))
+        else:
+            state = command.apply(state)
+
+    return state
@@ -1,4 +1,4 @@
-# Copyright 2021, 2022, 2023 Nathan Young
+# Copyright 2021, 2022, 2023, 2026 Nathan Young
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -38,6 +38,14 @@ def gpio_high(pin_number: int, state: State) -> bool:
     return state.pin_values & (1 << pin_number) != 0
 
 
+def irq_flag_set(index: int, state: State) -> bool:
+    return state.irq_flags & (1 << index) != 0
+
+
+def irq_flag_clear(index: int, state: State) -> bool:
+    return not irq_flag_set(index, state)
+
+
 def transmit_fifo_empty(state: State) -> bool:
     return len(state.transmit_fifo) == 0
 
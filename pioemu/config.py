@@ -0,0 +1,278 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from .decoding.instruction_decoder import InstructionDecoder as NewInstructionDecoder
+from .fusion import FusedHandler, create_fused_handler
+from .instruction import Emulation, Instruction
+from .instruction_decoder import InstructionDecoder
+from .program_cache import program_cache
+from .shift_register import ShiftRegister
+
+
+@dataclass(frozen=True)
+class CompiledInstruction:
+    """Decoded form of an opcode together with the emulation of it."""
+
+    opcode: int
+    instruction: Optional[Instruction]
+    emulation: Emulation
+    side_set_value: int
+    delay_value: int
+
+    # Emulates this instruction together with the one that follows it, when they can be fused
+    fused_handler: Optional[FusedHandler] = None
+
+
+# Decoded form of each opcode within a program, or None for those which are invalid/not supported
+CompiledProgram = Tuple[Optional[CompiledInstruction], ...]
+
+
+@dataclass(frozen=True)
+class StateMachineConfig:
+    """
+    Configuration of a state machine which is validated once and can then be shared by many calls
+    to emulate(), such as by each test within a suite.
+
+    Programs are compiled (decoded) the first time they are emulated with a configuration and the
+    result is held by the process-wide program_cache. Configurations can be pickled, so that they
+    can be sent to worker processes.
+
+    The attributes have the same meaning as the keyword arguments of emulate().
+    """
+
+    auto_pull: bool = False
+    auto_push: bool = False
+    pull_threshold: int = 32
+    push_threshold: int = 32
+    shift_isr_right: bool = True
+    shift_osr_right: bool = True
+    out_base: int = 0
+    out_count: int = 32
+    side_set_base: int = 0
+    side_set_count: int = 0
+    jmp_pin: int = 0
+    status_sel: int = 0
+    status_n: int = 0
+    wrap_target: int = 0
+    wrap_top: int = 0
+    state_machine_number: int = 0
+    clkdiv: float = 1.0
+
+    def __post_init__(self):
+        for name, minimum, maximum in _RANGES:
+            value = getattr(self, name)
+
+            if value < minimum or value > maximum:
+                raise ValueError(
+                    f"StateMachineConfig() invalid value for keyword argument: '{name}'"
+                )
+
+    def compile(self, opcodes: List[int]) -> CompiledProgram:
+        """
+        Returns the compiled form of the given program, which is cached for subsequent calls.
+        Configurations that are equal, other than their clkdiv, share the compiled programs held
+        by the cache.
+
+        Parameters:
+        opcodes (List[int]): The PIO program to compile.
+
+        Returns:
+        CompiledProgram: Decoded form of each opcode within the program.
+        """
+        key = tuple(opcodes)
+
+        # The clock divider does not affect the compiled program, so is excluded from the key
+        config = self if self.clkdiv == 1.0 else replace(self, clkdiv=1.0)
+
+        return program_cache.get((key, config), lambda: config._compile_program(key))
+
+    def compile_instruction(self, opcode: int) -> Optional[CompiledInstruction]:
+        """
+        Returns the compiled form of an opcode executed outside of a program, such as by OUT EXEC
+        or MOV EXEC, which is cached for subsequent calls.
+
+        Parameters:
+        opcode (int): The opcode to compile.
+
+        Returns:
+        CompiledInstruction: Decoded form of the opcode or None if it is invalid/not supported.
+        """
+        return _compile_instruction(self, opcode & 0xFFFF)
+
+    @property
+    def clock_divisor(self) -> int:
+        """
+        Return the clock divider in 1/256ths, the combination of its integer and 8-bit fractional
+        parts, which are obtained from clkdiv in the same way as the Pico SDK.
+        """
+        return int(self.clkdiv * 256)
+
+    def system_clock(self, clock: int) -> int:
+        """
+        Returns the system clock cycle during which the given state machine clock cycle occurs,
+        assuming that both clocks started together from zero.
+
+        The state machine is enabled once every clkdiv system clock cycles on average. When the
+        divider has a fractional part its clock cycles are spread unevenly, as on an RP2040, with
+        the fraction being accumulated and an extra system clock cycle inserted each time that it
+        overflows. Please refer to the Clock Dividers section (3.5.5) within the RP2040 Datasheet.
+
+        Parameters:
+        clock (int): Number of state machine clock cycles, as found within State.
+
+        Returns:
+        int: Number of system clock cycles.
+        """
+        return (clock * self.clock_divisor) >> 8
+
+    @property
+    def instruction_decoders(self) -> Tuple[NewInstructionDecoder, InstructionDecoder]:
+        """Return the decoders used to compile programs with this configuration."""
+
+        return _create_instruction_decoders(
+            self.side_set_count,
+            self.shift_isr_right,
+            self.shift_osr_right,
+            self.out_base,
+            self.out_count,
+            self.jmp_pin,
+            self.status_sel,
+            self.status_n,
+            self.state_machine_number,
+        )
+
+    def _compile_program(self, opcodes: Tuple[int, ...]) -> CompiledProgram:
+        program = [self._compile_opcode(opcode) for opcode in opcodes]
+        wrap_top = self.wrap_top or len(opcodes) - 1
+
+        def next_program_counter(program_counter: int) -> int:
+            return self.wrap_target if program_counter == wrap_top else program_counter + 1
+
+        for program_counter, first in enumerate(program):
+            second_program_counter = next_program_counter(program_counter)
+
+            if first is None or second_program_counter >= len(program):
+                continue
+
+            second = program[second_program_counter]
+
+            if second is None:
+                continue
+
+            fused_handler = create_fused_handler(
+                first, second, next_program_counter(second_program_counter), self
+            )
+
+            if fused_handler is not None:
+                program[program_counter] = replace(first, fused_handler=fused_handler)
+
+        return tuple(program)
+
+    def _compile_opcode(self, opcode: int) -> Optional[CompiledInstruction]:
+        new_instruction_decoder, old_instruction_decoder = self.instruction_decoders
+
+        instruction = new_instruction_decoder.decode(opcode)
+
+        emulation = (
+            old_instruction_decoder.create_emulation(instruction)
+            if instruction
+            else old_instruction_decoder.decode(opcode)
+        )
+
+        if emulation is None:
+            return None
+
+        combined_values = (opcode >> 8) & 0x1F
+        bits_for_delay = 5 - self.side_set_count
+        delay_value = combined_values & ((1 << bits_for_delay) - 1)
+
+        # Delay cycles are ignored for OUT EXEC and MOV EXEC, the executed instruction follows
+        if (opcode & 0xE0E0) in _EXEC_OPCODES:
+            delay_value = 0
+
+        return CompiledInstruction(
+            opcode,
+            instruction,
+            emulation,
+            combined_values >> bits_for_delay,
+            delay_value,
+        )
+
+
+# Names of the integer options together with their minimum and maximum values
+_RANGES = [
+    ("pull_threshold", 1, 32),
+    ("push_threshold", 1, 32),
+    ("out_base", 0, 31),
+    ("out_count", 0, 32),
+    ("side_set_base", 0, 31),
+    ("side_set_count", 0, 5),
+    ("jmp_pin", 0, 31),
+    ("status_sel", 0, 1),
+    ("status_n", 0, 15),
+    ("wrap_target", 0, 31),
+    ("wrap_top", 0, 31),
+    ("state_machine_number", 0, 3),
+    ("clkdiv", 1.0, 65536.0),
+]
+
+
+# Opcodes of OUT EXEC and MOV EXEC after masking off the operands
+_EXEC_OPCODES = (0x60E0, 0xA080)
+
+
+# Instructions executed by OUT EXEC or MOV EXEC are often repeated, such as from a FIFO stream
+@lru_cache(maxsize=1024)
+def _compile_instruction(
+    config: StateMachineConfig, opcode: int
+) -> Optional[CompiledInstruction]:
+    return config._compile_opcode(opcode)
+
+
+# Decoders hold configuration but not state, so are shared by state machines with the same options
+@lru_cache(maxsize=64)
+def _create_instruction_decoders(
+    side_set_count: int,
+    shift_isr_right: bool,
+    shift_osr_right: bool,
+    out_base: int,
+    out_count: int,
+    jmp_pin: int,
+    status_sel: int,
+    status_n: int,
+    state_machine_number: int,
+) -> Tuple[NewInstructionDecoder, InstructionDecoder]:
+    shift_isr_method = (
+        ShiftRegister.shift_right if shift_isr_right else ShiftRegister.shift_left
+    )
+    shift_osr_method = (
+        ShiftRegister.shift_right if shift_osr_right else ShiftRegister.shift_left
+    )
+
+    return (
+        NewInstructionDecoder(side_set_count),
+        InstructionDecoder(
+            shift_isr_method,
+            shift_osr_method,
+            out_base,
+            out_count,
+            jmp_pin,
+            state_machine_number,
+            status_sel,
+            status_n,
+        ),
+    )
@@ -0,0 +1,151 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import TYPE_CHECKING, Optional
+
+from .dma import DmaChannel
+from .feeds import ReceiveSink, TransmitFeed
+from .instruction import WaitInstruction
+from .profiler import StallCause, stall_cause
+from .state import State
+
+if TYPE_CHECKING:
+    from .state_machine import StateMachine
+
+
+class DeadlockError(RuntimeError):
+    """
+    Raised by emulate(), when detect_deadlock is True, once the state machine has stalled in a
+    way that it can never recover from.
+
+    Attributes
+    ----------
+    cause : StallCause
+        Reason that the state machine is stalled.
+    state : State
+        State of the state machine after the stall was detected.
+    """
+
+    def __init__(self, cause: StallCause, state: State):
+        super().__init__(
+            f"state machine permanently stalled ({cause.value}) at program counter "
+            f"{state.program_counter} on clock cycle {state.clock}"
+        )
+
+        self.cause = cause
+        self.state = state
+
+
+def permanent_stall_cause(
+    state_machine: "StateMachine", previous_state: State, state: State
+) -> Optional[StallCause]:
+    """
+    Determines whether the stall that occurred during the most recent step of the given state
+    machine can never end, assuming that the state is not modified by anything else.
+
+    A stall on the transmit FIFO is permanent when it is empty, the OSR was not refilled during the
+    step and it has no transmit feed, or one that has been exhausted. Likewise a stall on the
+    receive FIFO is permanent when it has no receive sink, or one that is full. A stall on a GPIO pin is permanent
+    when the pins did not change during the step and the pin is either an output, which the
+    stalled state machine cannot change, or there is no input source. A stall on an IRQ flag is
+    always permanent, as a lone state machine is the only thing that could change the flags.
+
+    Parameters
+    ----------
+    state_machine : StateMachine
+        State machine whose most recent step stalled.
+    previous_state : State
+        State of the state machine before its most recent step.
+    state : State
+        State of the state machine after its most recent step.
+
+    Returns
+    -------
+    StallCause
+        Reason for the stall, or None if the state machine was not stalled or may recover.
+    """
+    if not state_machine.stalled:
+        return None
+
+    instruction = state_machine.instruction
+    cause = stall_cause(instruction)
+
+    match cause:
+        case StallCause.PULL_EMPTY | StallCause.AUTO_PULL:
+            # A stalled autopull still refills the OSR, ready for the next clock cycle
+            permanent = (
+                not state.transmit_fifo
+                and state.output_shift_register == previous_state.output_shift_register
+                and _feed_exhausted(state_machine.transmit_feed)
+            )
+        case StallCause.PUSH_FULL | StallCause.AUTO_PUSH:
+            permanent = _sink_full(state_machine.receive_sink)
+        case StallCause.WAIT_PIN:
+            permanent = isinstance(instruction, WaitInstruction) and (
+                state.pin_values == previous_state.pin_values
+                and (
+                    state_machine.input_source is None
+                    or state.pin_directions & (1 << instruction.index) != 0
+                )
+            )
+        case _:
+            permanent = True
+
+    return cause if permanent else None
+
+
+def fifos_quiescent(state_machine: "StateMachine", state: State) -> bool:
+    """
+    Determines whether the feeds of the given state machine can no longer move words into or out
+    of its FIFOs, assuming that the state machine does not push or pop them.
+
+    Parameters
+    ----------
+    state_machine : StateMachine
+        State machine whose transmit feed and receive sink are checked.
+    state : State
+        Current state of the state machine.
+
+    Returns
+    -------
+    bool
+        True when the transmit FIFO is full or its feed is exhausted, and the receive FIFO is empty
+        or its sink is full.
+    """
+    return (
+        len(state.transmit_fifo) >= 4 or _feed_exhausted(state_machine.transmit_feed)
+    ) and (not state.receive_fifo or _sink_full(state_machine.receive_sink))
+
+
+def _feed_exhausted(feed: TransmitFeed | DmaChannel | None) -> bool:
+    match feed:
+        case None:
+            return True
+        case TransmitFeed():
+            return feed.exhausted
+        case DmaChannel():
+            return feed.complete
+        case _:
+            return False
+
+
+def _sink_full(sink: ReceiveSink | DmaChannel | None) -> bool:
+    match sink:
+        case None:
+            return True
+        case ReceiveSink():
+            return sink.full
+        case DmaChannel():
+            return sink.complete
+        case _:
+            return False
@@ -0,0 +1,288 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, Callable, List, Optional, Tuple
+
+from .dma import DmaChannel
+from .emulation import create_state_machine
+from .state import State
+
+
+class Debugger:
+    """
+    Emulates a PIO program one step at a time, as emulate() does, but is also able to step
+    backwards in time.
+
+    A snapshot of the emulation, known as a keyframe, is kept every keyframe_interval clock
+    cycles. Earlier states are recreated by restoring the nearest keyframe and emulating forwards
+    from it, so no other history is kept and each movement backwards emulates at most a couple of
+    keyframe intervals. Larger intervals therefore use less memory but take longer to step back.
+    Once there are more than max_keyframes keyframes every other one is discarded and the
+    interval doubles, so memory use is bounded however long the emulation runs.
+
+    Emulation must be deterministic for this to work, so any input_source must only depend upon
+    the state passed to it and feeds, if given, must be instances of DmaChannel.
+
+    Attributes
+    ----------
+    state : State
+        Current state of the state machine.
+    previous_state : State
+        State before the most recent step, or None when at a keyframe that was restored.
+    """
+
+    def __init__(
+        self,
+        opcodes: List[int],
+        *,
+        keyframe_interval: int = 1024,
+        max_keyframes: int = 4096,
+        initial_state: State | None = None,
+        **options: Any,
+    ):
+        """
+        Parameters
+        ----------
+        opcodes : List[int]
+            PIO program to emulate.
+        keyframe_interval : int, optional
+            Number of clock cycles between keyframes, which doubles each time that the number of
+            keyframes exceeds max_keyframes.
+        max_keyframes : int, optional
+            Maximum number of keyframes to keep.
+        initial_state : State, optional
+            Initial values to use.
+        **options
+            Keyword arguments accepted by emulate(), excluding stop_when, profiler and hooks.
+        """
+        if keyframe_interval < 1:
+            raise ValueError(
+                "Debugger() invalid value for keyword argument: 'keyframe_interval'"
+            )
+
+        if max_keyframes < 1:
+            raise ValueError(
+                "Debugger() invalid value for keyword argument: 'max_keyframes'"
+            )
+
+        for name in ("profiler", "hooks"):
+            if options.get(name) is not None:
+                raise ValueError(
+                    f"Debugger() keyword argument '{name}' is not supported"
+                )
+
+        for name in ("transmit_feed", "receive_sink"):
+            feed = options.get(name)
+
+            if feed is not None and not isinstance(feed, DmaChannel):
+                raise ValueError(
+                    f"Debugger() keyword argument '{name}' must be a DmaChannel"
+                )
+
+        if "clkdiv" in options:
+            raise TypeError("Debugger() got an unexpected keyword argument 'clkdiv'")
+
+        self.state_machine = create_state_machine(opcodes, **options)
+
+        if self.state_machine.config.clkdiv != 1.0:
+            raise ValueError(
+                "Debugger() keyword argument 'config' must have a clkdiv of 1.0"
+            )
+
+        self.keyframe_interval = keyframe_interval
+        self.max_keyframes = max_keyframes
+        self.state = initial_state if initial_state else State()
+        self.previous_state: Optional[State] = None
+
+        # Clock and snapshot of the first state reached at, or after, each keyframe interval
+        self._origin = self.state.clock
+        self._keyframes: List[Tuple[int, bytes]] = [
+            (self.state.clock, self.state_machine.snapshot(self.state))
+        ]
+
+    def step(self) -> Optional[Tuple[State, State]]:
+        """
+        Emulates a single clock cycle, including any delay cycles which follow it.
+
+        Returns:
+        Tuple[State, State]: The states before and after the clock cycle, or None when the opcode
+                             at the program counter is invalid/not supported.
+        """
+        before = self.state
+        after = self._step(before)
+
+        if after is None:
+            return None
+
+        self.previous_state = before
+        self.state = after
+
+        return (before, after)
+
+    def run_until(self, predicate: Callable[[State, State], bool]) -> Optional[State]:
+        """
+        Steps forwards until the given predicate is satisfied by the states before and after a
+        step.
+
+        Parameters:
+        predicate (function): Invoked with the states before and after each step.
+
+        Returns:
+        State: The state after the step satisfying the predicate, or None when an opcode that is
+               invalid/not supported was reached first.
+        """
+        while True:
+            states = self.step()
+
+            if states is None:
+                return None
+
+            if predicate(*states):
+                return self.state
+
+    def goto(self, clock: int) -> State:
+        """
+        Moves forwards or backwards to the first state whose clock is at least the given value,
+        which is the state at which emulate() would stop for clock_cycles_reached(clock).
+
+        Parameters:
+        clock (int): The value of the clock to go to.
+
+        Returns:
+        State: The new current state.
+        """
+        if clock < self._origin:
+            raise ValueError("Debugger.goto() invalid value for argument: 'clock'")
+
+        index = self._keyframe_before(clock + 1)
+        keyframe_clock, snapshot = self._keyframes[index]
+
+        # Continue from the current state if it lies between the keyframe and the given clock
+        if not keyframe_clock <= self.state.clock <= clock:
+            self.state = self.state_machine.restore(snapshot)
+            self.previous_state = None
+
+        while self.state.clock < clock:
+            if self.step() is None:
+                break
+
+        return self.state
+
+    def step_back(self) -> Optional[State]:
+        """
+        Moves back to the state before the most recent step.
+
+        Returns:
+        State: The new current state, or None when already at the initial state.
+        """
+        clock = self.state.clock
+
+        if clock == self._origin:
+            return None
+
+        if self.previous_state is not None:
+            return self.goto(self.previous_state.clock)
+
+        # Find the step before the current state by emulating forwards from an earlier keyframe
+        _, snapshot = self._keyframes[self._keyframe_before(clock)]
+        state = self.state_machine.restore(snapshot)
+
+        while True:
+            next_state = self._step(state)
+
+            if next_state is None or next_state.clock >= clock:
+                return self.goto(state.clock)
+
+            state = next_state
+
+    def run_back_until(
+        self, predicate: Callable[[State, State], bool]
+    ) -> Optional[State]:
+        """
+        Moves backwards to the most recent step, before the current state, for which the given
+        predicate is satisfied by the states before and after it.
+
+        Parameters:
+        predicate (function): Invoked with the states before and after each step.
+
+        Returns:
+        State: The state after the step satisfying the predicate, or None when no earlier step
+               satisfies it, in which case the current state is unchanged.
+        """
+        current_snapshot = self.state_machine.snapshot(self.state)
+        index = self._keyframe_before(self.state.clock)
+
+        # Steps are searched for within the interval before the current state and then within
+        # each of the preceding intervals, up to and including the step reaching the next keyframe
+        limit = self.state.clock
+
+        while index >= 0:
+            keyframe_clock, snapshot = self._keyframes[index]
+            state = self.state_machine.restore(snapshot)
+            match_clock = None
+
+            while True:
+                next_state = self._step(state)
+
+                if next_state is None or next_state.clock >= limit:
+                    break
+
+                if predicate(state, next_state):
+                    match_clock = next_state.clock
+
+                state = next_state
+
+            if match_clock is not None:
+                return self.goto(match_clock)
+
+            limit = keyframe_clock + 1
+
+            while index >= 0 and self._keyframes[index][0] == keyframe_clock:
+                index -= 1
+
+        # The search has moved the state machine away from the current state
+        self.state_machine.restore(current_snapshot)
+
+        return None
+
+    def _step(self, state: State) -> Optional[State]:
+        new_state = self.state_machine.step(state)
+
+        if new_state is None:
+            return None
+
+        # Record a keyframe upon reaching each interval for the first time
+        index = (new_state.clock - self._origin) // self.keyframe_interval
+
+        if index >= len(self._keyframes):
+            keyframe = (new_state.clock, self.state_machine.snapshot(new_state))
+            self._keyframes.extend([keyframe] * (index + 1 - len(self._keyframes)))
+
+            # Keyframe i remains the first state reached at, or after, i intervals once every
+            # other keyframe has been discarded and the interval has doubled
+            while len(self._keyframes) > self.max_keyframes:
+                self._keyframes = self._keyframes[::2]
+                self.keyframe_interval *= 2
+
+        return new_state
+
+    def _keyframe_before(self, clock: int) -> int:
+        """Returns the index of the latest keyframe whose clock is less than the given value."""
+
+        index = (clock - 1 - self._origin) // self.keyframe_interval
+        index = max(0, min(index, len(self._keyframes) - 1))
+
+        while index > 0 and self._keyframes[index][0] >= clock:
+            index -= 1
+
+        return index
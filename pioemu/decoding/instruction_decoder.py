@@ -1,4 +1,4 @@
-# Copyright 2025 Nathan Young
+# Copyright 2025, 2026 Nathan Young
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -11,10 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Optional
+from typing import Dict, Optional
 from pioemu.instruction import (
     InInstruction,
     Instruction,
+    IrqInstruction,
     JmpInstruction,
     OutInstruction,
     PullInstruction,
@@ -22,6 +23,11 @@ from pioemu.instruction import (
     WaitInstruction,
 )
 
+# Decoded instruction for each opcode, by side_set_count, which are shared by all decoders and
+# populated on demand. This avoids decoding an opcode more than once, including those executed
+# dynamically, and ensures that each opcode is represented by a single Instruction.
+_decoded_instructions: Dict[int, Dict[int, Optional[Instruction]]] = {}
+
 
 class InstructionDecoder:
     """
@@ -37,6 +43,7 @@ class InstructionDecoder:
         self.side_set_count = side_set_count
         self.bits_for_delay = 5 - self.side_set_count
         self.delay_cycles_mask = (1 << self.bits_for_delay) - 1
+        self.decoded_instructions = _decoded_instructions.setdefault(side_set_count, {})
 
     def decode(self, opcode: int) -> Optional[Instruction]:
         """
@@ -49,6 +56,15 @@ class InstructionDecoder:
         Instruction: Representation of the given opcode or None when invalid/not supported
         """
 
+        try:
+            return self.decoded_instructions[opcode]
+        except KeyError:
+            # Should another thread decode the same opcode first then its instruction is used
+            return self.decoded_instructions.setdefault(
+                opcode, self._decode_uncached(opcode)
+            )
+
+    def _decode_uncached(self, opcode: int) -> Optional[Instruction]:
         match (opcode >> 13) & 7:
             case 0:
                 decoded_instruction = self._decode_jmp(opcode)
@@ -62,8 +78,10 @@ class InstructionDecoder:
                 decoded_instruction = self._decode_push(opcode)
             case 4 if opcode & 0x0080 != 0:
                 decoded_instruction = self._decode_pull(opcode)
+            case 6:
+                decoded_instruction = self._decode_irq(opcode)
 
-            # TODO: Add support for MOV, IRQ and SET instructions
+            # TODO: Add support for MOV and SET instructions
             case _:
                 decoded_instruction = None
 
@@ -90,6 +108,22 @@ class InstructionDecoder:
             side_set_value=side_set_value,
         )
 
+    def _decode_irq(self, opcode: int) -> Optional[IrqInstruction]:
+        # Check if reserved bits have been used
+        if opcode & 0x0088:
+            return None
+
+        delay_cycles, side_set_value = self._extract_delay_cycles_and_side_set(opcode)
+
+        return IrqInstruction(
+            opcode=opcode,
+            clear=bool(opcode & 0x0040),
+            wait=bool(opcode & 0x0020),
+            index=opcode & 0x17,
+            delay_cycles=delay_cycles,
+            side_set_value=side_set_value,
+        )
+
     def _decode_jmp(self, opcode: int) -> JmpInstruction:
         delay_cycles, side_set_value = self._extract_delay_cycles_and_side_set(opcode)
 
@@ -139,11 +173,17 @@ class InstructionDecoder:
         )
 
     def _decode_wait(self, opcode: int) -> Optional[WaitInstruction]:
+        source = (opcode >> 5) & 3
+
+        # Check if source has been reserved for future use
+        if source == 3:
+            return None
+
         delay_cycles, side_set_value = self._extract_delay_cycles_and_side_set(opcode)
 
         return WaitInstruction(
             opcode=opcode,
-            source=(opcode >> 5) & 3,
+            source=source,
             index=opcode & 0x1F,
             polarity=bool(opcode & 0x0080),
             delay_cycles=delay_cycles,
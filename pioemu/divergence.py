@@ -0,0 +1,278 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .debugger import Debugger
+from .shift_register import ShiftRegister
+from .state import State
+
+_DEFAULT_FIELDS = tuple(field.name for field in fields(State) if field.name != "clock")
+
+# Sample used for the clock cycles after an opcode that is invalid/not supported was reached
+_HALTED = "halted"
+
+
+@dataclass(frozen=True)
+class Divergence:
+    """First clock cycle at which two emulations differ."""
+
+    clock: int
+
+    # Names of the State fields whose values differ
+    fields: Tuple[str, ...]
+
+    # State of each emulation during the clock cycle, or None once it had halted upon reaching an
+    # opcode that is invalid/not supported
+    states: Tuple[Optional[State], Optional[State]]
+
+
+def find_divergence(
+    opcodes: List[int],
+    other_opcodes: List[int] | None = None,
+    *,
+    clock: int,
+    options: Dict[str, Any] | None = None,
+    other_options: Dict[str, Any] | None = None,
+    initial_state: State | None = None,
+    fields: Sequence[str] = _DEFAULT_FIELDS,
+    checkpoint_interval: int = 1024,
+) -> Optional[Divergence]:
+    """
+    Finds the first clock cycle at which two emulations differ, such as those of two versions of
+    a program or of one program with two configurations.
+
+    The state during a clock cycle is the one at the start of the instruction being executed, or
+    delayed, at that time. Rather than storing both traces, each emulation is summarised by a
+    chain of hashes, one per checkpoint_interval clock cycles, of the selected fields during every
+    clock cycle. The first checkpoint at which the chains differ is found by a binary search and
+    only the clock cycles since the previous checkpoint are emulated again, from a keyframe, to
+    determine the exact clock cycle.
+
+    Parameters
+    ----------
+    opcodes : List[int]
+        PIO program of the first emulation.
+    other_opcodes : List[int], optional
+        PIO program of the second emulation, defaults to the same as the first.
+    clock : int
+        Value of the clock at which to stop comparing the emulations.
+    options : Dict[str, Any], optional
+        Keyword arguments accepted by Debugger() to use for the first emulation.
+    other_options : Dict[str, Any], optional
+        Keyword arguments accepted by Debugger() to use for the second emulation.
+    initial_state : State, optional
+        Initial values to use for both emulations.
+    fields : Sequence[str], optional
+        Names of the State fields to compare, defaults to all of them except for the clock.
+    checkpoint_interval : int, optional
+        Number of clock cycles between checkpoints.
+
+    Returns
+    -------
+    Divergence
+        First clock cycle at which the selected fields differ, or None if they never do.
+    """
+    if checkpoint_interval < 1:
+        raise ValueError(
+            "find_divergence() invalid value for keyword argument: 'checkpoint_interval'"
+        )
+
+    sample = create_sampler(fields)
+
+    debuggers = [
+        Debugger(
+            program,
+            keyframe_interval=checkpoint_interval,
+            initial_state=initial_state,
+            **(program_options or {}),
+        )
+        for program, program_options in [
+            (opcodes, options),
+            (other_opcodes if other_opcodes is not None else opcodes, other_options),
+        ]
+    ]
+
+    start = debuggers[0].state.clock
+    first_hashes, second_hashes = [
+        _checkpoint_hashes(debugger, start, clock, checkpoint_interval, sample)
+        for debugger in debuggers
+    ]
+
+    # Once the chains differ they continue to do so, as each hash includes the previous one
+    low, high = 0, len(first_hashes)
+
+    while low < high:
+        middle = (low + high) // 2
+
+        if first_hashes[middle] == second_hashes[middle]:
+            low = middle + 1
+        else:
+            high = middle
+
+    if low == len(first_hashes):
+        return None
+
+    window_start = start + low * checkpoint_interval
+    window_end = min(window_start + checkpoint_interval, clock)
+
+    first_states, second_states = [
+        _states_per_cycle(debugger, window_start, window_end) for debugger in debuggers
+    ]
+
+    for (cycle, first_state), (_, second_state) in zip(first_states, second_states):
+        first_sample, second_sample = sample(first_state), sample(second_state)
+
+        if first_sample == second_sample:
+            continue
+
+        differing_fields = tuple(
+            name
+            for index, name in enumerate(fields)
+            if first_sample[index] != second_sample[index]
+        )
+
+        return Divergence(cycle, differing_fields, (first_state, second_state))
+
+    return None
+
+
+def _checkpoint_hashes(
+    debugger: Debugger,
+    start: int,
+    end: int,
+    interval: int,
+    sample: Callable[[Optional[State]], Any],
+) -> List[int]:
+    """Returns the hash chain of the selected fields at each checkpoint of the emulation."""
+
+    hashes = []
+    chain = 0
+    checkpoint = start + interval
+
+    # Consecutive clock cycles with the same values are hashed together, regardless of whether
+    # they are part of the same step
+    run_sample: Any = None
+    run_length = 0
+
+    for cycle, cycle_count, state in _steps(debugger, end):
+        values = sample(state)
+
+        while cycle_count > 0:
+            count = min(cycle_count, checkpoint - cycle)
+
+            if values == run_sample:
+                run_length += count
+            else:
+                chain = hash((chain, run_sample, run_length))
+                run_sample, run_length = values, count
+
+            cycle += count
+            cycle_count -= count
+
+            if cycle == checkpoint or cycle == end:
+                hashes.append(hash((chain, run_sample, run_length)))
+                chain, run_sample, run_length = hashes[-1], None, 0
+                checkpoint += interval
+
+    return hashes
+
+
+def _steps(debugger: Debugger, end: int) -> Iterator[Tuple[int, int, Optional[State]]]:
+    """Yields the first clock cycle, number of clock cycles and state of each step."""
+
+    state = debugger.state
+
+    while state.clock < end:
+        states = debugger.step()
+
+        if states is None:
+            yield state.clock, end - state.clock, None
+            return
+
+        yield state.clock, min(states[1].clock, end) - state.clock, state
+        state = states[1]
+
+
+def _states_per_cycle(
+    debugger: Debugger, start: int, end: int
+) -> Iterator[Tuple[int, Optional[State]]]:
+    """Yields the state during each clock cycle between the given values."""
+
+    # Find the step which was executing during the first clock cycle
+    debugger.goto(start)
+
+    if debugger.state.clock > start:
+        debugger.step_back()
+
+    cycle = start
+
+    for step_start, cycle_count, state in _steps(debugger, end):
+        step_end = step_start + cycle_count
+
+        while cycle < step_end:
+            yield cycle, state
+            cycle += 1
+
+
+def create_sampler(fields: Sequence[str]) -> Callable[[Optional[State]], Any]:
+    """
+    Returns a function which obtains a tuple of the values of the given fields of a state, in a
+    form that can be hashed and compared. The same marker is used for every field when the state
+    is None, indicating that the emulation had halted.
+
+    Parameters
+    ----------
+    fields : Sequence[str]
+        Names of the State fields to sample, excluding the clock.
+
+    Returns
+    -------
+    function
+    """
+    if not fields:
+        raise ValueError("at least one State field must be selected")
+
+    for name in fields:
+        if name not in _DEFAULT_FIELDS:
+            raise ValueError(f"unknown State field: '{name}'")
+
+    getter = attrgetter(*fields)
+    single_field = len(fields) == 1
+    halted = (_HALTED,) * len(fields)
+
+    def sample(state: Optional[State]) -> Any:
+        if state is None:
+            return halted
+
+        values = getter(state)
+
+        if single_field:
+            values = (values,)
+
+        return tuple(map(_hashable, values))
+
+    return sample
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, deque):
+        return tuple(value)
+
+    if isinstance(value, ShiftRegister):
+        return (value.contents, value.counter)
+
+    return value
@@ -0,0 +1,146 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+from typing import Any, Deque
+
+_FORMATS = {1: "B", 2: "H", 4: "I"}
+
+# Narrow writes to the FIFOs are replicated across all four byte lanes of the bus
+_REPLICATION_FACTORS = {1: 0x0101_0101, 2: 0x0001_0001, 4: 1}
+
+
+class DmaChannel:
+    """Lightweight model of a DMA channel transferring data between memory and a FIFO.
+
+    A channel can be passed to emulate() as either its transmit_feed, in which case data is read
+    from the buffer and written into the transmit FIFO, or as its receive_sink, in which case
+    data is read from the receive FIFO and written into the buffer. The buffer is accessed in
+    place through a memoryview and is never copied.
+
+    Transfers are paced by the data request (DREQ) signal of the FIFO, which is asserted while
+    the transmit FIFO is not full or the receive FIFO is not empty, and are limited to one per
+    clock cycle. Whenever several clock cycles have elapsed since the channel was last serviced,
+    such as during delay cycles, the outstanding transfers are performed together.
+
+    Attributes
+    ----------
+    count : int
+        Number of transfers that have been performed.
+    transfer_count : int
+        Total number of transfers to perform.
+    """
+
+    def __init__(
+        self,
+        buffer: Any,
+        *,
+        data_size: int = 4,
+        transfer_count: int | None = None,
+        ring_size: int = 0,
+    ):
+        """
+        Parameters
+        ----------
+        buffer : buffer
+            Memory to read from or write to, such as a `memoryview` or `bytearray`.
+        data_size : int, optional
+            Size of each transfer in bytes (1, 2 or 4).
+        transfer_count : int, optional
+            Number of transfers to perform, defaults to enough to read/write the whole buffer once.
+        ring_size : int, optional
+            Size in bytes (a power of two) at which the buffer address wraps around, or 0 to
+            disable wrapping.
+        """
+        if data_size not in _FORMATS:
+            raise ValueError("DmaChannel() invalid value for keyword argument: 'data_size'")
+
+        if ring_size < 0 or ring_size & (ring_size - 1) or ring_size % data_size:
+            raise ValueError("DmaChannel() invalid value for keyword argument: 'ring_size'")
+
+        self._view = memoryview(buffer).cast("B").cast(_FORMATS[data_size])
+        self._ring_length = ring_size // data_size
+        self._replication_factor = _REPLICATION_FACTORS[data_size]
+        self._mask = (1 << (8 * data_size)) - 1
+
+        if transfer_count is None:
+            transfer_count = len(self._view)
+
+        if transfer_count < 0 or (
+            not self._ring_length and transfer_count > len(self._view)
+        ):
+            raise ValueError(
+                "DmaChannel() invalid value for keyword argument: 'transfer_count'"
+            )
+
+        if self._ring_length > len(self._view):
+            raise ValueError("DmaChannel() ring_size exceeds the size of the buffer")
+
+        self.transfer_count = transfer_count
+        self.count = 0
+        self._index = 0
+        self._serviced_at: int | None = None
+
+    @property
+    def complete(self) -> bool:
+        """Return True once all of the transfers have been performed."""
+        return self.count >= self.transfer_count
+
+    def refill(self, transmit_fifo: Deque[int], clock: int = 0) -> Deque[int]:
+        """Return a copy of the given FIFO after transferring data from memory into it."""
+
+        transfers = self._available_transfers(4 - len(transmit_fifo), clock)
+
+        if transfers == 0:
+            return transmit_fifo
+
+        new_transmit_fifo = transmit_fifo.copy()
+
+        for _ in range(transfers):
+            new_transmit_fifo.append(self._view[self._index] * self._replication_factor)
+            self._advance()
+
+        return new_transmit_fifo
+
+    def drain(self, receive_fifo: Deque[int], clock: int = 0) -> Deque[int]:
+        """Return a copy of the given FIFO after transferring data from it into memory."""
+
+        transfers = self._available_transfers(len(receive_fifo), clock)
+
+        if transfers == 0:
+            return receive_fifo
+
+        new_receive_fifo = receive_fifo.copy()
+
+        for _ in range(transfers):
+            self._view[self._index] = new_receive_fifo.popleft() & self._mask
+            self._advance()
+
+        return new_receive_fifo
+
+    def _available_transfers(self, dreq_count: int, clock: int) -> int:
+        if self._serviced_at is None:
+            elapsed_cycles = 1
+        else:
+            elapsed_cycles = clock - self._serviced_at
+
+        self._serviced_at = clock
+
+        return max(0, min(dreq_count, elapsed_cycles, self.transfer_count - self.count))
+
+    def _advance(self):
+        self.count += 1
+        self._index += 1
+
+        if self._ring_length:
+            self._index %= self._ring_length
@@ -1,4 +1,4 @@
-# Copyright 2021, 2022, 2023, 2024, 2025 Nathan Young
+# Copyright 2021, 2022, 2023, 2024, 2025, 2026 Nathan Young
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -13,22 +13,22 @@
 # limitations under the License.
 import inspect
 import logging
-from dataclasses import replace
-from typing import Callable, Generator, List, Optional, Tuple
-
-from .bit_operations import update_bits_32
-from .decoding.instruction_decoder import InstructionDecoder as NewInstructionDecoder
-from .instruction import (
-    Emulation,
-    InInstruction,
-    Instruction,
-    JmpInstruction,
-    OutInstruction,
-    ProgramCounterAdvance,
-)
-from .instruction_decoder import InstructionDecoder
-from .shift_register import ShiftRegister
+from dataclasses import fields, replace
+from functools import lru_cache
+from types import FunctionType
+from typing import Any, Callable, Generator, Iterable, List, Tuple
+
+from .commands import Command, apply_commands
+from .config import StateMachineConfig
+from .deadlock import DeadlockError, permanent_stall_cause
+from .dma import DmaChannel
+from .feeds import ReceiveSink, TransmitFeed
+from .hooks import Hooks
+from .profiler import Profiler
 from .state import State
+from .state_machine import StateMachine
+
+_DEFAULT_OPTIONS = {field.name: field.default for field in fields(StateMachineConfig)}
 
 
 def emulate(
@@ -48,12 +48,26 @@ def emulate(
     side_set_base: int = 0,
     side_set_count: int = 0,
     jmp_pin: int = 0,
+    status_sel: int = 0,
+    status_n: int = 0,
     wrap_target: int = 0,
     wrap_top: int = 0,
-) -> Generator[Tuple[State, State], None, None]:
+    state_machine_number: int = 0,
+    transmit_feed: TransmitFeed | DmaChannel | None = None,
+    receive_sink: ReceiveSink | DmaChannel | None = None,
+    profiler: Profiler | None = None,
+    hooks: Hooks | None = None,
+    config: StateMachineConfig | None = None,
+    detect_deadlock: bool = False,
+    snapshot: bytes | None = None,
+) -> Generator[Tuple[State, State], Command | Iterable[Command] | None, None]:
     """
     Create and return a generator for emulating the given PIO program.
 
+    Commands, such as WriteTransmitFifo, can be sent into the generator with its send() method.
+    These are applied to the state before the next instruction is emulated. Sending TakeSnapshot
+    obtains a snapshot of the emulation without advancing it.
+
     Parameters
     ----------
     opcodes : List[int]
@@ -86,149 +100,253 @@ def emulate(
         Number of consecutive pins to include within the side-set.
     jmp_pin : int, optional
         Pin that determines the branch taken by JMP PIN instructions.
+    status_sel : int, optional
+        FIFO compared by MOV STATUS instructions, 0 for the transmit FIFO and 1 for receive.
+    status_n : int, optional
+        MOV STATUS reads all-ones when the number of entries within the FIFO is less than this.
     wrap_target : int, optional
         Program counter value to wrap to when the program counter reaches the wrap_top value.
     wrap_top : int, optional
         Program counter value to wrap from when the program counter reaches the wrap_top value.
         Defaults to len(opcodes) - 1.
+    state_machine_number : int, optional
+        Number of the state machine (0-3) within its PIO block, used by relative IRQ indexes.
+    transmit_feed : TransmitFeed or DmaChannel, optional
+        Supplies words to the transmit FIFO, as space allows, before each instruction.
+    receive_sink : ReceiveSink or DmaChannel, optional
+        Takes words from the receive FIFO, as they become available, before each instruction.
+    profiler : Profiler, optional
+        Collects cycle counts for each program counter value when provided.
+    hooks : Hooks, optional
+        Callbacks to invoke when specific events occur.
+    config : StateMachineConfig, optional
+        Validated configuration to use instead of the keyword arguments from auto_pull through
+        to state_machine_number, which must then be left at their default values.
+    detect_deadlock : bool, optional
+        Raise DeadlockError, rather than continuing to emulate the same stalled state, once the
+        state machine has stalled in a way it can never recover from. Stalls are not considered
+        permanent during clock cycles for which commands were sent into the generator.
+    snapshot : bytes, optional
+        Snapshot, obtained by sending TakeSnapshot into another generator or from the snapshot()
+        method of a StateMachine, to resume from instead of initial_state. The program and
+        configuration must be the same as when the snapshot was taken, while the transmit_feed
+        and receive_sink must be of the same kind and are advanced to the positions they had
+        reached.
 
     Returns
     -------
     generator
     """
-    logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.WARNING)
-    logger = logging.getLogger(__name__)
+    if stop_when is None:
+        raise ValueError("emulate() missing value for keyword argument: 'stop_when'")
 
-    if pull_threshold < 1 or pull_threshold > 32:
+    if snapshot is not None and initial_state is not None:
         raise ValueError(
-            "emulate() invalid value for keyword argument: 'pull_threshold'"
+            "emulate() keyword argument 'snapshot' cannot be combined with 'initial_state'"
         )
 
-    if push_threshold < 1 or push_threshold > 32:
-        raise ValueError(
-            "emulate() invalid value for keyword argument: 'push_threshold'"
-        )
+    options = {
+        "auto_pull": auto_pull,
+        "auto_push": auto_push,
+        "pull_threshold": pull_threshold,
+        "push_threshold": push_threshold,
+        "shift_isr_right": shift_isr_right,
+        "shift_osr_right": shift_osr_right,
+        "out_base": out_base,
+        "out_count": out_count,
+        "side_set_base": side_set_base,
+        "side_set_count": side_set_count,
+        "jmp_pin": jmp_pin,
+        "status_sel": status_sel,
+        "status_n": status_n,
+        "wrap_target": wrap_target,
+        "wrap_top": wrap_top,
+        "state_machine_number": state_machine_number,
+    }
+
+    if config is not None:
+        for name, value in options.items():
+            if value != _DEFAULT_OPTIONS[name]:
+                raise ValueError(
+                    f"emulate() keyword argument '{name}' cannot be combined with 'config'"
+                )
+
+        options = {}
+
+    state_machine = create_state_machine(
+        opcodes,
+        config=config,
+        input_source=input_source,
+        transmit_feed=transmit_feed,
+        receive_sink=receive_sink,
+        profiler=profiler,
+        hooks=hooks,
+        **options,
+    )
 
-    if out_base < 0 or out_base > 31:
-        raise ValueError("emulate() invalid value for keyword argument: 'out_base'")
+    _reject_clock_divider("emulate", state_machine)
 
-    if out_count < 0 or out_count > 32:
-        raise ValueError("emulate() invalid value for keyword argument: 'out_count'")
+    if snapshot is not None:
+        current_state = state_machine.restore(snapshot)
+    else:
+        current_state = initial_state if initial_state else State()
 
-    if stop_when is None:
-        raise ValueError("emulate() missing value for keyword argument: 'stop_when'")
+    stall_cause = None
 
-    if input_source:
-        input_source = _normalize_input_source(logger, input_source)
+    while not stop_when(opcodes[current_state.program_counter], current_state):
+        if stall_cause is not None:
+            raise DeadlockError(stall_cause, current_state)
 
-    shift_isr_method = (
-        ShiftRegister.shift_right if shift_isr_right else ShiftRegister.shift_left
-    )
-    shift_osr_method = (
-        ShiftRegister.shift_right if shift_osr_right else ShiftRegister.shift_left
-    )
+        previous_state = current_state
 
-    new_instruction_decoder = NewInstructionDecoder(side_set_count)
+        current_state = state_machine.step(current_state)
 
-    old_instruction_decoder = InstructionDecoder(
-        shift_isr_method, shift_osr_method, out_base, out_count, jmp_pin
-    )
+        if current_state is None:
+            return
 
-    wrap_top = wrap_top or len(opcodes) - 1
+        commands = yield (previous_state, current_state)
 
-    current_state = initial_state if initial_state else State()
-    stalled = False
+        if commands is not None:
+            current_state = apply_commands(
+                commands, current_state, state_machine.snapshot
+            )
+        elif detect_deadlock:
+            stall_cause = permanent_stall_cause(
+                state_machine, previous_state, current_state
+            )
 
-    while not stop_when(opcodes[current_state.program_counter], current_state):
-        previous_state = current_state
 
-        if input_source:
-            masked_values = current_state.pin_values & current_state.pin_directions
-            masked_input = input_source(current_state) & ~current_state.pin_directions
-            current_state = replace(
-                current_state,
-                pin_values=masked_values | masked_input,
-            )
+def emulate_until(
+    opcodes: List[int],
+    *,
+    clock: int,
+    initial_state: State | None = None,
+    config: StateMachineConfig | None = None,
+    snapshot: bytes | None = None,
+    **kwargs: Any,
+) -> State:
+    """
+    Emulate the given PIO program until the clock reaches the given value and return the final
+    state.
 
-        opcode = opcodes[current_state.program_counter]
+    The final state is the same as that produced by emulate() when its stop_when argument is
+    clock_cycles_reached(clock), but is obtained more quickly as the intermediate states are not
+    yielded. Common pairs of instructions, such as OUT followed by JMP !OSRE, are also emulated
+    together unless an input_source, transmit_feed, receive_sink, profiler or hooks are given.
+    Similarly, once the state machine has stalled in a way it can never recover from, the clock
+    is advanced to the given value without emulating the remaining clock cycles, unless an
+    input_source, profiler or hooks are given.
 
-        (side_set_value, delay_value) = _extract_delay_and_side_set_from_opcode(
-            opcode, side_set_count
+    Parameters
+    ----------
+    opcodes : List[int]
+        PIO program to emulate.
+    clock : int
+        Value of the clock at which to stop.
+    initial_state : State, optional
+        Initial values to use.
+    config : StateMachineConfig, optional
+        Validated configuration to use instead of the keyword arguments of emulate().
+    snapshot : bytes, optional
+        Snapshot to resume from instead of initial_state, see emulate().
+    **kwargs
+        Keyword arguments accepted by emulate(), excluding stop_when and detect_deadlock.
+
+    Returns
+    -------
+    State
+        State after the last clock cycle, or before the first opcode that is invalid/not supported.
+    """
+    if config is not None:
+        for name in kwargs:
+            if name in _DEFAULT_OPTIONS:
+                raise ValueError(
+                    f"emulate_until() keyword argument '{name}' cannot be combined with 'config'"
+                )
+
+    if snapshot is not None and initial_state is not None:
+        raise ValueError(
+            "emulate_until() keyword argument 'snapshot' cannot be combined with 'initial_state'"
         )
 
-        instruction = new_instruction_decoder.decode(opcode)
+    if "clkdiv" in kwargs:
+        raise TypeError("emulate_until() got an unexpected keyword argument 'clkdiv'")
 
-        emulation = (
-            old_instruction_decoder.create_emulation(instruction)
-            if instruction
-            else old_instruction_decoder.decode(opcode)
-        )
+    state_machine = create_state_machine(opcodes, config=config, **kwargs)
 
-        if emulation is None:
-            return
+    _reject_clock_divider("emulate_until", state_machine)
 
-        condition_met = emulation.condition(current_state)
-        if condition_met:
-            # Stall the state machine if it attempts to automatically push the contents of the ISR
-            # into a full FIFO. Please refer to the Autopush Details section (3.5.4.1) within the
-            # RP2040 Datasheet for more details.
-            if (
-                isinstance(instruction, InInstruction)
-                and auto_push
-                and current_state.input_shift_register.counter >= push_threshold
-                and len(current_state.receive_fifo) >= 4
-            ):
-                new_state = None
-
-            # Stall the state machine if it attempts to fill an empty OSR and execute 'OUT' within
-            # the same clock cycle. Please refer to the Autopull Details section (3.4.5.2) within
-            # the RP2040 Datasheet for more details.
-            elif (
-                isinstance(instruction, OutInstruction)
-                and auto_pull
-                and current_state.output_shift_register.counter >= pull_threshold
-            ):
-                new_state = None
-            else:
-                new_state = emulation.emulate(current_state)
-
-            if new_state is not None:
-                current_state = new_state
-                stalled = False
-            else:
-                stalled = True
-
-        current_state = _apply_side_effects(
-            instruction,
-            opcode,
-            current_state,
-            auto_push,
-            push_threshold,
-            auto_pull,
-            pull_threshold,
-        )
+    if snapshot is not None:
+        initial_state = state_machine.restore(snapshot)
 
-        # TODO: Check that the following still applies when an instruction is stalled
-        if side_set_count > 0:
-            current_state = _apply_side_set_to_pin_values(
-                current_state, side_set_base, side_set_count, side_set_value
-            )
+    return state_machine.run(initial_state if initial_state else State(), clock)
 
-        if not stalled:
-            current_state = _advance_program_counter(
-                emulation, condition_met, wrap_target, wrap_top, current_state
-            )
 
-            current_state = _apply_delay_value(
-                instruction, condition_met, delay_value, current_state
-            )
+def create_state_machine(
+    opcodes: List[int],
+    *,
+    config: StateMachineConfig | None = None,
+    input_source: Callable[[State], int] | Callable[[int], int] | None = None,
+    transmit_feed: TransmitFeed | DmaChannel | None = None,
+    receive_sink: ReceiveSink | DmaChannel | None = None,
+    profiler: Profiler | None = None,
+    hooks: Hooks | None = None,
+    **options: Any,
+) -> StateMachine:
+    """
+    Validates the given options and returns a state machine configured with them.
+
+    Parameters
+    ----------
+    The parameters are the same as those of emulate() except for stop_when and initial_state.
+    When a config is given any other options, such as state_machine_number, take precedence over
+    its values.
+
+    Returns
+    -------
+    StateMachine
+    """
+    if config is None:
+        config = _create_config(**options)
+    else:
+        changes = {
+            name: value
+            for name, value in options.items()
+            if getattr(config, name) != value
+        }
+
+        if changes:
+            config = replace(config, **changes)
+
+    if input_source:
+        input_source = _normalize_input_source(input_source)
+
+    return StateMachine(
+        opcodes,
+        config,
+        input_source=input_source,
+        transmit_feed=transmit_feed,
+        receive_sink=receive_sink,
+        profiler=profiler,
+        hooks=hooks,
+    )
+
+
+def _reject_clock_divider(function_name: str, state_machine: StateMachine):
+    # Without a system clock to divide, a clock divider would silently have no effect
+    if state_machine.config.clkdiv != 1.0:
+        raise ValueError(
+            f"{function_name}() keyword argument 'config' must have a clkdiv of 1.0"
+        )
 
-        current_state = replace(current_state, clock=current_state.clock + 1)
 
-        yield (previous_state, current_state)
+# Calls with the same options share a config, and hence the programs compiled with it
+@lru_cache(maxsize=64)
+def _create_config(**options: Any) -> StateMachineConfig:
+    return StateMachineConfig(**options)
 
 
-def _normalize_input_source(logger: logging.Logger, input_source: Callable):
+def _normalize_input_source(input_source: Callable):
     parameter_type = _get_input_source_parameter_type(input_source)
 
     if parameter_type == State:
@@ -236,7 +354,8 @@ def _normalize_input_source(logger: logging.Logger, input_source: Callable):
     elif parameter_type == int:
         return lambda state: input_source(state.clock)
     elif parameter_type is None:
-        logger.warning(
+        logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.WARNING)
+        logging.getLogger(__name__).warning(
             "input_source is missing type hints/annotations and may not work as expected"
         )
         return lambda state: input_source(state.clock)
@@ -245,6 +364,16 @@ def _normalize_input_source(logger: logging.Logger, input_source: Callable):
 
 
 def _get_input_source_parameter_type(input_source: Callable):
+    # Avoid the cost of inspect.signature() for plain functions and lambdas
+    if isinstance(input_source, FunctionType):
+        code = input_source.__code__
+
+        if (
+            code.co_argcount + code.co_kwonlyargcount == 1
+            and not code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+        ):
+            return input_source.__annotations__.get(code.co_varnames[0])
+
     parameters = list(inspect.signature(input_source).parameters.values())
 
     if len(parameters) != 1:
@@ -253,101 +382,3 @@ def _get_input_source_parameter_type(input_source: Callable):
     parameter_type = parameters[0].annotation
 
     return parameter_type if parameter_type != inspect._empty else None
-
-
-def _advance_program_counter(
-    emulation: Emulation,
-    condition_met: bool,
-    wrap_bottom: int,
-    wrap_top: int,
-    state: State,
-) -> State:
-    if state.program_counter == wrap_top:
-        new_pc = wrap_bottom
-    else:
-        new_pc = state.program_counter + 1
-
-    match emulation.program_counter_advance:
-        case ProgramCounterAdvance.ALWAYS:
-            return replace(state, program_counter=new_pc)
-        case ProgramCounterAdvance.WHEN_CONDITION_MET if condition_met:
-            return replace(state, program_counter=new_pc)
-        case ProgramCounterAdvance.WHEN_CONDITION_NOT_MET if not condition_met:
-            return replace(state, program_counter=new_pc)
-        case _:
-            return state
-
-
-def _apply_delay_value(
-    instruction: Optional[Instruction],
-    condition_met: bool,
-    delay_value: int,
-    state: State,
-) -> State:
-    if isinstance(instruction, JmpInstruction) or condition_met:
-        return replace(state, clock=state.clock + delay_value)
-
-    return state
-
-
-def _apply_side_effects(
-    instruction: Optional[Instruction],
-    opcode: int,
-    state: State,
-    auto_push: bool,
-    push_threshold: int,
-    auto_pull: bool,
-    pull_threshold: int,
-) -> State:
-    if (
-        isinstance(instruction, InInstruction)
-        and auto_push
-        and state.input_shift_register.counter >= push_threshold
-        and len(state.receive_fifo) < 4
-    ):
-        new_receive_fifo = state.receive_fifo.copy()
-        new_receive_fifo.append(state.input_shift_register.contents)
-        new_input_shift_register = ShiftRegister(0, 0)
-
-        return replace(
-            state,
-            receive_fifo=new_receive_fifo,
-            input_shift_register=new_input_shift_register,
-        )
-    elif (
-        isinstance(instruction, OutInstruction)
-        and auto_pull
-        and state.output_shift_register.counter >= pull_threshold
-        and state.transmit_fifo
-    ):
-        new_transmit_fifo = state.transmit_fifo.copy()
-        new_output_shift_register = ShiftRegister(new_transmit_fifo.popleft(), 0)
-
-        return replace(
-            state,
-            transmit_fifo=new_transmit_fifo,
-            output_shift_register=new_output_shift_register,
-        )
-    elif (opcode & 0xE0E0) == 0x0040:
-        return replace(state, x_register=(state.x_register - 1) & 0xFFFF_FFFF)
-    elif (opcode & 0xE0E0) == 0x0080:
-        return replace(state, y_register=(state.y_register - 1) & 0xFFFF_FFFF)
-
-    return state
-
-
-def _extract_delay_and_side_set_from_opcode(
-    opcode: int, side_set_count: int
-) -> Tuple[int, int]:
-    combined_values = (opcode >> 8) & 0x1F
-    bits_for_delay = 5 - side_set_count
-    delay_mask = (1 << bits_for_delay) - 1
-
-    return (combined_values >> bits_for_delay, combined_values & delay_mask)
-
-
-def _apply_side_set_to_pin_values(
-    state: State, pin_base: int, pin_count: int, pin_values: int
-) -> State:
-    new_pin_values = update_bits_32(state.pin_values, pin_values, pin_base, pin_count)
-    return replace(state, pin_values=new_pin_values)
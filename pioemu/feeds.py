@@ -0,0 +1,187 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Iterable, Iterator, List
+
+
+class TransmitFeed:
+    """Supplies words from the host to the transmit FIFO of a state machine.
+
+    The source can be any iterable of integers or an object supporting the buffer protocol, such
+    as `bytes`, `memoryview` or a NumPy array of uint32 values. Buffers are interpreted as a
+    sequence of 32-bit words in native byte order. Words are taken from the source in chunks and
+    then moved into the transmit FIFO as space becomes available.
+
+    Attributes
+    ----------
+    count : int
+        Total number of words moved into the transmit FIFO.
+    """
+
+    def __init__(self, source: Iterable[int] | Any, chunk_size: int = 1024):
+        """
+        Parameters
+        ----------
+        source : Iterable[int] or buffer
+            Words to supply to the transmit FIFO.
+        chunk_size : int, optional
+            Maximum number of words to take from the source at a time.
+        """
+        if chunk_size < 1:
+            raise ValueError("TransmitFeed() invalid value for argument: 'chunk_size'")
+
+        self.count = 0
+        self._chunks = _chunks_from_source(source, chunk_size)
+        self._pending: Deque[int] = deque()
+        self._exhausted = False
+
+    @property
+    def exhausted(self) -> bool:
+        """Return True once every word from the source has been moved into the FIFO."""
+        return not self._pending and not self._take_chunk()
+
+    def refill(self, transmit_fifo: Deque[int], clock: int = 0) -> Deque[int]:
+        """Return a copy of the given FIFO topped up with as many words as it has space for."""
+
+        space = 4 - len(transmit_fifo)
+
+        if len(self._pending) < space:
+            self._take_chunk()
+
+        words = [self._pending.popleft() for _ in range(min(space, len(self._pending)))]
+
+        if not words:
+            return transmit_fifo
+
+        self.count += len(words)
+
+        return deque([*transmit_fifo, *words])
+
+    def skip(self, word_count: int):
+        """Discards the given number of words from the source, as though they had been moved into
+        the transmit FIFO."""
+
+        if word_count < 0:
+            raise ValueError("TransmitFeed.skip() invalid value for argument: 'word_count'")
+
+        while len(self._pending) < word_count and self._take_chunk():
+            pass
+
+        word_count = min(word_count, len(self._pending))
+
+        for _ in range(word_count):
+            self._pending.popleft()
+
+        self.count += word_count
+
+    def _take_chunk(self) -> bool:
+        if self._exhausted:
+            return False
+
+        chunk = next(self._chunks, None)
+
+        if chunk is None:
+            self._exhausted = True
+            return False
+
+        self._pending.extend(chunk)
+        return True
+
+
+class ReceiveSink:
+    """Collects the words pushed into the receive FIFO of a state machine by the host.
+
+    The destination can be a preallocated, writable buffer such as a `bytearray` or NumPy array of
+    uint32 values, or any object with an append() method such as a `list`. Once a buffer is full,
+    words remain within the receive FIFO and the state machine stalls as it would on hardware.
+
+    Attributes
+    ----------
+    count : int
+        Total number of words taken from the receive FIFO.
+    """
+
+    def __init__(self, destination: Any):
+        """
+        Parameters
+        ----------
+        destination : buffer or object with an append() method
+            Where to store the words taken from the receive FIFO.
+        """
+        self.count = 0
+
+        try:
+            self._buffer = _as_words(memoryview(destination))
+            self._append = None
+            self.capacity: int | None = len(self._buffer)
+        except TypeError:
+            self._buffer = None
+            self._append = destination.append
+            self.capacity = None
+
+    @property
+    def full(self) -> bool:
+        """Return True when no more words can be stored."""
+        return self.capacity is not None and self.count >= self.capacity
+
+    def drain(self, receive_fifo: Deque[int], clock: int = 0) -> Deque[int]:
+        """Return a copy of the given FIFO with the words that could be stored removed."""
+
+        if self.capacity is None:
+            word_count = len(receive_fifo)
+        else:
+            word_count = min(len(receive_fifo), self.capacity - self.count)
+
+        if word_count == 0:
+            return receive_fifo
+
+        new_receive_fifo = receive_fifo.copy()
+
+        for _ in range(word_count):
+            word = new_receive_fifo.popleft()
+
+            if self._append is not None:
+                self._append(word)
+            else:
+                self._buffer[self.count] = word
+
+            self.count += 1
+
+        return new_receive_fifo
+
+
+def _chunks_from_source(source: Any, chunk_size: int) -> Iterator[List[int]]:
+    try:
+        words = _as_words(memoryview(source))
+    except TypeError:
+        iterator = iter(source)
+        return iter(lambda: list(islice(iterator, chunk_size)), [])
+
+    return (
+        words[index : index + chunk_size].tolist()
+        for index in range(0, len(words), chunk_size)
+    )
+
+
+def _as_words(view: memoryview) -> memoryview:
+    if view.format == "I" and view.itemsize == 4 and view.ndim == 1:
+        return view
+
+    byte_view = view.cast("B")
+
+    if len(byte_view) % 4 != 0:
+        raise ValueError("buffer length must be a multiple of 4 bytes (32-bit words)")
+
+    return byte_view.cast("I")
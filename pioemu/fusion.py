@@ -0,0 +1,231 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from .bit_operations import update_bits_32
+from .instruction import InInstruction, JmpInstruction, OutInstruction, PullInstruction
+from .shift_register import ShiftRegister
+from .state import State
+
+if TYPE_CHECKING:
+    from .config import CompiledInstruction, StateMachineConfig
+
+# Emulates a pair of instructions together, returning None when they cannot be fused for the
+# given state, in which case the instructions must be emulated individually instead
+FusedHandler = Callable[[State], Optional[State]]
+
+# OUT destinations and IN sources supported by fused handlers
+_FUSIBLE_OUT_DESTINATIONS = (0, 1, 2, 3, 4)
+_FUSIBLE_IN_SOURCES = (0, 1, 2, 3, 6, 7)
+
+
+def create_fused_handler(
+    first: "CompiledInstruction",
+    second: "CompiledInstruction",
+    next_program_counter: int,
+    config: "StateMachineConfig",
+) -> Optional[FusedHandler]:
+    """
+    Returns a handler which emulates two adjacent instructions as one, or None when the pair is
+    not one which can be fused.
+
+    The handlers produce exactly the same state as emulating the instructions individually and
+    must only be used when nothing needs to observe the state between them. Side-set, auto-pull
+    and auto-push are not supported.
+
+    Parameters:
+    first (CompiledInstruction): The instruction to be emulated first.
+    second (CompiledInstruction): The instruction that follows it.
+    next_program_counter (int): Program counter value following the second instruction.
+    config (StateMachineConfig): Configuration with which the instructions were compiled.
+
+    Returns:
+    FusedHandler: Handler for the pair or None when they cannot be fused.
+    """
+    if config.side_set_count:
+        return None
+
+    # Delay cycles are applied to both instructions as neither can be skipped
+    cycle_count = 2 + first.delay_value + second.delay_value
+
+    match (first.instruction, second.instruction):
+        # out pins, 1 / jmp !osre
+        case (
+            OutInstruction(destination=destination, bit_count=bit_count),
+            JmpInstruction(condition=7, target_address=target_address),
+        ) if (not config.auto_pull and destination in _FUSIBLE_OUT_DESTINATIONS):
+            return _fuse_out_with_jmp_not_osre(
+                _output_writer(destination, config),
+                _osr_shift_method(config),
+                bit_count,
+                target_address,
+                next_program_counter,
+                cycle_count,
+            )
+
+        # in pins, 1 / jmp x--
+        case (
+            InInstruction(source=source, bit_count=bit_count),
+            JmpInstruction(condition=2, target_address=target_address),
+        ) if (not config.auto_push and source in _FUSIBLE_IN_SOURCES):
+            return _fuse_in_with_jmp_x_decrement(
+                config.instruction_decoders[1].in_sources[source],
+                _isr_shift_method(config),
+                bit_count,
+                target_address,
+                next_program_counter,
+                cycle_count,
+            )
+
+        # pull block / out x, 32
+        case (
+            PullInstruction(if_empty=False, block=True),
+            OutInstruction(destination=destination, bit_count=bit_count),
+        ) if (not config.auto_pull and destination in _FUSIBLE_OUT_DESTINATIONS):
+            return _fuse_pull_with_out(
+                _output_writer(destination, config),
+                _osr_shift_method(config),
+                bit_count,
+                next_program_counter,
+                cycle_count,
+            )
+
+    return None
+
+
+def _fuse_out_with_jmp_not_osre(
+    write_output: Callable[[State, int, Dict[str, Any]], None],
+    shift_method: Callable,
+    bit_count: int,
+    target_address: int,
+    next_program_counter: int,
+    cycle_count: int,
+) -> FusedHandler:
+    def out_with_jmp_not_osre(state: State) -> State:
+        new_osr, shift_result = shift_method(state.output_shift_register, bit_count)
+
+        changes: Dict[str, Any] = {
+            "output_shift_register": new_osr,
+            "program_counter": (
+                target_address if new_osr.counter != 32 else next_program_counter
+            ),
+            "clock": state.clock + cycle_count,
+        }
+        write_output(state, shift_result, changes)
+
+        return replace(state, **changes)
+
+    return out_with_jmp_not_osre
+
+
+def _fuse_in_with_jmp_x_decrement(
+    read_input: Callable[[State], int],
+    shift_method: Callable,
+    bit_count: int,
+    target_address: int,
+    next_program_counter: int,
+    cycle_count: int,
+) -> FusedHandler:
+    def in_with_jmp_x_decrement(state: State) -> State:
+        new_isr, _ = shift_method(state.input_shift_register, bit_count, read_input(state))
+        x_register = state.x_register
+
+        return replace(
+            state,
+            input_shift_register=new_isr,
+            x_register=(x_register - 1) & 0xFFFF_FFFF,
+            program_counter=target_address if x_register != 0 else next_program_counter,
+            clock=state.clock + cycle_count,
+        )
+
+    return in_with_jmp_x_decrement
+
+
+def _fuse_pull_with_out(
+    write_output: Callable[[State, int, Dict[str, Any]], None],
+    shift_method: Callable,
+    bit_count: int,
+    next_program_counter: int,
+    cycle_count: int,
+) -> FusedHandler:
+    def pull_with_out(state: State) -> Optional[State]:
+        # PULL stalls when the FIFO is empty
+        if not state.transmit_fifo:
+            return None
+
+        new_transmit_fifo = state.transmit_fifo.copy()
+        new_osr, shift_result = shift_method(
+            ShiftRegister(new_transmit_fifo.popleft(), 0), bit_count
+        )
+
+        changes: Dict[str, Any] = {
+            "transmit_fifo": new_transmit_fifo,
+            "output_shift_register": new_osr,
+            "program_counter": next_program_counter,
+            "clock": state.clock + cycle_count,
+        }
+        write_output(state, shift_result, changes)
+
+        return replace(state, **changes)
+
+    return pull_with_out
+
+
+def _output_writer(
+    destination: int, config: "StateMachineConfig"
+) -> Callable[[State, int, Dict[str, Any]], None]:
+    out_base = config.out_base
+    out_count = config.out_count
+
+    def write_to_pins(state: State, value: int, changes: Dict[str, Any]):
+        changes["pin_values"] = update_bits_32(
+            state.pin_values, value, out_base, out_count
+        )
+
+    def write_to_x(_: State, value: int, changes: Dict[str, Any]):
+        changes["x_register"] = value & 0xFFFF_FFFF
+
+    def write_to_y(_: State, value: int, changes: Dict[str, Any]):
+        changes["y_register"] = value & 0xFFFF_FFFF
+
+    def write_to_null(*_):
+        pass
+
+    def write_to_pin_directions(state: State, value: int, changes: Dict[str, Any]):
+        changes["pin_directions"] = update_bits_32(
+            state.pin_directions, value, out_base, out_count
+        )
+
+    return [
+        write_to_pins,
+        write_to_x,
+        write_to_y,
+        write_to_null,
+        write_to_pin_directions,
+    ][destination]
+
+
+def _isr_shift_method(config: "StateMachineConfig") -> Callable:
+    if config.shift_isr_right:
+        return ShiftRegister.shift_right
+
+    return ShiftRegister.shift_left
+
+
+def _osr_shift_method(config: "StateMachineConfig") -> Callable:
+    if config.shift_osr_right:
+        return ShiftRegister.shift_right
+
+    return ShiftRegister.shift_left
@@ -0,0 +1,206 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from .instruction import JmpInstruction, OutInstruction
+from .state import State
+
+if TYPE_CHECKING:
+    from .state_machine import StateMachine
+
+Callback = Callable[[State, State], None]
+
+
+class Hooks:
+    """
+    Registry of callbacks that are invoked when specific events occur during emulation.
+
+    Each callback is invoked with the states before and after the clock cycle during which the
+    event occurred. Callbacks must be registered before the instance is passed to emulate(), as
+    only those events with at least one callback are checked for.
+    """
+
+    def __init__(self):
+        self.instruction_callbacks: Dict[int, List[Callback]] = {}
+        self.pin_change_callbacks: List[Callback] = []
+        self.transmit_fifo_pop_callbacks: List[Callback] = []
+        self.receive_fifo_push_callbacks: List[Callback] = []
+        self.stall_start_callbacks: List[Callback] = []
+        self.stall_end_callbacks: List[Callback] = []
+        self.wrap_callbacks: List[Callback] = []
+
+    def on_instruction(self, program_counter: int, callback: Callback):
+        """Invoke the callback when the instruction at the program counter is executed."""
+        self.instruction_callbacks.setdefault(program_counter, []).append(callback)
+
+    def on_pin_change(self, callback: Callback):
+        """Invoke the callback when the values or directions of the GPIO pins change."""
+        self.pin_change_callbacks.append(callback)
+
+    def on_transmit_fifo_pop(self, callback: Callback):
+        """Invoke the callback when the state machine takes a word from the transmit FIFO."""
+        self.transmit_fifo_pop_callbacks.append(callback)
+
+    def on_receive_fifo_push(self, callback: Callback):
+        """Invoke the callback when the state machine puts a word into the receive FIFO."""
+        self.receive_fifo_push_callbacks.append(callback)
+
+    def on_stall_start(self, callback: Callback):
+        """Invoke the callback when the state machine starts to stall."""
+        self.stall_start_callbacks.append(callback)
+
+    def on_stall_end(self, callback: Callback):
+        """Invoke the callback when the state machine stops stalling."""
+        self.stall_end_callbacks.append(callback)
+
+    def on_wrap(self, callback: Callback):
+        """Invoke the callback when the program counter wraps from wrap_top to wrap_target."""
+        self.wrap_callbacks.append(callback)
+
+    def install(self, state_machine: "StateMachine"):
+        """Wraps the step() and idle() methods of the state machine to dispatch events."""
+
+        dispatchers = self._create_dispatchers(state_machine)
+
+        if not dispatchers:
+            return
+
+        # The FIFOs are exchanged with any feeds before each clock cycle, which must not be
+        # mistaken for the state machine pushing or popping them, so the exchanged state is kept
+        exchanged_states: List[State] = []
+        exchange_fifo_contents = state_machine.exchange_fifo_contents
+
+        def exchanging(state: State) -> State:
+            exchanged_state = exchange_fifo_contents(state)
+            exchanged_states.append(exchanged_state)
+            return exchanged_state
+
+        def dispatching(method):
+            def wrapper(state: State) -> Optional[State]:
+                was_stalled = state_machine.stalled
+                exchanged_states.clear()
+                new_state = method(state)
+
+                if new_state is not None:
+                    exchanged_state = exchanged_states[0] if exchanged_states else state
+
+                    for dispatcher in dispatchers:
+                        dispatcher(state, exchanged_state, new_state, was_stalled)
+
+                return new_state
+
+            return wrapper
+
+        state_machine.exchange_fifo_contents = exchanging  # type: ignore[method-assign]
+        state_machine.step = dispatching(state_machine.step)  # type: ignore[method-assign]
+        state_machine.idle = dispatching(state_machine.idle)  # type: ignore[method-assign]
+
+    def _create_dispatchers(self, state_machine: "StateMachine") -> List[Callable]:
+        dispatchers: List[Callable] = []
+
+        if self.instruction_callbacks:
+            instruction_callbacks = self.instruction_callbacks
+
+            # Instructions executed by OUT EXEC or MOV EXEC are not part of the program
+            def dispatch_instruction(before: State, _: State, after: State, __: bool):
+                if before.exec_opcode is not None:
+                    return
+
+                for callback in instruction_callbacks.get(before.program_counter, ()):
+                    callback(before, after)
+
+            dispatchers.append(dispatch_instruction)
+
+        if self.pin_change_callbacks:
+            pin_change_callbacks = self.pin_change_callbacks
+
+            def dispatch_pin_change(before: State, _: State, after: State, __: bool):
+                if (
+                    before.pin_values != after.pin_values
+                    or before.pin_directions != after.pin_directions
+                ):
+                    for callback in pin_change_callbacks:
+                        callback(before, after)
+
+            dispatchers.append(dispatch_pin_change)
+
+        if self.transmit_fifo_pop_callbacks:
+            transmit_fifo_pop_callbacks = self.transmit_fifo_pop_callbacks
+
+            def dispatch_transmit_fifo_pop(
+                before: State, exchanged: State, after: State, _: bool
+            ):
+                if len(after.transmit_fifo) < len(exchanged.transmit_fifo):
+                    for callback in transmit_fifo_pop_callbacks:
+                        callback(before, after)
+
+            dispatchers.append(dispatch_transmit_fifo_pop)
+
+        if self.receive_fifo_push_callbacks:
+            receive_fifo_push_callbacks = self.receive_fifo_push_callbacks
+
+            def dispatch_receive_fifo_push(
+                before: State, exchanged: State, after: State, _: bool
+            ):
+                if len(after.receive_fifo) > len(exchanged.receive_fifo):
+                    for callback in receive_fifo_push_callbacks:
+                        callback(before, after)
+
+            dispatchers.append(dispatch_receive_fifo_push)
+
+        if self.stall_start_callbacks or self.stall_end_callbacks:
+            stall_start_callbacks = self.stall_start_callbacks
+            stall_end_callbacks = self.stall_end_callbacks
+
+            def dispatch_stall(
+                before: State, _: State, after: State, was_stalled: bool
+            ):
+                if state_machine.stalled and not was_stalled:
+                    for callback in stall_start_callbacks:
+                        callback(before, after)
+                elif was_stalled and not state_machine.stalled:
+                    for callback in stall_end_callbacks:
+                        callback(before, after)
+
+            dispatchers.append(dispatch_stall)
+
+        if self.wrap_callbacks:
+            wrap_callbacks = self.wrap_callbacks
+
+            def dispatch_wrap(before: State, _: State, after: State, __: bool):
+                if (
+                    before.program_counter == state_machine.wrap_top
+                    and after.program_counter == state_machine.wrap_target
+                    and not state_machine.stalled
+                    and before.exec_opcode is None
+                    and not _writes_program_counter(state_machine)
+                ):
+                    for callback in wrap_callbacks:
+                        callback(before, after)
+
+            dispatchers.append(dispatch_wrap)
+
+        return dispatchers
+
+
+def _writes_program_counter(state_machine: "StateMachine") -> bool:
+    match state_machine.instruction:
+        case JmpInstruction():
+            return state_machine.condition_met
+        case OutInstruction(destination=5):
+            return True
+        case None:
+            return (state_machine.opcodes[state_machine.wrap_top] & 0xE0E0) == 0xA0A0
+        case _:
+            return False
@@ -1,4 +1,4 @@
-# Copyright 2021, 2022, 2023, 2025 Nathan Young
+# Copyright 2021, 2022, 2023, 2025, 2026 Nathan Young
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -37,6 +37,13 @@ class InInstruction(Instruction):
     bit_count: int
 
 
+@dataclass(frozen=True, kw_only=True)
+class IrqInstruction(Instruction):
+    clear: bool
+    wait: bool
+    index: int  # Includes the REL bit (0x10) used for relative indexing
+
+
 @dataclass(frozen=True, kw_only=True)
 class JmpInstruction(Instruction):
     target_address: int
@@ -1,4 +1,4 @@
-# Copyright 2021, 2022, 2023, 2025 Nathan Young
+# Copyright 2021, 2022, 2023, 2025, 2026 Nathan Young
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -14,6 +14,7 @@
 from functools import partial
 from typing import Callable, List, Optional, Tuple
 
+from .bit_operations import reverse_bits_32
 from .conditions import (
     always,
     gpio_low,
@@ -31,6 +32,7 @@ from .instruction import (
     Emulation,
     InInstruction,
     Instruction,
+    IrqInstruction,
     JmpInstruction,
     OutInstruction,
     ProgramCounterAdvance,
@@ -38,6 +40,12 @@ from .instruction import (
     PushInstruction,
     WaitInstruction,
 )
+from .instructions.irq import (
+    irq_clear,
+    irq_set,
+    irq_wait,
+    wait_for_irq,
+)
 from .instructions.pull import (
     pull_blocking,
     pull_nonblocking,
@@ -52,10 +60,12 @@ from .primitive_operations import (
     read_from_osr,
     shift_from_osr,
     read_from_pins,
+    read_from_status,
     read_from_x,
     read_from_y,
     stall_unless_predicate_met,
     supplies_value,
+    write_to_exec,
     write_to_isr,
     write_to_osr,
     write_to_pin_directions,
@@ -82,6 +92,9 @@ class InstructionDecoder:
         out_base: int,
         out_count: int,
         jmp_pin: int,
+        state_machine_number: int = 0,
+        status_sel: int = 0,
+        status_n: int = 0,
     ):
         """
         Parameters
@@ -96,12 +109,19 @@ class InstructionDecoder:
             Number of consecutive pins to write for OUT instructions.
         jmp_pin : int
             Pin that determines the branch taken by JMP PIN instructions.
+        state_machine_number : int, optional
+            Number of the state machine (0-3) used to resolve relative IRQ indexes.
+        status_sel : int, optional
+            FIFO compared by MOV STATUS instructions, 0 for the transmit FIFO and 1 for receive.
+        status_n : int, optional
+            Number of entries below which MOV STATUS instructions read all-ones.
         """
 
         self.shift_isr_method = shift_isr_method
         self.shift_osr_method = shift_osr_method
         self.out_base = out_base
         self.out_count = out_count
+        self.state_machine_number = state_machine_number
 
         self.decoding_functions: List[Callable[[int], Optional[Emulation]]] = [
             lambda _: None,
@@ -142,7 +162,7 @@ class InstructionDecoder:
             read_from_y,
             supplies_value(0),
             None,
-            None,
+            partial(read_from_status, status_sel, status_n),
             read_from_isr,
             read_from_osr,
         ]
@@ -150,11 +170,11 @@ class InstructionDecoder:
         self.mov_destinations: List[
             Callable[[Callable[[State], int], State], State] | None
         ] = [
-            partial(write_to_pins, 0, 32),
+            partial(write_to_pins, out_base, out_count),
             write_to_x,
             write_to_y,
             None,
-            None,
+            write_to_exec,
             write_to_program_counter,
             write_to_isr,
             write_to_osr,
@@ -169,7 +189,7 @@ class InstructionDecoder:
             partial(write_to_pin_directions, self.out_base, self.out_count),
             write_to_program_counter,
             write_to_isr,
-            None,
+            write_to_exec,
         ]
 
         self.set_destinations: List[
@@ -201,6 +221,8 @@ class InstructionDecoder:
         match instruction:
             case InInstruction():
                 emulation = self._decode_in(instruction)
+            case IrqInstruction():
+                emulation = self._decode_irq(instruction)
             case JmpInstruction():
                 emulation = self._decode_jmp(instruction)
             case OutInstruction():
@@ -230,6 +252,36 @@ class InstructionDecoder:
         decoding_function = self.decoding_functions[(opcode >> 13) & 7]
         return decoding_function(opcode)
 
+    def resolve_irq_index(self, index: int) -> int:
+        """
+        Returns the number of the IRQ flag (0-7) selected by the index of an IRQ or WAIT
+        instruction. Relative indexes add the state machine number to the two least significant
+        bits using modulo-4 addition.
+        """
+
+        if index & 0x10:
+            return (index & 4) | ((index + self.state_machine_number) & 3)
+
+        return index & 7
+
+    def _decode_irq(self, instruction: IrqInstruction) -> Emulation:
+        index = self.resolve_irq_index(instruction.index)
+
+        if instruction.clear:
+            emulate = partial(irq_clear, index)
+        elif instruction.wait:
+            # The flag itself is raised by the caller when the instruction is first executed
+            emulate = partial(irq_wait, index)
+        else:
+            emulate = partial(irq_set, index)
+
+        return Emulation(
+            always,
+            emulate,
+            ProgramCounterAdvance.ALWAYS,
+            instruction,
+        )
+
     def _decode_jmp(self, instruction: JmpInstruction) -> Optional[Emulation]:
         condition = self.jmp_conditions[instruction.condition]
 
@@ -256,10 +308,14 @@ class InstructionDecoder:
 
         operation = (opcode >> 3) & 3
 
-        if operation == 1:
+        if operation == 0:
+            data_supplier = read_from_source
+        elif operation == 1:
             data_supplier = lambda state: read_from_source(state) ^ 0xFFFF_FFFF
+        elif operation == 2:
+            data_supplier = lambda state: reverse_bits_32(read_from_source(state))
         else:
-            data_supplier = read_from_source
+            return None
 
         if destination == 5:  # Program counter
             program_counter_advance = ProgramCounterAdvance.NEVER
@@ -354,15 +410,24 @@ class InstructionDecoder:
             instruction,
         )
 
-    @staticmethod
-    def _decode_wait(instruction: WaitInstruction) -> Emulation:
-        if instruction.polarity:
-            condition = partial(gpio_high, instruction.index)
+    def _decode_wait(self, instruction: WaitInstruction) -> Emulation:
+        if instruction.source == 2:  # IRQ
+            emulate = partial(
+                wait_for_irq,
+                self.resolve_irq_index(instruction.index),
+                instruction.polarity,
+            )
         else:
-            condition = partial(gpio_low, instruction.index)
+            if instruction.polarity:
+                condition = partial(gpio_high, instruction.index)
+            else:
+                condition = partial(gpio_low, instruction.index)
+
+            emulate = partial(stall_unless_predicate_met, condition)
 
         return Emulation(
             always,
-            partial(stall_unless_predicate_met, condition),
+            emulate,
             ProgramCounterAdvance.ALWAYS,
+            instruction,
         )
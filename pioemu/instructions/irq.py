@@ -0,0 +1,46 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import replace
+
+from ..conditions import irq_flag_clear, irq_flag_set
+from ..state import State
+
+
+def irq_set(index: int, state: State) -> State:
+    return replace(state, irq_flags=state.irq_flags | (1 << index))
+
+
+def irq_clear(index: int, state: State) -> State:
+    return replace(state, irq_flags=state.irq_flags & ~(1 << index))
+
+
+def irq_wait(index: int, state: State) -> State | None:
+    if irq_flag_set(index, state):
+        return None  # Represents a stall
+
+    return state
+
+
+def wait_for_irq(index: int, polarity: bool, state: State) -> State | None:
+    if polarity:
+        if irq_flag_clear(index, state):
+            return None  # Represents a stall
+
+        # The flag is cleared by the state machine once the wait condition has been met
+        return irq_clear(index, state)
+
+    if irq_flag_set(index, state):
+        return None  # Represents a stall
+
+    return state
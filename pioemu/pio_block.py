@@ -0,0 +1,230 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import replace
+from typing import Any, Callable, Dict, Generator, List, Sequence, Tuple
+
+from .emulation import create_state_machine
+from .snapshot import restore_snapshot, take_snapshot
+from .state import State
+from .state_machine import StateMachine
+
+
+def emulate_block(
+    programs: Sequence[List[int]],
+    *,
+    stop_when: Callable[[Tuple[State, ...]], bool],
+    initial_states: Sequence[State] | None = None,
+    options: Sequence[Dict[str, Any]] | None = None,
+    irq_flags: int = 0,
+) -> Generator[Tuple[Tuple[State, ...], Tuple[State, ...]], None, None]:
+    """
+    Create and return a generator for emulating up to four state machines within a PIO block.
+
+    The state machines share a single 8-bit register of IRQ flags, which is copied into the
+    irq_flags field of each State. During each system clock cycle the state machines are emulated
+    in order of their number, so any changes made to the IRQ flags by one state machine are
+    visible to the state machines that follow it.
+
+    Each step of the generator emulates the next system clock cycle during which at least one of
+    the state machines runs, as determined by their clkdiv options. The states of the others are
+    unchanged by the step. The system clock is not yielded, so PioBlock should be used directly
+    when it is required.
+
+    Parameters
+    ----------
+    programs : Sequence[List[int]]
+        PIO program to emulate for each state machine.
+    stop_when : function
+        Predicate used to determine if the emulation should stop or continue. It is invoked with
+        the states of all of the state machines.
+    initial_states : Sequence[State], optional
+        Initial values to use for each state machine.
+    options : Sequence[Dict[str, Any]], optional
+        Keyword arguments accepted by emulate() to use for each state machine, excluding
+        stop_when, initial_state and state_machine_number. These may also include clkdiv, the
+        clock divider of the state machine (1.0 - 65536.0) including its fractional part.
+    irq_flags : int, optional
+        Initial value of the IRQ flags shared by the state machines.
+
+    Returns
+    -------
+    generator
+    """
+    if len(programs) < 1 or len(programs) > 4:
+        raise ValueError("emulate_block() invalid value for argument: 'programs'")
+
+    if stop_when is None:
+        raise ValueError(
+            "emulate_block() missing value for keyword argument: 'stop_when'"
+        )
+
+    initial_states = initial_states or [State()] * len(programs)
+    options = options or [{}] * len(programs)
+
+    if len(initial_states) != len(programs) or len(options) != len(programs):
+        raise ValueError(
+            "emulate_block() expected one initial state and set of options per program"
+        )
+
+    state_machines = [
+        create_state_machine(opcodes, state_machine_number=number, **sm_options)
+        for number, (opcodes, sm_options) in enumerate(zip(programs, options))
+    ]
+
+    pio_block = PioBlock(state_machines, initial_states, irq_flags)
+    states = tuple(pio_block.states)
+
+    while not stop_when(states):
+        previous_states = states
+
+        if not pio_block.step():
+            return
+
+        states = tuple(pio_block.states)
+
+        yield (previous_states, states)
+
+
+class PioBlock:
+    """
+    Emulates the state machines within a PIO block one system clock cycle at a time.
+
+    The system clock cycles during which none of the state machines run, due to their clock
+    dividers or delay cycles, are skipped.
+
+    Attributes
+    ----------
+    states : List[State]
+        Current state of each state machine.
+    irq_flags : int
+        Current value of the IRQ flags shared by the state machines.
+    system_clock : int
+        System clock cycle most recently emulated, which is zero before the first step.
+    """
+
+    def __init__(
+        self,
+        state_machines: List[StateMachine],
+        initial_states: Sequence[State],
+        irq_flags: int = 0,
+    ):
+        """
+        Parameters
+        ----------
+        state_machines : List[StateMachine]
+            State machines to emulate, in order of their number.
+        initial_states : Sequence[State]
+            Initial values to use for each state machine.
+        irq_flags : int, optional
+            Initial value of the IRQ flags shared by the state machines.
+        """
+        self.state_machines = state_machines
+        self.states = [replace(state, irq_flags=irq_flags) for state in initial_states]
+        self.irq_flags = irq_flags
+        self.system_clock = 0
+
+        # System clock cycle at which each state machine next runs
+        self._system_clocks = [
+            state_machine.config.system_clock(state.clock)
+            for state_machine, state in zip(state_machines, self.states)
+        ]
+
+        # IRQ flags observed by each state machine when it became blocked on them, or None
+        self._flags_when_blocked: List[int | None] = [None] * len(state_machines)
+
+    def step(self) -> bool:
+        """
+        Emulates the next system clock cycle during which any of the state machines run, which
+        are those that are enabled by their clock divider and not part-way through their delay
+        cycles.
+
+        Returns:
+        bool: False when an opcode that is invalid/not supported was reached, otherwise True.
+        """
+        states = self.states
+        irq_flags = self.irq_flags
+        system_clocks = self._system_clocks
+        system_clock = min(system_clocks)
+
+        for number, state_machine in enumerate(self.state_machines):
+            if system_clocks[number] != system_clock:
+                continue
+
+            state = states[number]
+
+            if state.irq_flags != irq_flags:
+                state = replace(state, irq_flags=irq_flags)
+
+            # Rather than polling the flags, a blocked state machine is only woken once they change
+            if self._flags_when_blocked[number] == irq_flags:
+                state = states[number] = state_machine.idle(state)
+                system_clocks[number] = state_machine.config.system_clock(state.clock)
+                continue
+
+            new_state = state_machine.step(state)
+
+            if new_state is None:
+                return False
+
+            irq_flags = new_state.irq_flags
+            self._flags_when_blocked[number] = (
+                irq_flags if state_machine.blocked_on_irq else None
+            )
+            states[number] = new_state
+            system_clocks[number] = state_machine.config.system_clock(new_state.clock)
+
+        for number, state in enumerate(states):
+            if state.irq_flags != irq_flags:
+                states[number] = replace(state, irq_flags=irq_flags)
+
+        self.irq_flags = irq_flags
+        self.system_clock = system_clock
+
+        return True
+
+    def snapshot(self) -> bytes:
+        """
+        Returns a snapshot of the states of the state machines, including their stall status and
+        the positions of their feeds, along with the system clock.
+
+        Returns:
+        bytes: Snapshot that can be passed to restore(), possibly within another process.
+        """
+        return take_snapshot(
+            self.state_machines,
+            self.states,
+            self.system_clock,
+            self._flags_when_blocked,
+        )
+
+    def restore(self, snapshot: bytes):
+        """
+        Restores the states of the state machines, and everything else captured by snapshot(), so
+        that subsequent steps behave identically to those of the PIO block it was taken from.
+
+        Parameters:
+        snapshot (bytes): Snapshot returned by the snapshot() method.
+        """
+        states, system_clock, flags_when_blocked = restore_snapshot(
+            snapshot, self.state_machines
+        )
+
+        self.states = states
+        self.irq_flags = states[0].irq_flags
+        self.system_clock = system_clock
+        self._flags_when_blocked = flags_when_blocked
+        self._system_clocks = [
+            state_machine.config.system_clock(state.clock)
+            for state_machine, state in zip(self.state_machines, states)
+        ]
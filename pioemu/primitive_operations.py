@@ -76,6 +76,14 @@ def read_from_pins(state: State) -> int:
     return state.pin_values
 
 
+def read_from_status(fifo_index: int, level: int, state: State) -> int:
+    """Returns all-ones when the transmit (0) or receive (1) FIFO holds fewer than level entries."""
+
+    fifo = state.receive_fifo if fifo_index else state.transmit_fifo
+
+    return 0xFFFF_FFFF if len(fifo) < level else 0
+
+
 def read_from_x(state: State) -> int:
     """Reads the contents of the X scratch register."""
 
@@ -88,6 +96,12 @@ def read_from_y(state: State) -> int:
     return state.y_register
 
 
+def write_to_exec(data_supplier: Callable[[State], int], state: State) -> State:
+    """Copies the given data into the instruction register, to be executed next."""
+
+    return replace(state, exec_opcode=data_supplier(state) & 0xFFFF)
+
+
 def write_to_isr(
     data_supplier: Callable[[State], int], state: State, count: int = 0
 ) -> State:
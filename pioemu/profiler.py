@@ -0,0 +1,176 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from array import array
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from .instruction import (
+    InInstruction,
+    Instruction,
+    IrqInstruction,
+    JmpInstruction,
+    OutInstruction,
+    PullInstruction,
+    PushInstruction,
+    WaitInstruction,
+)
+
+# Number of instructions that can be held within the instruction memory of a PIO block
+_PROGRAM_SIZE = 32
+
+
+class StallCause(Enum):
+    WAIT_PIN = "wait_pin"
+    WAIT_IRQ = "wait_irq"
+    PULL_EMPTY = "pull_empty"
+    PUSH_FULL = "push_full"
+    AUTO_PULL = "auto_pull"
+    AUTO_PUSH = "auto_push"
+
+
+class Profiler:
+    """
+    Collects clock cycle counts for each program counter value during emulation.
+
+    An instance is passed to emulate() using its profiler keyword argument. When no profiler is
+    provided the emulator does not perform any profiling related work.
+
+    Attributes
+    ----------
+    retired : array
+        Number of instructions retired (completed) at each program counter value.
+    delay_cycles : array
+        Number of delay cycles consumed by the instructions at each program counter value.
+    stall_cycles : Dict[StallCause, array]
+        Number of clock cycles spent stalled at each program counter value, by cause.
+    branches_taken : array
+        Number of times the JMP instruction at each program counter value was taken.
+    branches_not_taken : array
+        Number of times the JMP instruction at each program counter value was not taken.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Resets all of the counters to zero."""
+        self.retired = _counters()
+        self.delay_cycles = _counters()
+        self.stall_cycles = {cause: _counters() for cause in StallCause}
+        self.branches_taken = _counters()
+        self.branches_not_taken = _counters()
+
+    def record_step(
+        self,
+        program_counter: int,
+        instruction: Optional[Instruction],
+        stalled: bool,
+        condition_met: bool,
+        delay_cycles: int,
+    ):
+        """Records the outcome of emulating the instruction at the given program counter."""
+
+        if stalled:
+            self.stall_cycles[stall_cause(instruction)][program_counter] += 1
+            return
+
+        self.retired[program_counter] += 1
+        self.delay_cycles[program_counter] += delay_cycles
+
+        if isinstance(instruction, JmpInstruction):
+            if condition_met:
+                self.branches_taken[program_counter] += 1
+            else:
+                self.branches_not_taken[program_counter] += 1
+
+    @property
+    def total_cycles(self) -> int:
+        """Return the total number of clock cycles that have been profiled."""
+        return (
+            sum(self.retired)
+            + sum(self.delay_cycles)
+            + sum(sum(counters) for counters in self.stall_cycles.values())
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the counters for those program counter values that have been executed."""
+
+        return {
+            "total_cycles": self.total_cycles,
+            "program_counters": {
+                program_counter: {
+                    "retired": self.retired[program_counter],
+                    "delay_cycles": self.delay_cycles[program_counter],
+                    "stall_cycles": {
+                        cause.value: counters[program_counter]
+                        for cause, counters in self.stall_cycles.items()
+                        if counters[program_counter]
+                    },
+                    "branches_taken": self.branches_taken[program_counter],
+                    "branches_not_taken": self.branches_not_taken[program_counter],
+                }
+                for program_counter in self._executed_program_counters()
+            },
+        }
+
+    def report(self) -> str:
+        """Returns a human-readable table of the counters."""
+
+        lines = [
+            f"{'PC':>3} {'Retired':>10} {'Delay':>10} {'Stalled':>10} {'Taken':>10} "
+            f"{'Not Taken':>10}  Stall Causes"
+        ]
+
+        for program_counter, counters in self.as_dict()["program_counters"].items():
+            stall_causes = counters["stall_cycles"]
+            lines.append(
+                f"{program_counter:>3} {counters['retired']:>10} {counters['delay_cycles']:>10} "
+                f"{sum(stall_causes.values()):>10} {counters['branches_taken']:>10} "
+                f"{counters['branches_not_taken']:>10}  "
+                + ", ".join(f"{cause}={count}" for cause, count in stall_causes.items())
+            )
+
+        lines.append(f"Total clock cycles: {self.total_cycles}")
+
+        return "\n".join(lines)
+
+    def _executed_program_counters(self) -> List[int]:
+        return [
+            program_counter
+            for program_counter in range(_PROGRAM_SIZE)
+            if self.retired[program_counter]
+            or any(counters[program_counter] for counters in self.stall_cycles.values())
+        ]
+
+
+def _counters() -> array:
+    return array("Q", bytes(8 * _PROGRAM_SIZE))
+
+
+def stall_cause(instruction: Optional[Instruction]) -> StallCause:
+    """Returns the reason that the given instruction has stalled the state machine."""
+
+    match instruction:
+        case WaitInstruction(source=2) | IrqInstruction():
+            return StallCause.WAIT_IRQ
+        case PullInstruction():
+            return StallCause.PULL_EMPTY
+        case PushInstruction():
+            return StallCause.PUSH_FULL
+        case OutInstruction():
+            return StallCause.AUTO_PULL
+        case InInstruction():
+            return StallCause.AUTO_PUSH
+        case _:
+            return StallCause.WAIT_PIN
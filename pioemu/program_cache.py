@@ -0,0 +1,122 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple
+
+
+class ProgramCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ProgramCache:
+    """
+    Bounded, thread-safe cache of compiled programs which discards the least recently used
+    program once full.
+
+    A single instance, program_cache, is shared by every call to emulate(), emulate_block() and
+    AsyncEmulator within a process. Programs are keyed by their opcodes together with the
+    StateMachineConfig used to compile them.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of compiled programs to hold, or 0 to disable caching.
+        """
+        if maxsize < 0:
+            raise ValueError("ProgramCache() invalid value for argument: 'maxsize'")
+
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """Return the maximum number of compiled programs held by the cache."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError("ProgramCache invalid value for attribute: 'maxsize'")
+
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def get(self, key: Hashable, compile_program: Callable[[], Any]) -> Any:
+        """
+        Returns the compiled program for the given key, compiling it on a cache miss.
+
+        Parameters:
+        key (Hashable): Opcodes and configuration identifying the program.
+        compile_program (Callable): Invoked to compile the program when it is not cached.
+
+        Returns:
+        The compiled program.
+        """
+        with self._lock:
+            compiled_program = self._entries.get(key)
+
+            if compiled_program is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return compiled_program
+
+            self._misses += 1
+
+        # Compile without holding the lock; should another thread compile the same program in the
+        # meantime then its result is used instead so that all callers share one instance
+        compiled_program = compile_program()
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+
+            if self._maxsize > 0:
+                self._entries[key] = compiled_program
+                self._evict()
+
+        return compiled_program
+
+    def info(self) -> ProgramCacheInfo:
+        """Returns the number of hits and misses along with the size of the cache."""
+
+        with self._lock:
+            return ProgramCacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def clear(self):
+        """Discards all of the compiled programs and resets the statistics."""
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+
+program_cache = ProgramCache()
@@ -0,0 +1,335 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import struct
+from collections import deque
+from hashlib import blake2b
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from .dma import DmaChannel
+from .feeds import ReceiveSink, TransmitFeed
+from .instruction import Instruction
+from .shift_register import ShiftRegister
+from .state import State
+
+if TYPE_CHECKING:
+    from .state_machine import StateMachine
+
+_MAGIC = b"PIOS"
+_VERSION = 2
+
+# Magic, version, number of state machines, system clock and digest of the programs and configs
+_HEADER = struct.Struct("<4sBBQ8s")
+
+# Clock, program counter, pin directions and values, shift registers (contents and counter), X, Y,
+# IRQ flags, opcode to execute (or -1), opcode of the most recent instruction (or -1), status
+# flags, IRQ flags when blocked (or -1) and the number of words within the transmit and receive
+# FIFOs
+_STATE = struct.Struct("<QBIIIBIBIIBiiBhBB")
+
+# Kind of feed, followed by the number of words it has moved or, for DMA channels, the number of
+# transfers, buffer index and clock when last serviced (or -1)
+_FEED_KIND = struct.Struct("<B")
+_FEED_COUNT = struct.Struct("<Q")
+_DMA_POSITION = struct.Struct("<QQq")
+
+_NO_FEED, _FEED_OR_SINK, _DMA_CHANNEL = range(3)
+
+_STALLED = 0x01
+_BLOCKED_ON_IRQ = 0x02
+_CONDITION_MET = 0x04
+
+
+def take_snapshot(
+    state_machines: Sequence["StateMachine"],
+    states: Sequence[State],
+    system_clock: int = 0,
+    flags_when_blocked: Sequence[Optional[int]] | None = None,
+) -> bytes:
+    """
+    Returns a compact representation of the given states, together with the outcome of the most
+    recent step and the positions of the transmit feeds and receive sinks of the state machines.
+    A digest of their programs and configurations is included so that the snapshot can only be
+    restored by equivalent state machines.
+
+    The input sources are not included as they are functions of the state, such as its clock,
+    and are therefore at the same position once the state has been restored.
+
+    Parameters
+    ----------
+    state_machines : Sequence[StateMachine]
+        State machines that most recently emulated the given states.
+    states : Sequence[State]
+        Current state of each state machine.
+    system_clock : int, optional
+        System clock cycle most recently emulated, for state machines within a PIO block.
+    flags_when_blocked : Sequence[int | None], optional
+        IRQ flags observed by each state machine when it became blocked on them, see PioBlock.
+
+    Returns
+    -------
+    bytes
+    """
+    flags_when_blocked = flags_when_blocked or [None] * len(states)
+    parts = [
+        _HEADER.pack(
+            _MAGIC, _VERSION, len(states), system_clock, _digest(state_machines)
+        )
+    ]
+
+    for state_machine, state, flags in zip(state_machines, states, flags_when_blocked):
+        _check_registers(state)
+
+        instruction = state_machine.instruction
+        status_flags = (
+            (_STALLED if state_machine.stalled else 0)
+            | (_BLOCKED_ON_IRQ if state_machine.blocked_on_irq else 0)
+            | (_CONDITION_MET if state_machine.condition_met else 0)
+        )
+
+        try:
+            packed_state = _STATE.pack(
+                state.clock,
+                state.program_counter,
+                state.pin_directions,
+                state.pin_values,
+                state.input_shift_register.contents,
+                state.input_shift_register.counter,
+                state.output_shift_register.contents,
+                state.output_shift_register.counter,
+                state.x_register,
+                state.y_register,
+                state.irq_flags,
+                -1 if state.exec_opcode is None else state.exec_opcode,
+                -1 if instruction is None else instruction.opcode,
+                status_flags,
+                -1 if flags is None else flags,
+                len(state.transmit_fifo),
+                len(state.receive_fifo),
+            )
+        except struct.error:
+            raise ValueError(
+                "take_snapshot() invalid value for argument: 'states'"
+            ) from None
+
+        parts.append(packed_state)
+        parts.append(
+            struct.pack(
+                f"<{len(state.transmit_fifo) + len(state.receive_fifo)}I",
+                *state.transmit_fifo,
+                *state.receive_fifo,
+            )
+        )
+        parts.append(_pack_feed(state_machine.transmit_feed))
+        parts.append(_pack_feed(state_machine.receive_sink))
+
+    return b"".join(parts)
+
+
+def restore_snapshot(
+    snapshot: bytes, state_machines: Sequence["StateMachine"]
+) -> Tuple[List[State], int, List[Optional[int]]]:
+    """
+    Restores the outcome of the most recent step, and the positions of the transmit feeds and
+    receive sinks, of the given state machines from a snapshot and returns the states held by it.
+    The state machines must have the same programs and configurations as those it was taken from.
+
+    The feeds and sinks must be those of a new emulation, such as a TransmitFeed created from the
+    same source as when the snapshot was taken, which have not advanced beyond the snapshot. Words
+    that had already been written into the buffer of a receive sink are not restored.
+
+    Parameters
+    ----------
+    snapshot : bytes
+        Snapshot returned by take_snapshot().
+    state_machines : Sequence[StateMachine]
+        State machines to restore, one for each state within the snapshot.
+
+    Returns
+    -------
+    Tuple[List[State], int, List[int | None]]
+        States, system clock and IRQ flags observed when blocked, see take_snapshot().
+    """
+    try:
+        magic, version, count, system_clock, digest = _HEADER.unpack_from(snapshot)
+    except struct.error:
+        raise ValueError("snapshot is truncated") from None
+
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("snapshot is not supported by this version of pioemu")
+
+    if count != len(state_machines):
+        raise ValueError(
+            f"snapshot contains {count} state machines rather than {len(state_machines)}"
+        )
+
+    if digest != _digest(state_machines):
+        raise ValueError("snapshot was taken with a different program or configuration")
+
+    offset = _HEADER.size
+    states = []
+    flags_when_blocked: List[Optional[int]] = []
+
+    try:
+        for state_machine in state_machines:
+            (
+                clock,
+                program_counter,
+                pin_directions,
+                pin_values,
+                isr_contents,
+                isr_counter,
+                osr_contents,
+                osr_counter,
+                x_register,
+                y_register,
+                irq_flags,
+                exec_opcode,
+                opcode,
+                status_flags,
+                flags,
+                transmit_count,
+                receive_count,
+            ) = _STATE.unpack_from(snapshot, offset)
+
+            offset += _STATE.size
+            words = struct.unpack_from(
+                f"<{transmit_count + receive_count}I", snapshot, offset
+            )
+            offset += 4 * len(words)
+
+            states.append(
+                State(
+                    clock=clock,
+                    program_counter=program_counter,
+                    pin_directions=pin_directions,
+                    pin_values=pin_values,
+                    transmit_fifo=deque(words[:transmit_count]),
+                    receive_fifo=deque(words[transmit_count:]),
+                    input_shift_register=ShiftRegister(isr_contents, isr_counter),
+                    output_shift_register=ShiftRegister(osr_contents, osr_counter),
+                    x_register=x_register,
+                    y_register=y_register,
+                    irq_flags=irq_flags,
+                    exec_opcode=None if exec_opcode < 0 else exec_opcode,
+                )
+            )
+
+            flags_when_blocked.append(None if flags < 0 else flags)
+
+            offset = _unpack_feed(snapshot, offset, state_machine.transmit_feed)
+            offset = _unpack_feed(snapshot, offset, state_machine.receive_sink)
+
+            state_machine.stalled = bool(status_flags & _STALLED)
+            state_machine.blocked_on_irq = bool(status_flags & _BLOCKED_ON_IRQ)
+            state_machine.condition_met = bool(status_flags & _CONDITION_MET)
+            state_machine.instruction = _instruction(state_machine, opcode)
+    except struct.error:
+        raise ValueError("snapshot is truncated") from None
+
+    return states, system_clock, flags_when_blocked
+
+
+def _check_registers(state: State):
+    registers = {
+        "pin_directions": (state.pin_directions,),
+        "pin_values": (state.pin_values,),
+        "input_shift_register": (state.input_shift_register.contents,),
+        "output_shift_register": (state.output_shift_register.contents,),
+        "x_register": (state.x_register,),
+        "y_register": (state.y_register,),
+        "transmit_fifo": state.transmit_fifo,
+        "receive_fifo": state.receive_fifo,
+    }
+
+    for name, values in registers.items():
+        if not all(0 <= value <= 0xFFFF_FFFF for value in values):
+            raise ValueError(f"take_snapshot() invalid value for State field: '{name}'")
+
+
+def _digest(state_machines: Sequence["StateMachine"]) -> bytes:
+    hasher = blake2b(digest_size=8)
+
+    for state_machine in state_machines:
+        description = repr((tuple(state_machine.opcodes), state_machine.config))
+        hasher.update(description.encode())
+
+    return hasher.digest()
+
+
+def _instruction(state_machine: "StateMachine", opcode: int) -> Optional[Instruction]:
+    if opcode < 0:
+        return None
+
+    compiled_instruction = state_machine.config.compile_instruction(opcode)
+
+    return None if compiled_instruction is None else compiled_instruction.instruction
+
+
+def _pack_feed(feed: TransmitFeed | ReceiveSink | DmaChannel | None) -> bytes:
+    match feed:
+        case DmaChannel():
+            serviced_at = feed._serviced_at
+
+            return _FEED_KIND.pack(_DMA_CHANNEL) + _DMA_POSITION.pack(
+                feed.count, feed._index, -1 if serviced_at is None else serviced_at
+            )
+        case TransmitFeed() | ReceiveSink():
+            return _FEED_KIND.pack(_FEED_OR_SINK) + _FEED_COUNT.pack(feed.count)
+        case _:
+            return _FEED_KIND.pack(_NO_FEED)
+
+
+def _unpack_feed(
+    snapshot: bytes, offset: int, feed: TransmitFeed | ReceiveSink | DmaChannel | None
+) -> int:
+    (kind,) = _FEED_KIND.unpack_from(snapshot, offset)
+    offset += _FEED_KIND.size
+
+    match feed:
+        case None:
+            expected_kind = _NO_FEED
+        case DmaChannel():
+            expected_kind = _DMA_CHANNEL
+        case _:
+            expected_kind = _FEED_OR_SINK
+
+    if kind != expected_kind:
+        raise ValueError("snapshot was taken with a different transmit feed/receive sink")
+
+    match feed:
+        case DmaChannel():
+            count, index, serviced_at = _DMA_POSITION.unpack_from(snapshot, offset)
+            offset += _DMA_POSITION.size
+
+            feed.count = count
+            feed._index = index
+            feed._serviced_at = None if serviced_at < 0 else serviced_at
+        case TransmitFeed():
+            (count,) = _FEED_COUNT.unpack_from(snapshot, offset)
+            offset += _FEED_COUNT.size
+
+            if count < feed.count:
+                raise ValueError("transmit feed has advanced beyond the snapshot")
+
+            feed.skip(count - feed.count)
+        case ReceiveSink():
+            (count,) = _FEED_COUNT.unpack_from(snapshot, offset)
+            offset += _FEED_COUNT.size
+
+            if feed.capacity is not None and count > feed.capacity:
+                raise ValueError("snapshot exceeds the capacity of the receive sink")
+
+            feed.count = count
+
+    return offset
@@ -1,4 +1,4 @@
-# Copyright 2021, 2022, 2023 Nathan Young
+# Copyright 2021, 2022, 2023, 2026 Nathan Young
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -34,3 +34,5 @@ class State:
     )
     x_register: int = 0
     y_register: int = 0
+    irq_flags: int = 0
+    exec_opcode: int | None = None  # Written by OUT/MOV EXEC and executed on the next cycle
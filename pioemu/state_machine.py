@@ -0,0 +1,494 @@
+# Copyright 2021, 2022, 2023, 2024, 2025, 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import replace
+from typing import Callable, List, Optional
+
+from .bit_operations import update_bits_32
+from .config import StateMachineConfig
+from .deadlock import fifos_quiescent, permanent_stall_cause
+from .dma import DmaChannel
+from .feeds import ReceiveSink, TransmitFeed
+from .hooks import Hooks
+from .instruction import (
+    Emulation,
+    InInstruction,
+    Instruction,
+    IrqInstruction,
+    JmpInstruction,
+    OutInstruction,
+    ProgramCounterAdvance,
+    WaitInstruction,
+)
+from .instructions.irq import irq_set
+from .profiler import Profiler
+from .shift_register import ShiftRegister
+from .snapshot import restore_snapshot, take_snapshot
+from .state import State
+
+
+class StateMachine:
+    """
+    Emulates a single state machine one clock cycle at a time.
+
+    Instances hold the configuration of the state machine but not its state, which is passed into
+    and returned from the step() method. The outcome of the most recent step is available from the
+    stalled, blocked_on_irq, instruction and condition_met attributes.
+    """
+
+    def __init__(
+        self,
+        opcodes: List[int],
+        config: StateMachineConfig | None = None,
+        *,
+        input_source: Callable[[State], int] | None = None,
+        transmit_feed: TransmitFeed | DmaChannel | None = None,
+        receive_sink: ReceiveSink | DmaChannel | None = None,
+        profiler: Profiler | None = None,
+        hooks: Hooks | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        opcodes : List[int]
+            PIO program to emulate.
+        config : StateMachineConfig, optional
+            Configuration of the state machine, defaults to that used by emulate().
+
+        The remaining parameters are the same as those of emulate() with the exception of
+        input_source, which must already have been normalized to accept a State.
+        """
+        config = config if config is not None else StateMachineConfig()
+
+        self.opcodes = opcodes
+        self.config = config
+        self.program = config.compile(opcodes)
+        self.input_source = input_source
+        self.auto_pull = config.auto_pull
+        self.auto_push = config.auto_push
+        self.pull_threshold = config.pull_threshold
+        self.push_threshold = config.push_threshold
+        self.side_set_base = config.side_set_base
+        self.side_set_count = config.side_set_count
+        self.wrap_target = config.wrap_target
+        self.wrap_top = config.wrap_top or len(opcodes) - 1
+        self.state_machine_number = config.state_machine_number
+        self.transmit_feed = transmit_feed
+        self.receive_sink = receive_sink
+
+        (
+            self.new_instruction_decoder,
+            self.old_instruction_decoder,
+        ) = config.instruction_decoders
+
+        self.stalled = False
+        self.blocked_on_irq = False
+        self.instruction: Optional[Instruction] = None
+        self.condition_met = False
+
+        # Fused instructions are only emulated when nothing can observe the state between them
+        self.fusion_enabled = (
+            input_source is None
+            and transmit_feed is None
+            and receive_sink is None
+            and profiler is None
+            and hooks is None
+        )
+
+        # Likewise the remaining clock cycles of a permanent stall are skipped by run(), unless
+        # the input pins must still be sampled on each of them
+        self.skip_permanent_stalls = (
+            input_source is None and profiler is None and hooks is None
+        )
+
+        if profiler is not None:
+            self.profiler = profiler
+            self.step = self._profiled_step  # type: ignore[method-assign]
+            self.idle = self._profiled_idle  # type: ignore[method-assign]
+
+        if hooks is not None:
+            hooks.install(self)
+
+    def step(self, state: State) -> Optional[State]:
+        """
+        Emulates a single clock cycle, including any delay cycles which follow it.
+
+        Parameters:
+        state (State): The state of the state machine before the clock cycle.
+
+        Returns:
+        State: The state of the state machine after the clock cycle or None when the opcode at
+               the program counter is invalid/not supported.
+        """
+        current_state = self.sample_input_source(self.exchange_fifo_contents(state))
+
+        # An instruction written by OUT EXEC or MOV EXEC is executed in place of the one at the
+        # program counter, which it does not advance. Please refer to the OUT (3.4.5.2) and MOV
+        # (3.4.8.2) sections within the RP2040 Datasheet.
+        exec_opcode = current_state.exec_opcode
+
+        if exec_opcode is None:
+            compiled_instruction = self.program[current_state.program_counter]
+        else:
+            compiled_instruction = self.config.compile_instruction(exec_opcode)
+            current_state = replace(current_state, exec_opcode=None)
+
+        if compiled_instruction is None:
+            return None
+
+        opcode = compiled_instruction.opcode
+        instruction = compiled_instruction.instruction
+        emulation = compiled_instruction.emulation
+        side_set_value = compiled_instruction.side_set_value
+        delay_value = compiled_instruction.delay_value
+
+        # 'IRQ WAIT' raises its flag when first executed and then stalls until the flag has been
+        # cleared. Please refer to the IRQ section (3.4.9) within the RP2040 Datasheet.
+        if (
+            isinstance(instruction, IrqInstruction)
+            and instruction.wait
+            and not instruction.clear
+            and not self.stalled
+        ):
+            current_state = irq_set(
+                self.old_instruction_decoder.resolve_irq_index(instruction.index),
+                current_state,
+            )
+
+        condition_met = emulation.condition(current_state)
+        if condition_met:
+            # Stall the state machine if it attempts to automatically push the contents of the ISR
+            # into a full FIFO. Please refer to the Autopush Details section (3.5.4.1) within the
+            # RP2040 Datasheet for more details.
+            if (
+                isinstance(instruction, InInstruction)
+                and self.auto_push
+                and current_state.input_shift_register.counter >= self.push_threshold
+                and len(current_state.receive_fifo) >= 4
+            ):
+                new_state = None
+
+            # Stall the state machine if it attempts to fill an empty OSR and execute 'OUT' within
+            # the same clock cycle. Please refer to the Autopull Details section (3.4.5.2) within
+            # the RP2040 Datasheet for more details.
+            elif (
+                isinstance(instruction, OutInstruction)
+                and self.auto_pull
+                and current_state.output_shift_register.counter >= self.pull_threshold
+            ):
+                new_state = None
+            else:
+                new_state = emulation.emulate(current_state)
+
+            if new_state is not None:
+                current_state = new_state
+                self.stalled = False
+            else:
+                self.stalled = True
+
+        self.blocked_on_irq = self.stalled and _waits_for_irq(instruction)
+        self.instruction = instruction
+        self.condition_met = condition_met
+
+        current_state = _apply_side_effects(
+            instruction,
+            opcode,
+            current_state,
+            self.auto_push,
+            self.push_threshold,
+            self.auto_pull,
+            self.pull_threshold,
+        )
+
+        # TODO: Check that the following still applies when an instruction is stalled
+        if self.side_set_count > 0:
+            current_state = _apply_side_set_to_pin_values(
+                current_state, self.side_set_base, self.side_set_count, side_set_value
+            )
+
+        program_counter = current_state.program_counter
+        clock = current_state.clock + 1
+
+        if self.stalled:
+            if exec_opcode is not None:
+                current_state = replace(current_state, exec_opcode=exec_opcode)
+        else:
+            if exec_opcode is None:
+                program_counter = _next_program_counter(
+                    emulation,
+                    condition_met,
+                    self.wrap_target,
+                    self.wrap_top,
+                    program_counter,
+                )
+
+            if isinstance(instruction, JmpInstruction) or condition_met:
+                clock += delay_value
+
+        return replace(current_state, program_counter=program_counter, clock=clock)
+
+    def run(self, state: State, clock: int) -> State:
+        """
+        Emulates clock cycles until the clock reaches the given value or an opcode that is
+        invalid/not supported is reached.
+
+        This produces the same state as calling step() repeatedly. However, when fusion is enabled,
+        pairs of instructions that were fused when the program was compiled are emulated together,
+        provided the clock does not reach the given value between them. The instruction and
+        condition_met attributes are not updated for fused instructions. Once the state machine
+        has stalled permanently, as determined by permanent_stall_cause(), and the feeds can no
+        longer move words into or out of the FIFOs, the clock advances straight to the given value
+        provided there is no input_source, profiler or hooks.
+
+        Parameters:
+        state (State): The state of the state machine before the first clock cycle.
+        clock (int): The value of the clock at which to stop.
+
+        Returns:
+        State: The state of the state machine after the last clock cycle emulated.
+        """
+        program = self.program
+        fusion_enabled = self.fusion_enabled
+        skip_permanent_stalls = self.skip_permanent_stalls
+
+        while state.clock < clock:
+            if fusion_enabled:
+                compiled_instruction = program[state.program_counter]
+
+                if (
+                    compiled_instruction is not None
+                    and compiled_instruction.fused_handler is not None
+                    and state.clock + compiled_instruction.delay_value + 1 < clock
+                    and state.exec_opcode is None
+                ):
+                    new_state = compiled_instruction.fused_handler(state)
+
+                    if new_state is not None:
+                        self.stalled = False
+                        self.blocked_on_irq = False
+                        state = new_state
+                        continue
+
+            new_state = self.step(state)
+
+            if new_state is None:
+                return state
+
+            # Every remaining clock cycle would produce the same state other than the clock
+            if (
+                self.stalled
+                and skip_permanent_stalls
+                and permanent_stall_cause(self, state, new_state) is not None
+                and fifos_quiescent(self, new_state)
+            ):
+                return replace(new_state, clock=clock)
+
+            state = new_state
+
+        return state
+
+    def idle(self, state: State) -> State:
+        """
+        Emulates a clock cycle during which the state machine remains blocked on an IRQ flag.
+
+        This produces the same result as step() when none of the IRQ flags have changed since the
+        state machine became blocked, but without decoding or emulating the instruction again.
+
+        Parameters:
+        state (State): The state of the state machine before the clock cycle.
+
+        Returns:
+        State: The state of the state machine after the clock cycle.
+        """
+        current_state = self.sample_input_source(self.exchange_fifo_contents(state))
+
+        if self.side_set_count > 0:
+            if current_state.exec_opcode is None:
+                compiled_instruction = self.program[current_state.program_counter]
+            else:
+                compiled_instruction = self.config.compile_instruction(
+                    current_state.exec_opcode
+                )
+
+            if compiled_instruction is not None:
+                current_state = _apply_side_set_to_pin_values(
+                    current_state,
+                    self.side_set_base,
+                    self.side_set_count,
+                    compiled_instruction.side_set_value,
+                )
+
+        return replace(current_state, clock=current_state.clock + 1)
+
+    def snapshot(self, state: State) -> bytes:
+        """
+        Returns a snapshot of the given state, which must be the state returned by the most recent
+        call to step() or run(), together with the outcome of that step and the positions of the
+        feeds.
+
+        Parameters:
+        state (State): The current state of the state machine.
+
+        Returns:
+        bytes: Snapshot that can be passed to restore(), possibly within another process.
+        """
+        return take_snapshot([self], [state])
+
+    def restore(self, snapshot: bytes) -> State:
+        """
+        Restores the outcome of the most recent step and the positions of the feeds from a
+        snapshot, so that emulating the state it returns behaves identically to the emulation it
+        was taken from. The program and configuration must match those of the snapshot.
+
+        Parameters:
+        snapshot (bytes): Snapshot returned by the snapshot() method.
+
+        Returns:
+        State: The state of the state machine when the snapshot was taken.
+        """
+        states, _, _ = restore_snapshot(snapshot, [self])
+        return states[0]
+
+    def _profiled_step(self, state: State) -> Optional[State]:
+        new_state = StateMachine.step(self, state)
+
+        if new_state is not None:
+            self.profiler.record_step(
+                state.program_counter,
+                self.instruction,
+                self.stalled,
+                self.condition_met,
+                new_state.clock - state.clock - 1,
+            )
+
+        return new_state
+
+    def _profiled_idle(self, state: State) -> State:
+        self.profiler.record_step(
+            state.program_counter, self.instruction, True, self.condition_met, 0
+        )
+
+        return StateMachine.idle(self, state)
+
+    def exchange_fifo_contents(self, state: State) -> State:
+        """Returns the given state after the host has refilled / drained the FIFOs."""
+
+        if self.transmit_feed is not None and len(state.transmit_fifo) < 4:
+            new_transmit_fifo = self.transmit_feed.refill(
+                state.transmit_fifo, state.clock
+            )
+
+            if new_transmit_fifo is not state.transmit_fifo:
+                state = replace(state, transmit_fifo=new_transmit_fifo)
+
+        if self.receive_sink is not None and state.receive_fifo:
+            new_receive_fifo = self.receive_sink.drain(state.receive_fifo, state.clock)
+
+            if new_receive_fifo is not state.receive_fifo:
+                state = replace(state, receive_fifo=new_receive_fifo)
+
+        return state
+
+    def sample_input_source(self, state: State) -> State:
+        """Returns the given state updated with the values present on the input pins."""
+
+        if self.input_source is None:
+            return state
+
+        masked_values = state.pin_values & state.pin_directions
+        masked_input = self.input_source(state) & ~state.pin_directions
+
+        return replace(state, pin_values=masked_values | masked_input)
+
+
+def _waits_for_irq(instruction: Optional[Instruction]) -> bool:
+    match instruction:
+        case IrqInstruction(clear=False, wait=True):
+            return True
+        case WaitInstruction(source=2):
+            return True
+        case _:
+            return False
+
+
+def _next_program_counter(
+    emulation: Emulation,
+    condition_met: bool,
+    wrap_bottom: int,
+    wrap_top: int,
+    program_counter: int,
+) -> int:
+    match emulation.program_counter_advance:
+        case ProgramCounterAdvance.ALWAYS:
+            pass
+        case ProgramCounterAdvance.WHEN_CONDITION_MET if condition_met:
+            pass
+        case ProgramCounterAdvance.WHEN_CONDITION_NOT_MET if not condition_met:
+            pass
+        case _:
+            return program_counter
+
+    return wrap_bottom if program_counter == wrap_top else program_counter + 1
+
+
+def _apply_side_effects(
+    instruction: Optional[Instruction],
+    opcode: int,
+    state: State,
+    auto_push: bool,
+    push_threshold: int,
+    auto_pull: bool,
+    pull_threshold: int,
+) -> State:
+    if (
+        isinstance(instruction, InInstruction)
+        and auto_push
+        and state.input_shift_register.counter >= push_threshold
+        and len(state.receive_fifo) < 4
+    ):
+        new_receive_fifo = state.receive_fifo.copy()
+        new_receive_fifo.append(state.input_shift_register.contents)
+        new_input_shift_register = ShiftRegister(0, 0)
+
+        return replace(
+            state,
+            receive_fifo=new_receive_fifo,
+            input_shift_register=new_input_shift_register,
+        )
+    elif (
+        isinstance(instruction, OutInstruction)
+        and auto_pull
+        and state.output_shift_register.counter >= pull_threshold
+        and state.transmit_fifo
+    ):
+        new_transmit_fifo = state.transmit_fifo.copy()
+        new_output_shift_register = ShiftRegister(new_transmit_fifo.popleft(), 0)
+
+        return replace(
+            state,
+            transmit_fifo=new_transmit_fifo,
+            output_shift_register=new_output_shift_register,
+        )
+    elif (opcode & 0xE0E0) == 0x0040:
+        return replace(state, x_register=(state.x_register - 1) & 0xFFFF_FFFF)
+    elif (opcode & 0xE0E0) == 0x0080:
+        return replace(state, y_register=(state.y_register - 1) & 0xFFFF_FFFF)
+
+    return state
+
+
+def _apply_side_set_to_pin_values(
+    state: State, pin_base: int, pin_count: int, pin_values: int
+) -> State:
+    new_pin_values = update_bits_32(state.pin_values, pin_values, pin_base, pin_count)
+    return replace(state, pin_values=new_pin_values)
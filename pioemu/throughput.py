@@ -0,0 +1,248 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+from dataclasses import dataclass, replace
+from itertools import cycle
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .analysis import Bounds, ProgramAnalysis, analyse_program
+from .config import StateMachineConfig
+from .emulation import create_state_machine
+from .instruction import InInstruction, OutInstruction
+from .state import State
+
+
+@dataclass(frozen=True)
+class Throughput:
+    """
+    Sustained rate at which data passes through the FIFOs of a state machine, in the worst case.
+    Rates are None for a FIFO which is not used repeatedly by the program.
+    """
+
+    # Frequency at which the state machine executes instructions, in Hz (sysclk / clock divider)
+    state_machine_frequency: float
+
+    transmit_words_per_second: Optional[float]
+    transmit_bits_per_second: Optional[float]
+    receive_words_per_second: Optional[float]
+    receive_bits_per_second: Optional[float]
+
+    # True when measured by emulation as the rates could not be determined statically
+    emulated: bool
+
+    # Whether the bit rates meet required_bits_per_second, or None when no rate was required
+    keeps_up: Optional[bool]
+
+
+def calculate_throughput(
+    opcodes: List[int],
+    config: StateMachineConfig | None = None,
+    *,
+    sysclk: float,
+    clkdiv: float | None = None,
+    required_bits_per_second: float | None = None,
+    initial_state: State | None = None,
+    input_source: Callable[[State], int] | Callable[[int], int] | None = None,
+    transmit_words: Sequence[int] = (0,),
+    emulation_cycles: int = 10_000,
+) -> Throughput:
+    """
+    Calculates the sustained rate at which words, and bits, pass through the FIFOs when the
+    given program runs at the given system clock frequency and clock divider.
+
+    The rates are determined by analyse_program() where possible, assuming that the FIFOs are
+    serviced quickly enough that they never stall the state machine. Otherwise, such as when the
+    program writes to PC or EXEC or contains a loop which could repeat forever, they are measured
+    by emulating the program for emulation_cycles clock cycles. Emulation is also used when an
+    input_source is given for a program that waits upon the pins.
+
+    Parameters
+    ----------
+    opcodes : List[int]
+        PIO program to analyse.
+    config : StateMachineConfig, optional
+        Configuration of the state machine, defaults to that used by emulate().
+    sysclk : float
+        System clock frequency in Hz.
+    clkdiv : float, optional
+        Clock divider of the state machine, including any fractional part (1.0 - 65536.0).
+        Defaults to the clkdiv of the configuration.
+    required_bits_per_second : float, optional
+        Bit rate, such as that of a protocol, which the program must sustain.
+    initial_state : State, optional
+        Initial values to use when emulating the program.
+    input_source : Callable, optional
+        Values present on the GPIO pins when emulating the program, see emulate().
+    transmit_words : Sequence[int], optional
+        Words written repeatedly to the transmit FIFO when emulating the program.
+    emulation_cycles : int, optional
+        Number of clock cycles to emulate when the rates cannot be determined statically.
+
+    Returns
+    -------
+    Throughput
+    """
+    if sysclk <= 0:
+        raise ValueError("calculate_throughput() invalid value for argument: 'sysclk'")
+
+    config = config if config is not None else StateMachineConfig()
+
+    if clkdiv is not None:
+        if clkdiv < 1.0 or clkdiv > 65536.0:
+            raise ValueError(
+                "calculate_throughput() invalid value for argument: 'clkdiv'"
+            )
+
+        config = replace(config, clkdiv=clkdiv)
+
+    # As on an RP2040 the fractional part of the clock divider is truncated to 8 bits
+    frequency = sysclk * 256 / config.clock_divisor
+    analysis = analyse_program(opcodes, config)
+
+    if _can_use_analysis(analysis, input_source):
+        transmit = _static_rates(
+            analysis.cycles_per_transmit_word, analysis.bits_per_transmit_word
+        )
+        receive = _static_rates(
+            analysis.cycles_per_receive_word, analysis.bits_per_receive_word
+        )
+        emulated = False
+    else:
+        transmit, receive = _emulated_rates(
+            opcodes,
+            config,
+            initial_state if initial_state else State(),
+            input_source,
+            transmit_words,
+            emulation_cycles,
+        )
+        emulated = True
+
+    transmit_words_per_second = None if transmit is None else transmit[0] * frequency
+    transmit_bits_per_second = None if transmit is None else transmit[1] * frequency
+    receive_words_per_second = None if receive is None else receive[0] * frequency
+    receive_bits_per_second = None if receive is None else receive[1] * frequency
+
+    bit_rates = [
+        rate
+        for rate in (transmit_bits_per_second, receive_bits_per_second)
+        if rate is not None
+    ]
+
+    if required_bits_per_second is None or not bit_rates:
+        keeps_up = None
+    else:
+        keeps_up = min(bit_rates) >= required_bits_per_second
+
+    return Throughput(
+        frequency,
+        transmit_words_per_second,
+        transmit_bits_per_second,
+        receive_words_per_second,
+        receive_bits_per_second,
+        emulated,
+        keeps_up,
+    )
+
+
+def _can_use_analysis(analysis: ProgramAnalysis, input_source) -> bool:
+    if analysis.has_dynamic_control_flow:
+        return False
+
+    if analysis.may_wait and input_source is not None:
+        return False
+
+    bounds = [
+        analysis.cycles_per_transmit_word,
+        analysis.bits_per_transmit_word,
+        analysis.cycles_per_receive_word,
+        analysis.bits_per_receive_word,
+    ]
+
+    return all(bound is None or bound.maximum is not None for bound in bounds)
+
+
+def _static_rates(
+    cycles: Optional[Bounds], bits: Optional[Bounds]
+) -> Optional[Tuple[float, float]]:
+    """Returns the worst-case words and bits per clock cycle."""
+
+    if cycles is None or bits is None or not cycles.maximum:
+        return None
+
+    return (1 / cycles.maximum, bits.minimum / cycles.maximum)
+
+
+def _emulated_rates(
+    opcodes: List[int],
+    config: StateMachineConfig,
+    initial_state: State,
+    input_source,
+    transmit_words: Sequence[int],
+    emulation_cycles: int,
+) -> Tuple[Optional[Tuple[float, float]], Optional[Tuple[float, float]]]:
+    """Returns the average words and bits per clock cycle, as measured by emulation."""
+
+    state_machine = create_state_machine(
+        opcodes, config=config, input_source=input_source
+    )
+
+    words = cycle(transmit_words)
+    state = initial_state
+    bits_out = 0
+    bits_in = 0
+
+    # Clock, and total number of bits shifted, when each word was pulled / pushed
+    pulls: List[Tuple[int, int]] = []
+    pushes: List[Tuple[int, int]] = []
+
+    while state.clock < emulation_cycles:
+        if len(state.transmit_fifo) < 4:
+            transmit_fifo = state.transmit_fifo.copy()
+            transmit_fifo.extend(next(words) for _ in range(4 - len(transmit_fifo)))
+            state = replace(state, transmit_fifo=transmit_fifo)
+
+        new_state = state_machine.step(state)
+
+        if new_state is None:
+            break
+
+        if not state_machine.stalled:
+            match state_machine.instruction:
+                case OutInstruction(bit_count=bit_count):
+                    bits_out += bit_count
+                case InInstruction(bit_count=bit_count):
+                    bits_in += bit_count
+
+        if len(new_state.transmit_fifo) < len(state.transmit_fifo):
+            pulls.append((new_state.clock, bits_out))
+
+        if new_state.receive_fifo:
+            pushes.append((new_state.clock, bits_in))
+            new_state = replace(new_state, receive_fifo=deque())
+
+        state = new_state
+
+    return _average_rates(pulls), _average_rates(pushes)
+
+
+def _average_rates(events: List[Tuple[int, int]]) -> Optional[Tuple[float, float]]:
+    # Measured between the first and last events, which excludes the time taken to start up
+    if len(events) < 2:
+        return None
+
+    (first_clock, first_bits), (last_clock, last_bits) = events[0], events[-1]
+    cycles = last_clock - first_clock
+
+    return ((len(events) - 1) / cycles, (last_bits - first_bits) / cycles)
@@ -0,0 +1,275 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from .conditions import clock_cycles_reached
+from .divergence import create_sampler
+from .emulation import emulate
+from .state import State
+
+_DIGEST_SIZE = 8
+
+_DEFAULT_FIELDS = ("pin_directions", "pin_values", "receive_fifo")
+
+
+@dataclass(frozen=True)
+class TraceHashes:
+    """
+    Compact record of the values of selected State fields during every clock cycle of an
+    emulation, suitable for storing as the expected result of a test.
+
+    The clock cycles are divided into windows of interval clock cycles, the last of which may be
+    shorter, and a hash is kept for each window. Each hash also includes the previous one, so that
+    the last hash depends upon every clock cycle.
+    """
+
+    fields: Tuple[str, ...]
+    interval: int
+
+    # Clock at which the emulation started and stopped
+    start: int
+    clock: int
+
+    # Hash of each window, in order
+    digests: Tuple[bytes, ...]
+
+    def encode(self) -> str:
+        """Returns a textual representation, such as for storing within the source of a test."""
+
+        return ";".join(
+            [
+                ",".join(self.fields),
+                str(self.interval),
+                str(self.start),
+                str(self.clock),
+                b"".join(self.digests).hex(),
+            ]
+        )
+
+    @classmethod
+    def decode(cls, text: str) -> "TraceHashes":
+        """Returns the trace hashes represented by text returned by the encode() method."""
+
+        try:
+            fields, interval, start, clock, digests = text.strip().split(";")
+            data = bytes.fromhex(digests)
+        except ValueError:
+            raise ValueError("text does not represent trace hashes") from None
+
+        return cls(
+            tuple(fields.split(",")),
+            int(interval),
+            int(start),
+            int(clock),
+            tuple(
+                data[offset : offset + _DIGEST_SIZE]
+                for offset in range(0, len(data), _DIGEST_SIZE)
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class TraceMismatch:
+    """
+    First window of clock cycles, start (inclusive) to end (exclusive), with a different hash or
+    which is missing from either the recording or the emulation.
+    """
+
+    window: int
+    start: int
+    end: int
+
+
+def record_trace_hashes(
+    opcodes: List[int],
+    *,
+    clock: int,
+    fields: Sequence[str] = _DEFAULT_FIELDS,
+    interval: int = 1024,
+    initial_state: State | None = None,
+    **options: Any,
+) -> TraceHashes:
+    """
+    Emulates the given PIO program until the clock reaches the given value and returns hashes of
+    the values of the selected fields during every clock cycle.
+
+    The state during a clock cycle is the one at the start of the instruction being executed, or
+    delayed, at that time. Consecutive clock cycles with the same values are hashed together, so
+    the hashes do not depend upon how the clock cycles were divided between instructions.
+
+    Parameters
+    ----------
+    opcodes : List[int]
+        PIO program to emulate.
+    clock : int
+        Value of the clock at which to stop.
+    fields : Sequence[str], optional
+        Names of the State fields to include, defaults to the pin directions and values along with
+        the receive FIFO.
+    interval : int, optional
+        Number of clock cycles covered by each hash.
+    initial_state : State, optional
+        Initial values to use.
+    **options
+        Keyword arguments accepted by emulate(), excluding stop_when.
+
+    Returns
+    -------
+    TraceHashes
+    """
+    if interval < 1:
+        raise ValueError(
+            "record_trace_hashes() invalid value for keyword argument: 'interval'"
+        )
+
+    start = initial_state.clock if initial_state else 0
+    digests = _window_digests(
+        opcodes, clock, tuple(fields), interval, initial_state, options
+    )
+
+    return TraceHashes(tuple(fields), interval, start, clock, tuple(digests))
+
+
+def check_trace_hashes(
+    expected: TraceHashes | str,
+    opcodes: List[int],
+    *,
+    initial_state: State | None = None,
+    **options: Any,
+) -> Optional[TraceMismatch]:
+    """
+    Emulates the given PIO program and compares the values of the fields during every clock
+    cycle with those recorded by record_trace_hashes(). The emulation stops at the end of the
+    first window that differs.
+
+    Parameters
+    ----------
+    expected : TraceHashes or str
+        Trace hashes, or their encoded form, recorded for the same initial state.
+    opcodes : List[int]
+        PIO program to emulate.
+    initial_state : State, optional
+        Initial values to use.
+    **options
+        Keyword arguments accepted by emulate(), excluding stop_when.
+
+    Returns
+    -------
+    TraceMismatch
+        First window that differs, or None when every window matches. When the recording does
+        not have one hash for each window, such as when it has been truncated, the first window
+        that is missing or extra is returned without emulating the program.
+    """
+    if isinstance(expected, str):
+        expected = TraceHashes.decode(expected)
+
+    start = initial_state.clock if initial_state else 0
+
+    if start != expected.start:
+        raise ValueError("check_trace_hashes() initial_state differs from the recording")
+
+    # A recording with the wrong number of windows would otherwise be compared only partially
+    window_count = -(-(expected.clock - start) // expected.interval)
+
+    if len(expected.digests) != window_count:
+        return _mismatch(min(len(expected.digests), window_count), start, expected)
+
+    digests = _window_digests(
+        opcodes,
+        expected.clock,
+        expected.fields,
+        expected.interval,
+        initial_state,
+        options,
+    )
+
+    for window, (digest, expected_digest) in enumerate(zip(digests, expected.digests)):
+        if digest != expected_digest:
+            return _mismatch(window, start, expected)
+
+    return None
+
+
+def _mismatch(window: int, start: int, expected: TraceHashes) -> TraceMismatch:
+    window_start = start + window * expected.interval
+    window_end = window_start + expected.interval
+
+    # Only the last window is shortened by the clock, extra windows lie beyond it
+    if window_start < expected.clock:
+        window_end = min(window_end, expected.clock)
+
+    return TraceMismatch(window, window_start, window_end)
+
+
+def _window_digests(
+    opcodes: List[int],
+    clock: int,
+    fields: Tuple[str, ...],
+    interval: int,
+    initial_state: State | None,
+    options: Any,
+) -> Iterator[bytes]:
+    """Yields the hash of each window of clock cycles as soon as it is complete."""
+
+    sample = create_sampler(fields)
+    state = initial_state if initial_state else State()
+    cycle = state.clock
+    window_end = cycle + interval
+
+    hasher = blake2b(digest_size=_DIGEST_SIZE)
+    run_values: Any = None
+    run_length = 0
+
+    def steps() -> Iterator[Tuple[Optional[State], int]]:
+        current_state = state
+
+        for _, new_state in emulate(
+            opcodes,
+            stop_when=clock_cycles_reached(clock),
+            initial_state=initial_state,
+            **options,
+        ):
+            yield current_state, min(new_state.clock, clock)
+            current_state = new_state
+
+        # The remaining clock cycles follow an opcode that is invalid/not supported
+        if current_state.clock < clock:
+            yield None, clock
+
+    for step_state, step_end in steps():
+        values = sample(step_state)
+
+        while cycle < step_end:
+            count = min(step_end, window_end) - cycle
+
+            if values == run_values:
+                run_length += count
+            else:
+                if run_length:
+                    hasher.update(repr((run_values, run_length)).encode())
+
+                run_values, run_length = values, count
+
+            cycle += count
+
+            if cycle == window_end or cycle == clock:
+                hasher.update(repr((run_values, run_length)).encode())
+                digest = hasher.digest()
+                yield digest
+
+                hasher = blake2b(digest, digest_size=_DIGEST_SIZE)
+                run_values, run_length = None, 0
+                window_end += interval
@@ -1,4 +1,4 @@
-# Copyright 2025 Nathan Young
+# Copyright 2025, 2026 Nathan Young
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -15,6 +15,7 @@ import pytest
 from pioemu.decoding.instruction_decoder import InstructionDecoder
 from pioemu.instruction import (
     InInstruction,
+    IrqInstruction,
     JmpInstruction,
     OutInstruction,
     PullInstruction,
@@ -25,7 +26,7 @@ from tests.opcodes import Opcodes
 
 
 # TODO: Add invalid opcodes for PULL, PUSH and WAIT
-@pytest.mark.parametrize("opcode", [Opcodes.nop(), 0x4081, 0x40A1])
+@pytest.mark.parametrize("opcode", [Opcodes.nop(), 0x4081, 0x40A1, 0x2060, 0xC008, 0xC080])
 def test_none_returned_for_unsupported_opcodes(opcode: int):
     decoded_instruction = InstructionDecoder().decode(opcode)
 
@@ -70,6 +71,38 @@ def test_decoding_of_in_instruction(
     )
 
 
+@pytest.mark.parametrize(
+    "opcode, side_set_count, expected_clear, expected_wait, expected_index, expected_delay_cycles, expected_side_set_value",
+    [
+        pytest.param(0xC003, 0, False, False, 3, 0, 0, id="irq set 3"),
+        pytest.param(0xC147, 0, True, False, 7, 1, 0, id="irq clear 7 [1]"),
+        pytest.param(0xD822, 2, False, True, 2, 0, 3, id="irq wait 2 side 0b11"),
+        pytest.param(0xC011, 0, False, False, 0x11, 0, 0, id="irq set 1 rel"),
+    ],
+)
+def test_decoding_of_irq_instruction(
+    opcode: int,
+    side_set_count: int,
+    expected_clear: bool,
+    expected_wait: bool,
+    expected_index: int,
+    expected_delay_cycles: int,
+    expected_side_set_value: int,
+):
+    instruction_decoder = InstructionDecoder(side_set_count)
+
+    decoded_instruction = instruction_decoder.decode(opcode)
+
+    assert decoded_instruction == IrqInstruction(
+        opcode=opcode,
+        clear=expected_clear,
+        wait=expected_wait,
+        index=expected_index,
+        delay_cycles=expected_delay_cycles,
+        side_set_value=expected_side_set_value,
+    )
+
+
 @pytest.mark.parametrize(
     "opcode, side_set_count, expected_target_address, expected_condition, expected_delay_cycles, expected_side_set_value",
     [
@@ -253,3 +286,11 @@ def test_decoding_of_wait_instruction(
         delay_cycles=expected_delay_cycles,
         side_set_value=expected_side_set_value,
     )
+
+
+def test_decoded_instructions_are_shared_by_decoders():
+    first_instruction = InstructionDecoder(2).decode(0x6101)
+
+    assert InstructionDecoder(2).decode(0x6101) is first_instruction
+    assert InstructionDecoder(0).decode(0x6101) is not first_instruction
+    assert InstructionDecoder(0).decode(0x6101).delay_cycles == 1
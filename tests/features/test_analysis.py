@@ -0,0 +1,125 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+
+import pytest
+
+from pioemu import State, StateMachineConfig, clock_cycles_reached, emulate
+from pioemu.analysis import Bounds, analyse_program, build_control_flow_graph
+
+# pull block / set pins, 0 [7] / set x, 7 / out pins, 1 [6] / jmp x-- 3 / set pins, 1 [7]
+UART_TX = [0x80A0, 0xE700, 0xE027, 0x6601, 0x0043, 0xE701]
+
+# out x, 1 side 0 [2] / jmp !x 3 side 1 [1] / jmp 0 side 1 [4] / nop side 0 [4]
+WS2812 = [0x6221, 0x1123, 0x1400, 0xA442]
+WS2812_CONFIG = StateMachineConfig(
+    auto_pull=True, pull_threshold=24, shift_osr_right=False, side_set_count=1
+)
+
+
+def test_control_flow_graph_follows_jmp_conditions_and_wrap():
+    # set x, 3 / jmp x-- 1 / jmp 3 / wait 1 gpio 0
+    graph = build_control_flow_graph(
+        [0xE023, 0x0041, 0x0003, 0x2080], StateMachineConfig(wrap_target=1)
+    )
+
+    assert [node.successors for node in graph.nodes] == [(1,), (1, 2), (3,), (1,)]
+    assert [node.may_stall for node in graph.nodes] == [False, False, False, True]
+    assert graph.reachable_from(2) == {1, 2, 3}
+
+
+def test_control_flow_graph_marks_unsupported_and_dynamic_instructions():
+    # in (reserved source), 32 / out pc, 5 / mov exec, x [3]
+    graph = build_control_flow_graph([0x4080, 0x60A5, 0xA381])
+
+    assert [node.supported for node in graph.nodes] == [False, True, True]
+    assert [node.dynamic for node in graph.nodes] == [False, True, True]
+    assert [node.successors for node in graph.nodes] == [(), (), ()]
+    assert graph.nodes[2].cycles == 1
+
+
+def test_cycles_per_transmit_word_with_counted_loop():
+    analysis = analyse_program(UART_TX, StateMachineConfig(out_count=1))
+
+    assert analysis.cycles_per_transmit_word == Bounds(82, 82)
+    assert analysis.bits_per_transmit_word == Bounds(8, 8)
+    assert analysis.cycles_per_receive_word is None
+    assert analysis.cycles_per_iteration == Bounds(82, 82)
+
+
+def test_cycles_per_transmit_word_with_auto_pull():
+    analysis = analyse_program(WS2812, WS2812_CONFIG)
+
+    assert analysis.cycles_per_transmit_word == Bounds(240, 240)
+    assert analysis.bits_per_transmit_word == Bounds(24, 24)
+    assert analysis.cycles_between_visits(1) == Bounds(10, 10)
+
+
+@pytest.mark.parametrize(
+    "program, config",
+    [(UART_TX, StateMachineConfig(out_count=1)), (WS2812, WS2812_CONFIG)],
+)
+def test_cycles_per_transmit_word_agree_with_emulation(program, config):
+    words = deque(range(0x0123_4567, 0x0123_4567 + 64))
+    pull_clocks = []
+
+    for before, after in emulate(
+        program,
+        stop_when=clock_cycles_reached(2000),
+        initial_state=State(transmit_fifo=deque([words.popleft()])),
+        config=config,
+    ):
+        if len(after.transmit_fifo) < len(before.transmit_fifo):
+            pull_clocks.append(before.clock)
+            after.transmit_fifo.append(words.popleft())
+
+    intervals = {end - start for start, end in zip(pull_clocks[1:], pull_clocks[2:])}
+    cycles_per_word = analyse_program(program, config).cycles_per_transmit_word
+
+    assert intervals == {cycles_per_word.minimum} == {cycles_per_word.maximum}
+
+
+def test_branches_on_unknown_values_give_range():
+    # in pins, 2 / jmp pin 4 / push [3] / jmp 0 / push [7]
+    analysis = analyse_program([0x4002, 0x00C4, 0x8320, 0x0000, 0x8720])
+
+    assert analysis.cycles_per_iteration == Bounds(7, 10)
+    assert analysis.cycles_per_receive_word == Bounds(7, 10)
+    assert analysis.bits_per_receive_word == Bounds(2, 2)
+
+
+def test_loop_on_unknown_value_is_unbounded():
+    # wait 1 gpio 0 / jmp pin 1 / push
+    analysis = analyse_program([0x2080, 0x00C1, 0x8020])
+
+    assert analysis.may_wait
+    assert analysis.cycles_per_receive_word == Bounds(3, None)
+
+
+def test_dynamic_control_flow_not_analysed():
+    # pull block / out pc, 5
+    analysis = analyse_program([0x80A0, 0x60A5])
+
+    assert analysis.has_dynamic_control_flow
+    assert analysis.cycles_per_transmit_word is None
+    assert analysis.cycles_between_visits(0) is None
+
+
+def test_program_without_recurring_events():
+    # set pindirs, 1 / set pins, 1 [1] / set pins, 0 / jmp 1
+    analysis = analyse_program([0xE081, 0xE101, 0xE000, 0x0001])
+
+    assert analysis.cycles_per_transmit_word is None
+    assert analysis.cycles_per_iteration is None
+    assert analysis.cycles_between_visits(1) == Bounds(4, 4)
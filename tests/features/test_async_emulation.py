@@ -0,0 +1,131 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+
+import pytest
+
+from pioemu import AsyncEmulator
+
+# Copies each word from the transmit FIFO into the receive FIFO after inverting it
+PULL_INVERT_PUSH = [0x80A0, 0xA0CF, 0x8020]  # pull block, mov isr, !osr, push block
+
+
+def test_words_put_into_transmit_fifo_are_received():
+    emulator = AsyncEmulator()
+    state_machine = emulator.add_state_machine(PULL_INVERT_PUSH)
+    received = []
+
+    async def producer():
+        for word in range(10):
+            await state_machine.tx.put(word)
+
+    async def consumer():
+        for _ in range(10):
+            received.append(await state_machine.rx.get())
+
+    async def main():
+        asyncio.create_task(producer())
+        task = asyncio.create_task(consumer())
+        await emulator.run(stop_when=lambda _: task.done(), batch_size=100)
+
+    asyncio.run(main())
+
+    assert received == [word ^ 0xFFFF_FFFF for word in range(10)]
+
+
+def test_wait_cycles_resumes_at_target_clock():
+    emulator = AsyncEmulator()
+    state_machine = emulator.add_state_machine([0xA342])  # nop [3]
+    clocks = []
+
+    async def peripheral():
+        for _ in range(3):
+            state = await state_machine.wait_cycles(10)
+            clocks.append(state.clock)
+
+    async def main():
+        task = asyncio.create_task(peripheral())
+        await emulator.run(stop_when=lambda _: task.done())
+
+    asyncio.run(main())
+
+    assert clocks == [12, 24, 36]  # Each step of the program consumes 4 clock cycles
+
+
+def test_emulation_runs_in_batches_when_nothing_is_awaited():
+    emulator = AsyncEmulator()
+    emulator.add_state_machine([0xA042])  # nop
+    yields = 0
+
+    async def counter():
+        nonlocal yields
+        while True:
+            yields += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(counter())
+        states = await emulator.run(
+            stop_when=lambda states: states[0].clock >= 1000, batch_size=250
+        )
+        task.cancel()
+        return states
+
+    states = asyncio.run(main())
+
+    assert states[0].clock == 1000
+    assert yields <= 6
+
+
+@pytest.mark.parametrize(
+    "opcodes, stop_when",
+    [
+        pytest.param([0xA042], lambda states: states[0].clock >= 10, id="stop_when"),
+        pytest.param([0xA042, 0xFFFF], lambda _: False, id="invalid opcode"),
+    ],
+)
+def test_waiters_cancelled_when_run_returns(opcodes, stop_when):
+    emulator = AsyncEmulator()
+    state_machine = emulator.add_state_machine(opcodes)
+
+    async def main():
+        tasks = [
+            asyncio.create_task(state_machine.rx.get()),
+            asyncio.create_task(state_machine.wait_cycles(1000)),
+            *[asyncio.create_task(state_machine.tx.put(word)) for word in range(6)],
+        ]
+
+        await emulator.run(stop_when=stop_when)
+        _, pending = await asyncio.wait(tasks, timeout=1)
+
+        return pending, [task.cancelled() for task in tasks]
+
+    pending, cancelled = asyncio.run(main())
+
+    # The transmit FIFO has space for four words, with the others still being awaited
+    assert not pending
+    assert cancelled == [True, True, False, False, False, False, True, True]
+
+
+def test_state_machines_cannot_be_added_once_running():
+    emulator = AsyncEmulator()
+    emulator.add_state_machine([0xA042])
+
+    async def main():
+        await emulator.run(stop_when=lambda states: states[0].clock >= 1)
+
+    asyncio.run(main())
+
+    with pytest.raises(RuntimeError):
+        emulator.add_state_machine([0xA042])
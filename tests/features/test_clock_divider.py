@@ -0,0 +1,156 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from pioemu import (
+    Debugger,
+    State,
+    StateMachineConfig,
+    emulate,
+    emulate_block,
+    emulate_until,
+    program_cache,
+)
+from pioemu.emulation import create_state_machine
+from pioemu.pio_block import PioBlock
+
+from ..opcodes import Opcodes
+
+
+@pytest.mark.parametrize(
+    "clkdiv, expected_system_clocks",
+    [
+        pytest.param(1.0, [0, 1, 2, 3, 4, 5], id="1.0"),
+        pytest.param(2.5, [0, 2, 5, 7, 10, 12], id="2.5"),
+        pytest.param(1.25, [0, 1, 2, 3, 5, 6], id="1.25"),
+        pytest.param(65536.0, [0, 65536, 131072, 196608, 262144, 327680], id="65536"),
+    ],
+)
+def test_system_clock_of_each_state_machine_clock_cycle(clkdiv, expected_system_clocks):
+    config = StateMachineConfig(clkdiv=clkdiv)
+
+    assert [config.system_clock(clock) for clock in range(6)] == expected_system_clocks
+
+
+def test_clock_divider_fraction_truncated_to_8_bits():
+    assert StateMachineConfig(clkdiv=1.3).clock_divisor == 332
+    assert StateMachineConfig(clkdiv=1.3).system_clock(1000) == 1296
+
+
+def test_state_machines_run_at_their_own_rates():
+    pio_block = PioBlock(
+        [
+            create_state_machine([Opcodes.nop()], clkdiv=1.0),
+            create_state_machine([Opcodes.nop()], clkdiv=2.5, state_machine_number=1),
+        ],
+        [State(), State()],
+    )
+
+    history = []
+
+    while pio_block.system_clock < 10:
+        pio_block.step()
+        history.append((pio_block.system_clock, [s.clock for s in pio_block.states]))
+
+    assert history == [
+        (0, [1, 1]),
+        (1, [2, 1]),
+        (2, [3, 2]),
+        (3, [4, 2]),
+        (4, [5, 2]),
+        (5, [6, 3]),
+        (6, [7, 3]),
+        (7, [8, 4]),
+        (8, [9, 4]),
+        (9, [10, 4]),
+        (10, [11, 5]),
+    ]
+
+
+def test_system_clock_cycles_without_state_machines_running_are_skipped():
+    pio_block = PioBlock(
+        [
+            create_state_machine([0xBF42], clkdiv=4.0),  # nop [31]
+            create_state_machine([0xA742], clkdiv=100.0, state_machine_number=1),
+        ],
+        [State(), State()],
+    )
+
+    system_clocks = []
+
+    for _ in range(5):
+        pio_block.step()
+        system_clocks.append(pio_block.system_clock)
+
+    # nop [7] occurs every 800 and nop [31] every 128 system clock cycles
+    assert system_clocks == [0, 128, 256, 384, 512]
+
+
+def test_slower_state_machine_observes_irq_at_its_next_clock_cycle():
+    programs = [
+        [0xA042, 0xA042, 0xA042, 0xA042, 0xC000, Opcodes.nop()],  # 4 x nop, irq set 0
+        [0x20C0, Opcodes.nop()],  # wait 1 irq 0
+    ]
+
+    history = [
+        states
+        for _, states in emulate_block(
+            programs,
+            stop_when=lambda states: states[1].program_counter == 1,
+            options=[{}, {"clkdiv": 3.0}],
+        )
+    ]
+
+    # The flag is set during system clock cycle 4 and state machine 1 next runs during cycle 6
+    assert len(history) == 7
+    assert history[-1][1].clock == 3
+
+
+def test_config_rejects_clock_divider_below_one():
+    with pytest.raises(ValueError, match="clkdiv"):
+        StateMachineConfig(clkdiv=0.5)
+
+
+@pytest.mark.parametrize(
+    "run",
+    [
+        pytest.param(
+            lambda **options: next(
+                emulate([0xA042], stop_when=lambda *_: False, **options)
+            ),
+            id="emulate",
+        ),
+        pytest.param(
+            lambda **options: emulate_until([0xA042], clock=10, **options),
+            id="emulate_until",
+        ),
+        pytest.param(lambda **options: Debugger([0xA042], **options), id="Debugger"),
+    ],
+)
+def test_clock_divider_rejected_without_system_clock(run):
+    with pytest.raises(TypeError, match="clkdiv"):
+        run(clkdiv=2.0)
+
+    with pytest.raises(ValueError, match="clkdiv"):
+        run(config=StateMachineConfig(clkdiv=2.0))
+
+
+def test_compiled_programs_shared_between_clock_dividers():
+    opcodes = [0xA042, 0xA042, 0xE001]  # nop / nop / set pins, 1
+
+    program = StateMachineConfig(clkdiv=1.0).compile(opcodes)
+    misses = program_cache.info().misses
+
+    assert StateMachineConfig(clkdiv=2.5).compile(opcodes) is program
+    assert program_cache.info().misses == misses
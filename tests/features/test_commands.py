@@ -0,0 +1,103 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+
+import pytest
+
+from pioemu import (
+    OverridePins,
+    PokeState,
+    State,
+    WriteTransmitFifo,
+    clock_cycles_reached,
+    emulate,
+)
+from pioemu.commands import Command
+
+
+def test_words_written_into_transmit_fifo_are_pulled():
+    generator = emulate(
+        [0x80A0],  # pull block
+        stop_when=clock_cycles_reached(10),
+    )
+
+    _, stalled_state = next(generator)
+    before, after = generator.send(WriteTransmitFifo(0x1234))
+
+    assert stalled_state.program_counter == 0
+    assert before.transmit_fifo == deque([0x1234])
+    assert after.output_shift_register.contents == 0x1234
+
+
+def test_words_written_into_full_transmit_fifo_are_discarded():
+    generator = emulate(
+        [0xA042],  # nop
+        initial_state=State(transmit_fifo=deque([1, 2, 3])),
+        stop_when=clock_cycles_reached(10),
+    )
+
+    next(generator)
+    before, _ = generator.send(WriteTransmitFifo(4, 5))
+
+    assert before.transmit_fifo == deque([1, 2, 3, 4])
+
+
+def test_overridden_pins_satisfy_wait():
+    generator = emulate(
+        [0x2082, 0xA042],  # wait 1 gpio 2 / nop
+        stop_when=clock_cycles_reached(10),
+    )
+
+    next(generator)
+    _, after = generator.send(OverridePins(0b100, mask=0b100))
+
+    assert after.program_counter == 1
+
+
+def test_overridden_input_pins_replaced_by_input_source():
+    generator = emulate(
+        [0xA042],  # nop
+        initial_state=State(pin_directions=0b01),
+        stop_when=clock_cycles_reached(10),
+        input_source=lambda clock: 0,
+    )
+
+    next(generator)
+    before, _ = generator.send(OverridePins(0b11, mask=0b11))
+    _, after = next(generator)
+
+    assert before.pin_values == 0b11
+    assert after.pin_values == 0b01
+
+
+def test_command_subclasses_must_implement_apply():
+    class IncompleteCommand(Command):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteCommand()
+
+
+def test_sequence_of_commands_applied_in_order():
+    generator = emulate(
+        [0xA042],  # nop
+        stop_when=clock_cycles_reached(10),
+    )
+
+    next(generator)
+    before, _ = generator.send(
+        [PokeState(x_register=5, y_register=6), PokeState(x_register=7)]
+    )
+
+    assert (before.x_register, before.y_register) == (7, 6)
@@ -0,0 +1,96 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+
+import pytest
+
+from pioemu import StateMachineConfig, clock_cycles_reached, emulate, emulate_block
+
+# out pins, 8 / set x, 1 / wait 1 irq 0 rel
+PROGRAM = [0x6008, 0xE021, 0x20D0]
+
+
+def _final_state(**kwargs):
+    state = None
+
+    for _, state in emulate(PROGRAM, stop_when=clock_cycles_reached(2), **kwargs):
+        pass
+
+    return state
+
+
+def test_config_produces_same_result_as_keyword_arguments():
+    config = StateMachineConfig(shift_osr_right=False, out_count=8)
+
+    assert _final_state(config=config) == _final_state(
+        shift_osr_right=False, out_count=8
+    )
+
+
+def test_compiled_program_is_shared_by_equal_configs():
+    config = StateMachineConfig()
+
+    assert config.compile(PROGRAM) is config.compile(list(PROGRAM))
+    assert config.compile(PROGRAM) is StateMachineConfig().compile(PROGRAM)
+    assert config.compile(PROGRAM) is not StateMachineConfig(out_count=8).compile(
+        PROGRAM
+    )
+
+
+def test_config_can_be_pickled():
+    config = StateMachineConfig(auto_pull=True, pull_threshold=8)
+
+    unpickled_config = pickle.loads(pickle.dumps(config))
+
+    assert unpickled_config == config
+    assert _final_state(config=unpickled_config) == _final_state(config=config)
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("pull_threshold", 0),
+        ("push_threshold", 33),
+        ("out_base", 32),
+        ("out_count", -1),
+        ("side_set_count", 6),
+        ("status_sel", 2),
+        ("status_n", 16),
+        ("wrap_top", 32),
+        ("state_machine_number", 4),
+    ],
+)
+def test_config_rejects_invalid_values(name, value):
+    with pytest.raises(ValueError, match=name):
+        StateMachineConfig(**{name: value})
+
+
+def test_config_cannot_be_combined_with_keyword_arguments():
+    with pytest.raises(ValueError, match="out_count"):
+        _final_state(config=StateMachineConfig(), out_count=8)
+
+
+def test_state_machine_number_applied_to_config_within_block():
+    config = StateMachineConfig()
+
+    # Relative IRQ index 0 resolves to flag 1 for state machine 1
+    *_, (_, states) = emulate_block(
+        [PROGRAM, PROGRAM],
+        stop_when=lambda states: states[1].clock >= 3,
+        options=[{"config": config}, {"config": config}],
+        irq_flags=0b10,
+    )
+
+    assert states[0].program_counter == 2
+    assert states[1].program_counter == 0
@@ -0,0 +1,219 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+from dataclasses import replace
+
+import pytest
+
+from pioemu import (
+    DeadlockError,
+    DmaChannel,
+    ReceiveSink,
+    State,
+    StallCause,
+    TransmitFeed,
+    WriteTransmitFifo,
+    clock_cycles_reached,
+    emulate,
+    emulate_until,
+)
+
+# Copies each word from the transmit FIFO into the receive FIFO
+PULL_THEN_PUSH = [0x80A0, 0xA0C7, 0x8020]  # pull block, mov isr, osr, push block
+
+NEVER = clock_cycles_reached(1_000_000_000)
+
+
+def _emulate_to_end(opcodes, **kwargs) -> State:
+    state = kwargs.get("initial_state", State())
+
+    for _, state in emulate(opcodes, stop_when=NEVER, detect_deadlock=True, **kwargs):
+        pass
+
+    return state
+
+
+@pytest.mark.parametrize(
+    "opcodes, initial_state, expected_cause",
+    [
+        pytest.param([0x80A0], State(), StallCause.PULL_EMPTY, id="pull block"),
+        pytest.param(
+            [0x8020],
+            State(receive_fifo=deque([1, 2, 3, 4])),
+            StallCause.PUSH_FULL,
+            id="push block",
+        ),
+        pytest.param([0x2080], State(), StallCause.WAIT_PIN, id="wait 1 gpio 0"),
+        pytest.param([0x20C0], State(), StallCause.WAIT_IRQ, id="wait 1 irq 0"),
+        pytest.param([0xC020], State(), StallCause.WAIT_IRQ, id="irq wait 0"),
+    ],
+)
+def test_permanent_stall_raises_deadlock_error(opcodes, initial_state, expected_cause):
+    with pytest.raises(DeadlockError) as exception_info:
+        _emulate_to_end(opcodes, initial_state=initial_state)
+
+    assert exception_info.value.cause == expected_cause
+    assert exception_info.value.state.program_counter == 0
+    assert exception_info.value.state.clock == 1
+
+
+def test_deadlock_detected_once_transmit_feed_exhausted():
+    words = []
+
+    with pytest.raises(DeadlockError, match="pull_empty"):
+        _emulate_to_end(
+            PULL_THEN_PUSH,
+            transmit_feed=TransmitFeed([1, 2, 3]),
+            receive_sink=ReceiveSink(words),
+        )
+
+    assert words == [1, 2, 3]
+
+
+def test_deadlock_detected_once_receive_sink_full():
+    buffer = bytearray(8)
+
+    with pytest.raises(DeadlockError, match="push_full") as exception_info:
+        _emulate_to_end(
+            PULL_THEN_PUSH,
+            transmit_feed=TransmitFeed(range(100)),
+            receive_sink=ReceiveSink(buffer),
+        )
+
+    assert len(exception_info.value.state.receive_fifo) == 4
+
+
+def test_wait_for_input_pin_is_not_permanent_when_pins_are_driven():
+    for _, state in emulate(
+        [0x2080, 0x0000],  # wait 1 gpio 0 / jmp 0
+        stop_when=lambda _, state: state.program_counter == 1 or state.clock > 100,
+        input_source=lambda clock: 1 if clock >= 50 else 0,
+        detect_deadlock=True,
+    ):
+        pass
+
+    assert state.clock == 51
+
+
+def test_wait_for_output_pin_is_permanent_despite_input_source():
+    with pytest.raises(DeadlockError, match="wait_pin"):
+        _emulate_to_end(
+            [0x2080],  # wait 1 gpio 0
+            initial_state=State(pin_directions=1),
+            input_source=lambda clock: 0xFFFF_FFFF,
+        )
+
+
+def test_wait_for_pin_changed_by_side_set_is_not_permanent():
+    for _, state in emulate(
+        [0x3080, 0x0000],  # wait 1 gpio 0 side 1 / jmp 0
+        stop_when=lambda _, state: state.program_counter == 1 or state.clock > 100,
+        side_set_count=1,
+        detect_deadlock=True,
+    ):
+        pass
+
+    assert state.clock == 2
+
+
+def test_stall_is_not_permanent_when_commands_are_sent():
+    generator = emulate(
+        PULL_THEN_PUSH,
+        stop_when=lambda _, state: len(state.receive_fifo) > 0,
+        detect_deadlock=True,
+    )
+
+    next(generator)
+    _, state = generator.send(WriteTransmitFifo(42))
+
+    for _, state in generator:
+        pass
+
+    assert state.receive_fifo == deque([42])
+
+
+def test_refilled_osr_is_not_permanent_stall():
+    options = {
+        "initial_state": State(transmit_fifo=deque([0x1234_5678])),
+        "auto_pull": True,
+    }
+
+    for _, expected_state in emulate(
+        [0x6028, 0xA042],  # out x, 8 / nop
+        stop_when=clock_cycles_reached(10),
+        detect_deadlock=True,
+        **options,
+    ):
+        pass
+
+    assert expected_state.x_register == 0x12
+    assert emulate_until([0x6028, 0xA042], clock=10, **options) == expected_state
+
+
+def test_deadlock_not_detected_by_default():
+    history = list(emulate([0x80A0], stop_when=clock_cycles_reached(100)))
+
+    assert len(history) == 100
+
+
+@pytest.mark.parametrize(
+    "opcodes, create_options",
+    [
+        pytest.param([0x90A0], lambda: {"side_set_count": 1}, id="pull block side 1"),
+        pytest.param([0x2080], lambda: {}, id="wait 1 gpio 0"),
+        pytest.param(
+            PULL_THEN_PUSH,
+            lambda: {"transmit_feed": TransmitFeed([7, 8])},
+            id="exhausted transmit feed",
+        ),
+    ],
+)
+def test_emulate_until_skips_permanent_stall(opcodes, create_options):
+    for _, expected_state in emulate(
+        opcodes, stop_when=clock_cycles_reached(1000), **create_options()
+    ):
+        pass
+
+    state = emulate_until(opcodes, clock=1_000_000_000, **create_options())
+
+    assert replace(state, clock=1000) == expected_state
+
+
+def test_emulate_until_drains_receive_fifo_before_skipping_permanent_stall():
+    buffer = bytearray(16)
+
+    state = emulate_until(
+        [0x80A0],  # pull block
+        clock=10,
+        initial_state=State(receive_fifo=deque([1, 2, 3, 4])),
+        receive_sink=DmaChannel(buffer),
+    )
+
+    assert state.clock == 10
+    assert state.receive_fifo == deque()
+    assert list(memoryview(buffer).cast("I")) == [1, 2, 3, 4]
+
+
+def test_emulate_until_samples_input_source_during_permanent_stall():
+    def input_source(clock: int) -> int:
+        return clock & 0xFF
+
+    for _, expected_state in emulate(
+        [0x80A0], stop_when=clock_cycles_reached(10), input_source=input_source
+    ):
+        pass
+
+    state = emulate_until([0x80A0], clock=10, input_source=input_source)
+
+    assert state == expected_state
@@ -0,0 +1,166 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from array import array
+
+import pytest
+
+from pioemu import DmaChannel, State, TransmitFeed, clock_cycles_reached, emulate
+from pioemu.debugger import Debugger
+
+# set x, 5 [3] / set pins, 1 [1] / set pins, 0 / jmp x-- 1 [2] / set y, 3 [7] / jmp 0
+PROGRAM = [0xE325, 0xE101, 0xE000, 0x0241, 0xE743, 0x0000]
+
+# Copies each word from the transmit FIFO into the receive FIFO via X
+PULL_THEN_PUSH = [0x80A0, 0xA027, 0x4020, 0x8020]  # pull / mov x, osr / in x, 32 / push
+
+
+def _emulated_states(opcodes, clock, **options):
+    return [State()] + [
+        state
+        for _, state in emulate(
+            opcodes, stop_when=clock_cycles_reached(clock), **options
+        )
+    ]
+
+
+def test_stepping_back_revisits_every_state():
+    expected_states = _emulated_states(PROGRAM, 200)
+    debugger = Debugger(PROGRAM, keyframe_interval=16)
+
+    debugger.goto(200)
+    states = [debugger.state]
+
+    while debugger.step_back() is not None:
+        states.append(debugger.state)
+
+    assert states[::-1] == expected_states
+
+
+@pytest.mark.parametrize("clock", [0, 1, 37, 64, 150, 199, 40])
+def test_goto_reaches_first_state_at_clock(clock):
+    expected_states = _emulated_states(PROGRAM, 250)
+    debugger = Debugger(PROGRAM, keyframe_interval=16)
+
+    debugger.goto(180)
+    state = debugger.goto(clock)
+    next_state = expected_states[expected_states.index(state) + 1]
+
+    assert state == next(s for s in expected_states if s.clock >= clock)
+    assert debugger.step() == (state, next_state)
+
+
+def test_step_returns_states_before_and_after():
+    debugger = Debugger(PROGRAM)
+
+    before, after = debugger.step()
+
+    assert before == State()
+    assert after.clock == 4 and after.x_register == 5
+
+
+def test_run_back_until_finds_most_recent_step():
+    debugger = Debugger(PROGRAM, keyframe_interval=8)
+    debugger.goto(150)
+
+    state = debugger.run_back_until(
+        lambda before, after: before.pin_values == 0 and after.pin_values == 1
+    )
+
+    expected_states = _emulated_states(PROGRAM, 150)
+    rising_edges = [
+        after
+        for before, after in zip(expected_states, expected_states[1:])
+        if before.pin_values == 0 and after.pin_values == 1
+    ]
+
+    assert state == rising_edges[-1]
+    assert debugger.previous_state.pin_values == 0
+
+
+def test_run_back_until_includes_step_reaching_keyframe():
+    debugger = Debugger(PROGRAM, keyframe_interval=4)
+    debugger.goto(100)
+
+    state = debugger.run_back_until(lambda _, after: after.clock == 4)
+
+    assert state.clock == 4
+
+
+def test_run_back_until_without_match_leaves_state_unchanged():
+    expected_states = _emulated_states(PROGRAM, 120)
+    debugger = Debugger(PROGRAM, keyframe_interval=8)
+    debugger.goto(100)
+    state = debugger.state
+
+    assert debugger.run_back_until(lambda _, after: after.y_register == 99) is None
+    assert debugger.state == state
+    assert debugger.step()[1] == expected_states[expected_states.index(state) + 1]
+
+
+def test_step_back_at_initial_state():
+    debugger = Debugger(PROGRAM)
+
+    assert debugger.step_back() is None
+    assert debugger.state == State()
+
+
+def test_dma_channels_rewound_with_emulation():
+    def create_options():
+        return {
+            "transmit_feed": DmaChannel(array("I", range(1, 9))),
+            "receive_sink": DmaChannel(array("I", bytes(32))),
+        }
+
+    expected_options = create_options()
+    expected_states = _emulated_states(PULL_THEN_PUSH, 60, **expected_options)
+
+    options = create_options()
+    debugger = Debugger(PULL_THEN_PUSH, keyframe_interval=8, **options)
+    debugger.goto(60)
+    debugger.goto(13)
+    debugger.step_back()
+    debugger.goto(60)
+
+    assert debugger.state == expected_states[-1]
+    assert options["receive_sink"]._view == expected_options["receive_sink"]._view
+
+
+def test_keyframes_thinned_once_limit_exceeded():
+    expected_states = _emulated_states(PROGRAM, 2000)
+    debugger = Debugger(PROGRAM, keyframe_interval=4, max_keyframes=16)
+
+    debugger.goto(2000)
+
+    assert len(debugger._keyframes) <= 16
+    assert debugger.keyframe_interval == 128
+
+    states = [debugger.state]
+
+    while debugger.step_back() is not None:
+        states.append(debugger.state)
+
+    assert states[::-1] == expected_states
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [
+        pytest.param({"keyframe_interval": 0}, "keyframe_interval", id="interval"),
+        pytest.param({"max_keyframes": 0}, "max_keyframes", id="max keyframes"),
+        pytest.param({"transmit_feed": TransmitFeed([1])}, "DmaChannel", id="feed"),
+    ],
+)
+def test_invalid_arguments_rejected(options, message):
+    with pytest.raises(ValueError, match=message):
+        Debugger(PULL_THEN_PUSH, **options)
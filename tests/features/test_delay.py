@@ -33,6 +33,8 @@ from ..support import emulate_single_instruction
         pytest.param(0x6283, State(), 3, id="out pindirs, 3 [2]"),
         pytest.param(0x6708, State(), 8, id="out pins, 8 [7]"),
         pytest.param(0x6023, State(), 1, id="out x, 3"),
+        pytest.param(0x67F0, State(), 1, id="out exec, 16 [7]"),
+        pytest.param(0xA781, State(), 1, id="mov exec, x [7]"),
         pytest.param(0x7F40, State(), 32, id="out y, 32 [31]"),
         pytest.param(0x8080, State(), 1, id="pull noblock"),
         pytest.param(0x9F80, State(), 32, id="pull noblock [31]"),
@@ -0,0 +1,124 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from pioemu import ShiftRegister, State, clock_cycles_reached, emulate
+from pioemu.divergence import find_divergence
+
+# set x, 31 / set pins, 1 [1] / set pins, 0 / jmp x-- 1 [2] / set y, 3 [7] / jmp 0
+PROGRAM = [0xE03F, 0xE101, 0xE000, 0x0241, 0xE743, 0x0000]
+
+
+def _states_per_cycle(opcodes, clock):
+    """Returns the state during each clock cycle, as determined by emulate()."""
+
+    states = [State()]
+
+    for _, state in emulate(opcodes, stop_when=clock_cycles_reached(clock)):
+        states.extend([states[-1]] * (state.clock - len(states)))
+        states.append(state)
+
+    return states
+
+
+def test_identical_emulations_do_not_diverge():
+    assert find_divergence(PROGRAM, clock=10_000, checkpoint_interval=64) is None
+
+
+def test_divergence_between_programs():
+    # The delay following 'set y, 3' is one clock cycle longer
+    changed_program = [0xE03F, 0xE101, 0xE000, 0x0241, 0xE843, 0x0000]
+
+    divergence = find_divergence(
+        PROGRAM, changed_program, clock=10_000, checkpoint_interval=64
+    )
+
+    first_states = _states_per_cycle(PROGRAM, 10_000)
+    second_states = _states_per_cycle(changed_program, 10_000)
+    expected_clock = next(
+        clock
+        for clock, (first, second) in enumerate(zip(first_states, second_states))
+        if first.program_counter != second.program_counter
+    )
+
+    assert divergence.clock == expected_clock
+    assert divergence.fields == ("program_counter", "y_register")
+    assert divergence.states == (
+        first_states[expected_clock],
+        second_states[expected_clock],
+    )
+
+
+def test_divergence_between_configurations():
+    divergence = find_divergence(
+        [0x6002],  # out pins, 2
+        clock=500,
+        options={"out_count": 32},
+        other_options={"out_count": 1},
+        initial_state=State(output_shift_register=ShiftRegister(0b1010, 0)),
+    )
+
+    assert divergence.clock == 1
+    assert divergence.fields == ("pin_values",)
+
+
+def test_divergence_of_selected_fields():
+    # Both programs toggle GPIO 0 identically, but use different instructions to do so
+    first_program = [0xE001, 0xE000]  # set pins, 1 / set pins, 0
+    second_program = [0xE001, 0xA042, 0xE000]  # set pins, 1 / nop / set pins, 0
+
+    divergence = find_divergence(
+        first_program,
+        second_program,
+        clock=1000,
+        fields=["pin_values"],
+        checkpoint_interval=16,
+    )
+
+    assert divergence.clock == 2
+    assert divergence.fields == ("pin_values",)
+
+
+def test_divergence_at_first_cycle():
+    divergence = find_divergence([0xE001], [0xE000], clock=100)
+
+    assert divergence.clock == 1
+    assert divergence.fields == ("pin_values",)
+
+
+def test_divergence_when_one_emulation_halts():
+    divergence = find_divergence(
+        [0xA042, 0xA042, 0x0000],  # nop / nop / jmp 0
+        [0xA042, 0xA042, 0xE0E0],  # nop / nop / (invalid)
+        clock=100,
+    )
+
+    assert divergence.clock == 2
+    assert divergence.states[1] is None
+
+
+def test_divergence_beyond_clock_not_found():
+    assert find_divergence([0xE001], [0xE000], clock=1) is None
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        pytest.param({"checkpoint_interval": 0}, "checkpoint_interval", id="interval"),
+        pytest.param({"fields": ["clock"]}, "clock", id="field"),
+    ],
+)
+def test_invalid_arguments_rejected(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        find_divergence(PROGRAM, clock=100, **kwargs)
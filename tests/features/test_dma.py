@@ -0,0 +1,125 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from array import array
+from collections import deque
+
+import pytest
+
+from pioemu import DmaChannel, State, clock_cycles_reached, emulate
+
+
+def test_words_are_transferred_into_transmit_fifo_one_per_clock_cycle():
+    channel = DmaChannel(array("I", [1, 2, 3, 4, 5]))
+
+    fifo_levels = [
+        len(after.transmit_fifo)
+        for _, after in emulate(
+            [0xA042],  # nop
+            stop_when=clock_cycles_reached(5),
+            transmit_feed=channel,
+        )
+    ]
+
+    assert fifo_levels == [1, 2, 3, 4, 4]
+    assert channel.count == 4
+
+
+def test_outstanding_transfers_are_performed_together_after_delay_cycles():
+    channel = DmaChannel(array("I", [1, 2, 3, 4, 5]))
+
+    states = [
+        after
+        for _, after in emulate(
+            [0xA342],  # nop [3]
+            stop_when=clock_cycles_reached(8),
+            transmit_feed=channel,
+        )
+    ]
+
+    assert [state.clock for state in states] == [4, 8]
+    assert [list(state.transmit_fifo) for state in states] == [[1], [1, 2, 3, 4]]
+
+
+@pytest.mark.parametrize(
+    "data_size, expected_word",
+    [
+        pytest.param(1, 0x4444_4444, id="8-bit"),
+        pytest.param(2, 0x3344_3344, id="16-bit"),
+        pytest.param(4, 0x1122_3344, id="32-bit"),
+    ],
+)
+def test_narrow_transfers_are_replicated_across_word(data_size: int, expected_word):
+    channel = DmaChannel(array("I", [0x1122_3344]), data_size=data_size)
+
+    fifo = channel.refill(deque())
+
+    assert list(fifo) == [expected_word]
+
+
+def test_receive_fifo_is_transferred_into_memory():
+    buffer = bytearray(3)
+    channel = DmaChannel(buffer, data_size=1)
+
+    for _ in emulate(
+        [0x4020, 0x8020, 0xA029],  # in x, 32 / push block / mov x, !x
+        initial_state=State(x_register=0xAABB_CC01),
+        stop_when=lambda _, state: channel.complete,
+        receive_sink=channel,
+    ):
+        pass
+
+    assert buffer == bytearray([0x01, 0xFE, 0x01])
+
+
+def test_ring_wraps_buffer_address():
+    channel = DmaChannel(array("I", [7, 8]), ring_size=8, transfer_count=5)
+
+    fifo = channel.refill(deque(), clock=0)
+    fifo = channel.refill(fifo, clock=4)
+
+    assert list(fifo) == [7, 8, 7, 8]
+
+    fifo = channel.refill(deque(), clock=8)
+
+    assert list(fifo) == [7]
+    assert channel.complete
+
+
+def test_auto_pull_stalls_once_transfers_are_complete():
+    channel = DmaChannel(array("I", [1, 2, 3]))
+
+    *_, (_, final_state) = emulate(
+        [0x6020],  # out x, 32
+        auto_pull=True,
+        stop_when=clock_cycles_reached(10),
+        transmit_feed=channel,
+    )
+
+    assert channel.complete
+    assert final_state.x_register == 3
+    assert final_state.output_shift_register.counter == 32
+
+
+@pytest.mark.parametrize(
+    "keyword_arguments",
+    [
+        {"data_size": 3},
+        {"ring_size": 6},
+        {"transfer_count": 3},
+        {"ring_size": 16},
+    ],
+)
+def test_validation_of_keyword_arguments(keyword_arguments):
+    with pytest.raises(ValueError):
+        DmaChannel(bytearray(8), **keyword_arguments)
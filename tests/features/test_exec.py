@@ -0,0 +1,127 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+
+import pytest
+
+from pioemu import (
+    Hooks,
+    ShiftRegister,
+    State,
+    StateMachineConfig,
+    clock_cycles_reached,
+    emulate,
+    emulate_until,
+)
+
+# out exec, 16 [3] / set y, 1 / set y, 2
+OUT_EXEC_PROGRAM = [0x63F0, 0xE041, 0xE042]
+
+# mov exec, x [3] / set y, 1 / set y, 2
+MOV_EXEC_PROGRAM = [0xA381, 0xE041, 0xE042]
+
+
+def _states(program, clock, **kwargs):
+    return [
+        after
+        for _, after in emulate(program, stop_when=clock_cycles_reached(clock), **kwargs)
+    ]
+
+
+@pytest.mark.parametrize(
+    "program, initial_state",
+    [
+        pytest.param(
+            OUT_EXEC_PROGRAM,
+            State(output_shift_register=ShiftRegister(0xE227, 0)),
+            id="out exec",
+        ),
+        pytest.param(MOV_EXEC_PROGRAM, State(x_register=0xE227), id="mov exec"),
+    ],
+)
+def test_executed_instruction_follows_with_its_own_delay(program, initial_state):
+    # The executed instruction is 'set x, 7 [2]'
+    states = _states(program, 5, initial_state=initial_state)
+
+    assert [(state.clock, state.program_counter) for state in states] == [
+        (1, 1),
+        (4, 1),
+        (5, 2),
+    ]
+    assert states[0].exec_opcode == 0xE227
+    assert states[1].exec_opcode is None
+    assert states[1].x_register == 7
+    assert states[1].y_register == 0
+
+
+def test_executed_jmp_writes_program_counter():
+    # Executes 'jmp 2'
+    states = _states(MOV_EXEC_PROGRAM, 2, initial_state=State(x_register=0x0002))
+
+    assert states[-1].program_counter == 2
+    assert states[-1].y_register == 0
+
+
+def test_executed_instruction_repeats_while_stalled():
+    # Executes 'wait 1 gpio 3'
+    states = _states(
+        MOV_EXEC_PROGRAM,
+        4,
+        initial_state=State(x_register=0x2083),
+        input_source=lambda clock: 8 if clock >= 3 else 0,
+    )
+
+    assert [(state.clock, state.exec_opcode) for state in states] == [
+        (1, 0x2083),
+        (2, 0x2083),
+        (3, 0x2083),
+        (4, None),
+    ]
+    assert states[-1].program_counter == 1
+
+
+def test_out_exec_executes_instructions_from_transmit_fifo():
+    # pull block / out exec, 16 / out exec, 16
+    program = [0x80A0, 0x60F0, 0x60F0]
+    initial_state = State(transmit_fifo=deque([0xE042_E021, 0xE023_E041]))
+
+    final_state = emulate_until(program, clock=15, initial_state=initial_state)
+
+    assert final_state.x_register == 3
+    assert final_state.y_register == 1
+    assert final_state == _states(program, 15, initial_state=initial_state)[-1]
+
+
+def test_hooks_not_called_for_executed_instruction():
+    executed = []
+    hooks = Hooks()
+    hooks.on_instruction(1, lambda before, _: executed.append(before.clock))
+
+    emulate_until(
+        MOV_EXEC_PROGRAM,
+        clock=6,
+        initial_state=State(x_register=0xE021),
+        hooks=hooks,
+    )
+
+    assert executed == [2]
+
+
+def test_executed_instruction_is_compiled_once():
+    config = StateMachineConfig()
+
+    compiled_instruction = config.compile_instruction(0xE021)
+
+    assert compiled_instruction is StateMachineConfig().compile_instruction(0xE021)
+    assert config.compile_instruction(0x63F0).delay_value == 0
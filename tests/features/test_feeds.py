@@ -0,0 +1,100 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from array import array
+from collections import deque
+
+import pytest
+
+from pioemu import ReceiveSink, State, TransmitFeed, emulate
+
+# Copies each word from the transmit FIFO into the receive FIFO
+PULL_THEN_PUSH = [0x80A0, 0xA0C7, 0x8020]  # pull block, mov isr, osr, push block
+
+
+def _run_until_sink_holds(word_count: int, feed: TransmitFeed, sink: ReceiveSink):
+    for _ in emulate(
+        PULL_THEN_PUSH,
+        stop_when=lambda _, state: sink.count >= word_count
+        or (state.clock > 10 * word_count + 10),
+        transmit_feed=feed,
+        receive_sink=sink,
+    ):
+        pass
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param([1, 2, 3, 4, 5, 6], id="list"),
+        pytest.param(iter([1, 2, 3, 4, 5, 6]), id="iterator"),
+        pytest.param(array("I", [1, 2, 3, 4, 5, 6]).tobytes(), id="bytes"),
+        pytest.param(memoryview(array("I", [1, 2, 3, 4, 5, 6])), id="memoryview"),
+    ],
+)
+def test_words_stream_from_source_to_sink(source):
+    received = []
+    feed = TransmitFeed(source, chunk_size=4)
+
+    _run_until_sink_holds(6, feed, ReceiveSink(received))
+
+    assert received == [1, 2, 3, 4, 5, 6]
+    assert feed.count == 6
+    assert feed.exhausted
+
+
+def test_sink_writes_into_preallocated_buffer():
+    buffer = bytearray(12)
+    sink = ReceiveSink(buffer)
+
+    _run_until_sink_holds(3, TransmitFeed([0xAABBCCDD, 2, 3, 4]), sink)
+
+    assert array("I", bytes(buffer)).tolist() == [0xAABBCCDD, 2, 3]
+    assert sink.full
+
+
+def test_transmit_fifo_is_only_topped_up_to_its_depth():
+    feed = TransmitFeed(range(10))
+
+    _, new_state = next(
+        emulate(
+            [0xA042],  # nop
+            initial_state=State(transmit_fifo=deque([100])),
+            stop_when=lambda _, state: state.clock >= 1,
+            transmit_feed=feed,
+        )
+    )
+
+    assert new_state.transmit_fifo == deque([100, 0, 1, 2])
+    assert feed.count == 3
+
+
+def test_words_remain_in_receive_fifo_once_sink_is_full():
+    sink = ReceiveSink(array("I", [0]))
+
+    _, new_state = next(
+        emulate(
+            [0xA042],  # nop
+            initial_state=State(receive_fifo=deque([7, 8])),
+            stop_when=lambda _, state: state.clock >= 1,
+            receive_sink=sink,
+        )
+    )
+
+    assert new_state.receive_fifo == deque([8])
+    assert sink.count == 1
+
+
+def test_validation_of_buffer_length():
+    with pytest.raises(ValueError):
+        TransmitFeed(b"\x00\x01\x02")
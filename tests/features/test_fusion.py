@@ -0,0 +1,131 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+from random import Random
+
+import pytest
+
+from pioemu import (
+    Hooks,
+    State,
+    StateMachineConfig,
+    clock_cycles_reached,
+    emulate,
+    emulate_until,
+)
+
+# pull block / out pins, 1 [1] / jmp !osre 1 [2]
+OUT_THEN_JMP_NOT_OSRE = [0x80A0, 0x6101, 0x02E1]
+
+# set x, 7 / in pins, 1 / jmp x-- 1 [1]
+IN_THEN_JMP_X_DECREMENT = [0xE027, 0x4001, 0x0141]
+
+# pull block [3] / out y, 8 / in y, 8
+PULL_THEN_OUT = [0x83A0, 0x6048, 0x4048]
+
+
+def _final_state_from_emulate(program, clock, **kwargs):
+    state = kwargs.get("initial_state") or State()
+
+    for _, state in emulate(program, stop_when=clock_cycles_reached(clock), **kwargs):
+        pass
+
+    return state
+
+
+def _random_state(random: Random) -> State:
+    return State(
+        pin_values=random.getrandbits(32),
+        pin_directions=random.getrandbits(32),
+        transmit_fifo=deque(random.getrandbits(32) for _ in range(4)),
+        x_register=random.getrandbits(32),
+        y_register=random.getrandbits(32),
+    )
+
+
+@pytest.mark.parametrize(
+    "program", [OUT_THEN_JMP_NOT_OSRE, IN_THEN_JMP_X_DECREMENT, PULL_THEN_OUT]
+)
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"shift_isr_right": False, "shift_osr_right": False},
+        {"out_base": 5, "out_count": 3},
+        {"wrap_target": 1},
+    ],
+)
+def test_fused_instructions_equivalent_to_stepping(program, options):
+    random = Random(program[1] ^ len(options))
+
+    for clock in range(1, 80, 3):
+        initial_state = _random_state(random)
+
+        assert emulate_until(
+            program, clock=clock, initial_state=initial_state, **options
+        ) == _final_state_from_emulate(
+            program, clock, initial_state=initial_state, **options
+        )
+
+
+@pytest.mark.parametrize(
+    "program, program_counter",
+    [(OUT_THEN_JMP_NOT_OSRE, 1), (IN_THEN_JMP_X_DECREMENT, 1), (PULL_THEN_OUT, 0)],
+)
+def test_pairs_are_fused_when_compiled(program, program_counter):
+    compiled_program = StateMachineConfig().compile(program)
+
+    assert compiled_program[program_counter].fused_handler
+
+
+@pytest.mark.parametrize(
+    "options", [{"side_set_count": 1}, {"auto_pull": True}, {"auto_push": True}]
+)
+def test_pairs_not_fused_when_unsupported(options):
+    config = StateMachineConfig(**options)
+    program = IN_THEN_JMP_X_DECREMENT if "auto_push" in options else PULL_THEN_OUT
+
+    assert not any(
+        compiled_instruction.fused_handler
+        for compiled_instruction in config.compile(program)
+    )
+
+
+def test_fusion_disabled_when_hooks_attached():
+    executed = []
+    hooks = Hooks()
+    hooks.on_instruction(2, lambda before, _: executed.append(before.clock))
+
+    emulate_until(
+        OUT_THEN_JMP_NOT_OSRE,
+        clock=30,
+        initial_state=State(transmit_fifo=deque([0xFFFF_FFFF])),
+        hooks=hooks,
+    )
+
+    assert executed == [3, 8, 13, 18, 23, 28]
+
+
+def test_emulation_stops_at_invalid_opcode():
+    # set x, 1 / in (reserved source), 32
+    final_state = emulate_until([0xE021, 0x4080], clock=10)
+
+    assert final_state == State(clock=1, program_counter=1, x_register=1)
+
+
+def test_config_cannot_be_combined_with_keyword_arguments():
+    with pytest.raises(ValueError, match="out_count"):
+        emulate_until(
+            PULL_THEN_OUT, clock=1, config=StateMachineConfig(), out_count=8
+        )
@@ -0,0 +1,128 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+
+from pioemu import Hooks, State, TransmitFeed, clock_cycles_reached, emulate
+from pioemu.state_machine import StateMachine
+
+
+def _run(opcodes, hooks: Hooks, *, cycles: int, **options):
+    for _ in emulate(
+        opcodes, stop_when=clock_cycles_reached(cycles), hooks=hooks, **options
+    ):
+        pass
+
+
+def test_instruction_callbacks_only_invoked_for_their_program_counter():
+    hooks = Hooks()
+    clocks = []
+    hooks.on_instruction(1, lambda before, _: clocks.append(before.clock))
+
+    _run([0xE001, 0xE000], hooks, cycles=6)  # set pins, 1 / set pins, 0
+
+    assert clocks == [1, 3, 5]
+
+
+def test_pin_change_callbacks_invoked_when_pins_change():
+    hooks = Hooks()
+    changes = []
+    hooks.on_pin_change(lambda before, after: changes.append(after.pin_values))
+
+    _run([0xE001, 0xE001, 0xE000], hooks, cycles=6)  # set pins 1, 1, 0
+
+    assert changes == [1, 0, 1, 0]
+
+
+def test_fifo_callbacks_invoked_when_words_move():
+    hooks = Hooks()
+    events = []
+    hooks.on_transmit_fifo_pop(lambda _, after: events.append(("pop", after.clock)))
+    hooks.on_receive_fifo_push(lambda _, after: events.append(("push", after.clock)))
+
+    _run(
+        [0x80A0, 0xA0C7, 0x8020],  # pull block, mov isr, osr, push block
+        hooks,
+        cycles=6,
+        transmit_feed=TransmitFeed([1, 2]),
+    )
+
+    assert events == [("pop", 1), ("push", 3), ("pop", 4), ("push", 6)]
+
+
+def test_callbacks_receive_same_states_as_emulate():
+    class CountingFeed(TransmitFeed):
+        refill_count = 0
+
+        def refill(self, transmit_fifo, clock=0):
+            CountingFeed.refill_count += 1
+            return super().refill(transmit_fifo, clock)
+
+    hooks = Hooks()
+    callback_states = []
+    hooks.on_instruction(0, lambda *states: callback_states.append(states))
+
+    emulated_states = list(
+        emulate(
+            [0x80A0],  # pull block
+            stop_when=clock_cycles_reached(8),
+            hooks=hooks,
+            transmit_feed=CountingFeed([1, 2, 3, 4, 5, 6]),
+        )
+    )
+
+    assert callback_states == emulated_states
+    assert CountingFeed.refill_count == 8
+
+
+def test_stall_callbacks_invoked_at_start_and_end_of_stall():
+    hooks = Hooks()
+    events = []
+    hooks.on_stall_start(lambda _, after: events.append(("start", after.clock)))
+    hooks.on_stall_end(lambda _, after: events.append(("end", after.clock)))
+
+    _run(
+        [0x2080, 0xA042],  # wait 1 gpio 0 / nop
+        hooks,
+        cycles=5,
+        input_source=lambda clock: int(clock >= 3),
+    )
+
+    assert events == [("start", 1), ("end", 4)]
+
+
+def test_wrap_callbacks_invoked_when_program_wraps():
+    hooks = Hooks()
+    clocks = []
+    hooks.on_wrap(lambda _, after: clocks.append(after.clock))
+
+    _run(
+        [0xA042, 0xA042, 0x0001],  # nop / nop / jmp 1
+        hooks,
+        cycles=7,
+        wrap_target=1,
+        wrap_top=2,
+    )
+
+    assert clocks == []  # The jump at wrap_top is taken rather than wrapping
+
+    _run([0xA042, 0xA042, 0xA042], hooks, cycles=7, wrap_target=0, wrap_top=1)
+
+    assert clocks == [2, 4, 6]
+
+
+def test_step_is_not_wrapped_without_callbacks():
+    state_machine = StateMachine([0xA042], hooks=Hooks())
+
+    assert state_machine.step.__func__ is StateMachine.step
+    assert state_machine.step(State(transmit_fifo=deque())).clock == 1
@@ -0,0 +1,83 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from pioemu import State, emulate_block
+
+from ..opcodes import Opcodes
+
+
+def test_state_machines_share_irq_flags():
+    programs = [
+        [0xC004, Opcodes.nop()],  # irq set 4
+        [0x20C4, Opcodes.nop()],  # wait 1 irq 4
+    ]
+
+    _, states = next(emulate_block(programs, stop_when=lambda _: False))
+
+    assert [state.program_counter for state in states] == [1, 1]
+    assert [state.irq_flags for state in states] == [0x00, 0x00]
+
+
+def test_irq_wait_resumes_once_another_state_machine_clears_flag():
+    programs = [
+        [0xC120, Opcodes.nop()],  # irq wait 0 [1]
+        [0xA042, 0xA042, 0xA042, 0xC040],  # nop, nop, nop, irq clear 0
+    ]
+
+    generator = emulate_block(
+        programs, stop_when=lambda states: states[0].program_counter == 1
+    )
+
+    history = [new_states for _, new_states in generator]
+
+    assert [states[0].program_counter for states in history] == [0, 0, 0, 0, 1]
+    assert history[-1][0].clock == 6  # Includes the delay cycle
+    assert history[-1][0].irq_flags == 0
+
+
+def test_blocked_state_machine_is_idled_without_being_stepped():
+    programs = [
+        [0x20C1, Opcodes.nop()],  # wait 1 irq 1
+        [0x0041, 0xC001],  # jmp x-- 1, irq set 1
+    ]
+
+    generator = emulate_block(
+        programs,
+        initial_states=[State(), State(x_register=3)],
+        stop_when=lambda states: states[0].program_counter != 0,
+    )
+
+    history = [new_states for _, new_states in generator]
+
+    assert history[-1][0].irq_flags == 0
+    assert history[-1][0].clock == history[-1][1].clock
+
+
+def test_relative_irq_indexes_use_state_machine_number():
+    programs = [[Opcodes.nop()], [Opcodes.nop()], [0xC010]]  # irq set 0 rel
+
+    _, states = next(emulate_block(programs, stop_when=lambda _: False))
+
+    assert states[0].irq_flags == 0x04
+
+
+@pytest.mark.parametrize("program_count", [0, 5])
+def test_validation_of_number_of_programs(program_count: int):
+    with pytest.raises(ValueError):
+        next(
+            emulate_block(
+                [[Opcodes.nop()]] * program_count, stop_when=lambda _: False
+            )
+        )
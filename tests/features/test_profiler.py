@@ -0,0 +1,94 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+
+import pytest
+
+from pioemu import Profiler, State, StallCause, clock_cycles_reached, emulate
+
+
+def _profile(opcodes, *, initial_state=None, cycles=100, **options) -> Profiler:
+    profiler = Profiler()
+
+    for _ in emulate(
+        opcodes,
+        initial_state=initial_state,
+        stop_when=clock_cycles_reached(cycles),
+        profiler=profiler,
+        **options,
+    ):
+        pass
+
+    return profiler
+
+
+def test_retired_instructions_delays_and_branches_are_counted():
+    # set x, 3 / jmp x-- 1 [2] / jmp 2
+    profiler = _profile([0xE023, 0x0241, 0x0002], cycles=14)
+
+    assert profiler.retired[0:3].tolist() == [1, 4, 1]
+    assert profiler.delay_cycles[1] == 8
+    assert (profiler.branches_taken[1], profiler.branches_not_taken[1]) == (3, 1)
+    assert profiler.total_cycles == 14
+
+
+@pytest.mark.parametrize(
+    "opcodes, options, expected_cause",
+    [
+        pytest.param([0x2080], {}, StallCause.WAIT_PIN, id="wait 1 gpio 0"),
+        pytest.param([0x20C0], {}, StallCause.WAIT_IRQ, id="wait 1 irq 0"),
+        pytest.param([0x80A0], {}, StallCause.PULL_EMPTY, id="pull block"),
+        pytest.param([0x6020], {"auto_pull": True}, StallCause.AUTO_PULL, id="out x, 32"),
+    ],
+)
+def test_stall_cycles_are_attributed_to_cause(opcodes, options, expected_cause):
+    profiler = _profile(opcodes, cycles=10, **options)
+
+    assert profiler.stall_cycles[expected_cause][0] == 10
+    assert profiler.retired[0] == 0
+
+
+def test_push_to_full_fifo_is_attributed_to_push_full():
+    profiler = _profile(
+        [0x8020],  # push block
+        initial_state=State(receive_fifo=deque([1, 2, 3, 4])),
+        cycles=5,
+    )
+
+    assert profiler.stall_cycles[StallCause.PUSH_FULL][0] == 5
+
+
+def test_counters_are_available_as_dict_and_report():
+    profiler = _profile([0xA142, 0x2080], cycles=5)  # nop [1] / wait 1 gpio 0
+
+    assert profiler.as_dict() == {
+        "total_cycles": 5,
+        "program_counters": {
+            0: {
+                "retired": 1,
+                "delay_cycles": 1,
+                "stall_cycles": {},
+                "branches_taken": 0,
+                "branches_not_taken": 0,
+            },
+            1: {
+                "retired": 0,
+                "delay_cycles": 0,
+                "stall_cycles": {"wait_pin": 3},
+                "branches_taken": 0,
+                "branches_not_taken": 0,
+            },
+        },
+    }
+    assert "wait_pin=3" in profiler.report()
@@ -0,0 +1,106 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from threading import Thread
+
+import pytest
+
+from pioemu import (
+    ProgramCache,
+    ProgramCacheInfo,
+    clock_cycles_reached,
+    emulate,
+    emulate_block,
+    program_cache,
+)
+
+
+def test_emulate_uses_process_wide_cache():
+    program = [0xE03F, 0x0041]  # set x, 31 / jmp x-- 1
+    program_cache.clear()
+
+    for _ in range(3):
+        for _ in emulate(program, stop_when=clock_cycles_reached(5)):
+            pass
+
+    for _ in emulate_block([program], stop_when=lambda states: True):
+        pass
+
+    assert program_cache.info() == ProgramCacheInfo(
+        hits=3, misses=1, maxsize=program_cache.maxsize, currsize=1
+    )
+
+
+def test_least_recently_used_program_is_evicted():
+    cache = ProgramCache(maxsize=2)
+
+    cache.get("a", lambda: "A")
+    cache.get("b", lambda: "B")
+    cache.get("a", lambda: "unused")
+    cache.get("c", lambda: "C")
+
+    assert cache.get("a", lambda: "A2") == "A"
+    assert cache.get("b", lambda: "B2") == "B2"
+    assert cache.info() == ProgramCacheInfo(hits=2, misses=4, maxsize=2, currsize=2)
+
+
+def test_reducing_maxsize_evicts_programs():
+    cache = ProgramCache(maxsize=3)
+
+    for key in "abc":
+        cache.get(key, lambda: key.upper())
+
+    cache.maxsize = 1
+
+    assert cache.info().currsize == 1
+    assert cache.get("c", lambda: "unused") == "C"
+
+
+def test_zero_maxsize_disables_caching():
+    cache = ProgramCache(maxsize=0)
+
+    assert cache.get("a", lambda: "A") == "A"
+    assert cache.info() == ProgramCacheInfo(hits=0, misses=1, maxsize=0, currsize=0)
+
+
+def test_clear_discards_programs_and_statistics():
+    cache = ProgramCache()
+    cache.get("a", lambda: "A")
+    cache.get("a", lambda: "A")
+
+    cache.clear()
+
+    assert cache.info() == ProgramCacheInfo(hits=0, misses=0, maxsize=256, currsize=0)
+
+
+def test_concurrent_callers_share_one_compiled_program():
+    cache = ProgramCache()
+    results = []
+
+    def compile_and_store():
+        results.append(cache.get("a", object))
+
+    threads = [Thread(target=compile_and_store) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert all(result is results[0] for result in results)
+
+
+def test_negative_maxsize_rejected():
+    with pytest.raises(ValueError):
+        ProgramCache(maxsize=-1)
@@ -0,0 +1,322 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from array import array
+from collections import deque
+from dataclasses import replace
+
+import pytest
+
+from pioemu import (
+    DmaChannel,
+    ReceiveSink,
+    State,
+    TakeSnapshot,
+    TransmitFeed,
+    clock_cycles_reached,
+    create_state_machine,
+    emulate,
+    emulate_until,
+)
+from pioemu.pio_block import PioBlock
+
+# Copies each word from the transmit FIFO into the receive FIFO via X
+PULL_THEN_PUSH = [0x80A0, 0xA027, 0x4020, 0x8020]  # pull / mov x, osr / in x, 32 / push
+
+# pull block / set pins, 0 [7] / set x, 7 / out pins, 1 [6] / jmp x-- 3 / set pins, 1 [7]
+UART_TX = [0x80A0, 0xE700, 0xE027, 0x6601, 0x0043, 0xE701]
+
+
+def _history(generator):
+    return [states for states in generator]
+
+
+def _take_snapshot(opcodes, cycles, initial_state=None, **options):
+    state_machine = create_state_machine(opcodes, **options)
+    state = initial_state if initial_state else State()
+
+    for _ in range(cycles):
+        state = state_machine.step(state)
+
+    return state_machine.snapshot(state)
+
+
+def test_resumed_emulation_matches_original():
+    expected_history = _history(
+        emulate(
+            UART_TX,
+            stop_when=clock_cycles_reached(500),
+            initial_state=State(pin_directions=1, pin_values=1),
+            out_count=1,
+            transmit_feed=TransmitFeed(range(10)),
+        )
+    )
+
+    snapshot = _take_snapshot(
+        UART_TX,
+        50,
+        initial_state=State(pin_directions=1, pin_values=1),
+        out_count=1,
+        transmit_feed=TransmitFeed(range(10)),
+    )
+
+    resumed_history = _history(
+        emulate(
+            UART_TX,
+            stop_when=clock_cycles_reached(500),
+            out_count=1,
+            transmit_feed=TransmitFeed(range(10)),
+            snapshot=snapshot,
+        )
+    )
+
+    assert isinstance(snapshot, bytes)
+    assert resumed_history == expected_history[50:]
+
+
+def test_snapshot_taken_by_sending_command_into_emulation():
+    generator = emulate(
+        UART_TX,
+        stop_when=clock_cycles_reached(500),
+        initial_state=State(pin_directions=1, pin_values=1),
+        out_count=1,
+        transmit_feed=TransmitFeed(range(10)),
+    )
+
+    for _ in range(50):
+        next(generator)
+
+    snapshots = []
+    expected_history = [generator.send(TakeSnapshot(snapshots.append))]
+    expected_history.extend(generator)
+
+    resumed_history = _history(
+        emulate(
+            UART_TX,
+            stop_when=clock_cycles_reached(500),
+            out_count=1,
+            transmit_feed=TransmitFeed(range(10)),
+            snapshot=snapshots[0],
+        )
+    )
+
+    assert len(snapshots) == 1
+    assert resumed_history == expected_history
+
+
+def test_take_snapshot_only_applies_to_emulation():
+    with pytest.raises(ValueError, match="TakeSnapshot"):
+        TakeSnapshot(print).apply(State())
+
+
+@pytest.mark.parametrize(
+    "state, name",
+    [
+        pytest.param(State(x_register=1 << 32), "x_register", id="x"),
+        pytest.param(State(pin_values=-1), "pin_values", id="pins"),
+        pytest.param(State(receive_fifo=deque([1 << 40])), "receive_fifo", id="rx"),
+    ],
+)
+def test_snapshot_rejects_registers_wider_than_32_bits(state, name):
+    with pytest.raises(ValueError, match=name):
+        create_state_machine(PULL_THEN_PUSH).snapshot(state)
+
+
+def test_snapshot_includes_fifos_and_registers():
+    state = State(
+        clock=1 << 40,
+        program_counter=3,
+        pin_directions=0xFFFF_0000,
+        pin_values=0x1234_5678,
+        transmit_fifo=deque([1, 2]),
+        receive_fifo=deque([3, 4, 5, 6]),
+        x_register=0xFFFF_FFFF,
+        y_register=7,
+        irq_flags=0x81,
+        exec_opcode=0xE001,
+    )
+
+    state_machine = create_state_machine(PULL_THEN_PUSH)
+
+    assert state_machine.restore(state_machine.snapshot(state)) == state
+
+
+def test_snapshot_is_compact():
+    state_machine = create_state_machine(PULL_THEN_PUSH)
+
+    assert len(state_machine.snapshot(State())) < 100
+
+
+def test_stall_status_restored():
+    state_machine = create_state_machine([0xC020, 0xA042])  # irq wait 0 / nop
+    state = state_machine.step(State())
+    snapshot = state_machine.snapshot(state)
+
+    restored_state_machine = create_state_machine([0xC020, 0xA042])
+    restored_state = restored_state_machine.restore(snapshot)
+
+    # Once the flag is cleared a stalled 'IRQ WAIT' completes rather than raising the flag again
+    new_state = restored_state_machine.step(replace(restored_state, irq_flags=0))
+
+    assert restored_state_machine.stalled is False
+    assert new_state.program_counter == 1
+
+
+def test_most_recent_instruction_restored():
+    state_machine = create_state_machine([0x0040])  # jmp x--, 0
+    snapshot = state_machine.snapshot(state_machine.step(State(x_register=1)))
+
+    restored_state_machine = create_state_machine([0x0040])
+    restored_state_machine.restore(snapshot)
+
+    assert restored_state_machine.instruction == state_machine.instruction
+    assert restored_state_machine.condition_met is True
+
+
+def test_emulate_until_resumes_from_snapshot():
+    for _, expected_state in emulate(
+        PULL_THEN_PUSH, stop_when=clock_cycles_reached(100)
+    ):
+        pass
+
+    snapshot = _take_snapshot(PULL_THEN_PUSH, 10)
+
+    assert emulate_until(PULL_THEN_PUSH, clock=100, snapshot=snapshot) == expected_state
+
+
+def test_feed_positions_restored():
+    source = array("I", range(100, 132))
+    original_buffer = array("I", bytes(64))
+    sink = ReceiveSink(original_buffer)
+
+    state_machine = create_state_machine(
+        PULL_THEN_PUSH, transmit_feed=DmaChannel(source), receive_sink=sink
+    )
+    state = state_machine.run(State(), 20)
+    snapshot = state_machine.snapshot(state)
+    count = sink.count
+
+    state_machine.run(state, 60)
+
+    resumed_buffer = array("I", bytes(64))
+
+    for _ in emulate(
+        PULL_THEN_PUSH,
+        stop_when=clock_cycles_reached(60),
+        transmit_feed=DmaChannel(source),
+        receive_sink=ReceiveSink(resumed_buffer),
+        snapshot=snapshot,
+    ):
+        pass
+
+    # Only the words received after the snapshot are written into the new buffer
+    assert count > 0
+    assert resumed_buffer[:count] == array("I", bytes(4 * count))
+    assert resumed_buffer[count:] == original_buffer[count:]
+    assert sink.count > count
+
+
+def test_pio_block_resumes_from_snapshot():
+    def create_pio_block():
+        return PioBlock(
+            [
+                create_state_machine([0xA042, 0xC000], clkdiv=1.5),  # nop / irq set 0
+                create_state_machine(
+                    [0x20C0, 0x0000], state_machine_number=1
+                ),  # wait 1 irq 0 / jmp 0
+            ],
+            [State(), State()],
+        )
+
+    pio_block = create_pio_block()
+
+    for _ in range(7):
+        pio_block.step()
+
+    snapshot = pio_block.snapshot()
+    expected_history = []
+
+    for _ in range(30):
+        pio_block.step()
+        expected_history.append((pio_block.system_clock, tuple(pio_block.states)))
+
+    resumed_pio_block = create_pio_block()
+    resumed_pio_block.restore(snapshot)
+    resumed_history = []
+
+    for _ in range(30):
+        resumed_pio_block.step()
+        resumed_history.append(
+            (resumed_pio_block.system_clock, tuple(resumed_pio_block.states))
+        )
+
+    assert resumed_history == expected_history
+
+
+@pytest.mark.parametrize(
+    "snapshot, message",
+    [
+        pytest.param(b"PIOS", "truncated", id="truncated"),
+        pytest.param(b"JUNK" + bytes(100), "not supported", id="not a snapshot"),
+    ],
+)
+def test_invalid_snapshot_rejected(snapshot, message):
+    with pytest.raises(ValueError, match=message):
+        create_state_machine(PULL_THEN_PUSH).restore(snapshot)
+
+
+def test_snapshot_of_pio_block_rejected_by_state_machine():
+    pio_block = PioBlock(
+        [create_state_machine([0xA042]), create_state_machine([0xA042])],
+        [State(), State()],
+    )
+
+    with pytest.raises(ValueError, match="2 state machines"):
+        create_state_machine([0xA042]).restore(pio_block.snapshot())
+
+
+@pytest.mark.parametrize(
+    "opcodes, options",
+    [
+        pytest.param([0x80A0, 0xA027, 0x4020, 0xA042], {}, id="program"),
+        pytest.param(PULL_THEN_PUSH, {"auto_pull": True}, id="config"),
+    ],
+)
+def test_snapshot_rejected_for_different_program_or_config(opcodes, options):
+    snapshot = create_state_machine(PULL_THEN_PUSH).snapshot(State())
+
+    with pytest.raises(ValueError, match="different program or configuration"):
+        create_state_machine(opcodes, **options).restore(snapshot)
+
+
+def test_snapshot_rejected_for_different_feed():
+    snapshot = create_state_machine(PULL_THEN_PUSH).snapshot(State())
+
+    with pytest.raises(ValueError, match="different transmit feed"):
+        create_state_machine(PULL_THEN_PUSH, transmit_feed=TransmitFeed([])).restore(
+            snapshot
+        )
+
+
+def test_snapshot_cannot_be_combined_with_initial_state():
+    snapshot = create_state_machine(PULL_THEN_PUSH).snapshot(State())
+
+    with pytest.raises(ValueError, match="snapshot"):
+        next(
+            emulate(
+                PULL_THEN_PUSH,
+                stop_when=clock_cycles_reached(10),
+                initial_state=State(),
+                snapshot=snapshot,
+            )
+        )
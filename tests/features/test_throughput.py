@@ -0,0 +1,99 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from pioemu import State, StateMachineConfig
+from pioemu.throughput import calculate_throughput
+
+# out pins, 1 side 0 [1] / in pins, 1 side 1 [1]
+SPI = [0x6101, 0x5101]
+SPI_CONFIG = StateMachineConfig(
+    auto_pull=True,
+    auto_push=True,
+    pull_threshold=8,
+    push_threshold=8,
+    out_count=1,
+    side_set_base=1,
+    side_set_count=1,
+)
+
+
+def test_throughput_determined_statically():
+    throughput = calculate_throughput(SPI, SPI_CONFIG, sysclk=125_000_000, clkdiv=2.5)
+
+    assert throughput.state_machine_frequency == 50_000_000
+    assert throughput.transmit_words_per_second == pytest.approx(50_000_000 / 32)
+    assert throughput.transmit_bits_per_second == pytest.approx(12_500_000)
+    assert throughput.receive_bits_per_second == pytest.approx(12_500_000)
+    assert not throughput.emulated
+    assert throughput.keeps_up is None
+
+
+def test_throughput_uses_clock_divider_truncated_to_eight_fractional_bits():
+    throughput = calculate_throughput(SPI, SPI_CONFIG, sysclk=125_000_000, clkdiv=1.3)
+
+    assert throughput.state_machine_frequency == pytest.approx(125_000_000 * 256 / 332)
+
+
+@pytest.mark.parametrize(
+    "required_bits_per_second, keeps_up", [(12_500_000, True), (12_500_001, False)]
+)
+def test_throughput_compared_with_required_bit_rate(required_bits_per_second, keeps_up):
+    throughput = calculate_throughput(
+        SPI,
+        SPI_CONFIG,
+        sysclk=125_000_000,
+        clkdiv=2.5,
+        required_bits_per_second=required_bits_per_second,
+    )
+
+    assert throughput.keeps_up == keeps_up
+
+
+def test_throughput_emulated_for_dynamic_control_flow():
+    # pull block / out exec, 16 / out exec, 16
+    throughput = calculate_throughput(
+        [0x80A0, 0x60F0, 0x60F0],
+        sysclk=1_000_000,
+        transmit_words=[0xE042_E021],  # set x, 1 / set y, 2
+    )
+
+    assert throughput.emulated
+    assert throughput.transmit_words_per_second == pytest.approx(200_000)
+    assert throughput.transmit_bits_per_second == pytest.approx(6_400_000)
+    assert throughput.receive_words_per_second is None
+
+
+def test_throughput_emulated_when_program_waits_for_input():
+    # wait 1 gpio 0 / in pins, 8 / push / wait 0 gpio 0
+    throughput = calculate_throughput(
+        [0x2080, 0x4008, 0x8020, 0x2000],
+        sysclk=1_000_000,
+        input_source=lambda clock: (clock // 10) & 1,
+        initial_state=State(),
+    )
+
+    assert throughput.emulated
+    assert throughput.receive_words_per_second == pytest.approx(50_000)
+    assert throughput.receive_bits_per_second == pytest.approx(400_000)
+
+
+@pytest.mark.parametrize(
+    "name, value", [("sysclk", 0), ("clkdiv", 0.5), ("clkdiv", 65537)]
+)
+def test_throughput_rejects_invalid_values(name, value):
+    arguments = {"sysclk": 125_000_000, name: value}
+
+    with pytest.raises(ValueError, match=name):
+        calculate_throughput(SPI, SPI_CONFIG, **arguments)
@@ -0,0 +1,166 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import replace
+
+import pytest
+
+from pioemu import ReceiveSink, State, TransmitFeed
+from pioemu.trace_hash import (
+    TraceHashes,
+    TraceMismatch,
+    check_trace_hashes,
+    record_trace_hashes,
+)
+
+# pull block / set pins, 0 [7] / set x, 7 / out pins, 1 [6] / jmp x-- 3 / set pins, 1 [7]
+UART_TX = [0x80A0, 0xE700, 0xE027, 0x6601, 0x0043, 0xE701]
+
+UART_TX_STATE = State(pin_directions=1, pin_values=1)
+
+
+def _uart_tx_options(words):
+    return {"out_count": 1, "transmit_feed": TransmitFeed(words)}
+
+
+def test_recording_matches_same_emulation():
+    trace_hashes = record_trace_hashes(
+        UART_TX,
+        clock=10_000,
+        interval=1000,
+        initial_state=UART_TX_STATE,
+        **_uart_tx_options(range(200)),
+    )
+
+    assert len(trace_hashes.digests) == 10
+    assert len(trace_hashes.encode()) < 250
+    assert (
+        check_trace_hashes(
+            trace_hashes.encode(),
+            UART_TX,
+            initial_state=UART_TX_STATE,
+            **_uart_tx_options(range(200)),
+        )
+        is None
+    )
+
+
+def test_mismatch_reports_first_window_that_differs():
+    words = list(range(200))
+    trace_hashes = record_trace_hashes(
+        UART_TX,
+        clock=10_000,
+        interval=1000,
+        initial_state=UART_TX_STATE,
+        **_uart_tx_options(words),
+    )
+
+    # Word 50 is transmitted between clock cycles 4100 and 4182
+    words[50] = 0xFF
+
+    mismatch = check_trace_hashes(
+        trace_hashes, UART_TX, initial_state=UART_TX_STATE, **_uart_tx_options(words)
+    )
+
+    assert mismatch == TraceMismatch(window=4, start=4000, end=5000)
+
+
+@pytest.mark.parametrize(
+    "change_digests, expected_mismatch",
+    [
+        pytest.param(
+            lambda digests: digests[:-3],
+            TraceMismatch(window=7, start=7000, end=8000),
+            id="truncated",
+        ),
+        pytest.param(
+            lambda digests: digests + digests[:1],
+            TraceMismatch(window=10, start=10_000, end=11_000),
+            id="extra",
+        ),
+    ],
+)
+def test_mismatch_reports_missing_or_extra_window(change_digests, expected_mismatch):
+    trace_hashes = record_trace_hashes(
+        UART_TX,
+        clock=10_000,
+        interval=1000,
+        initial_state=UART_TX_STATE,
+        **_uart_tx_options(range(200)),
+    )
+
+    mismatch = check_trace_hashes(
+        replace(trace_hashes, digests=change_digests(trace_hashes.digests)),
+        UART_TX,
+        initial_state=UART_TX_STATE,
+        **_uart_tx_options(range(200)),
+    )
+
+    assert mismatch == expected_mismatch
+
+
+def test_hashes_are_stable_between_processes():
+    trace_hashes = record_trace_hashes(
+        [0xE081, 0xE101, 0xE000, 0x0001],  # set pindirs, 1 / set pins, 1 [1] / ...
+        clock=100,
+        fields=["pin_values"],
+        interval=50,
+    )
+
+    expected = "pin_values;50;0;100;e4143e4b90723761b4095dadf464e3fc"
+
+    assert trace_hashes.encode() == expected
+
+
+def test_hashes_do_not_depend_upon_how_cycles_are_divided():
+    # 'nop [1]' is equivalent to two 'nop' instructions as far as the pins are concerned
+    delayed = [0xE001, 0xA142, 0xE000]
+    unrolled = [0xE001, 0xA042, 0xA042, 0xE000]
+
+    trace_hashes = record_trace_hashes(delayed, clock=300, fields=["pin_values"])
+
+    assert check_trace_hashes(trace_hashes, unrolled) is None
+
+
+def test_emulation_halting_early_is_recorded():
+    trace_hashes = record_trace_hashes([0xE001, 0xE000, 0x0000], clock=100, interval=10)
+
+    mismatch = check_trace_hashes(trace_hashes, [0xE001, 0xE000, 0xE0E0])
+
+    assert mismatch == TraceMismatch(window=0, start=0, end=10)
+
+
+def test_receive_fifo_included_by_default():
+    trace_hashes = record_trace_hashes(
+        [0xE021, 0x4021, 0x8020],  # set x, 1 / in x, 1 / push
+        clock=64,
+        receive_sink=ReceiveSink([]),
+    )
+
+    mismatch = check_trace_hashes(
+        trace_hashes, [0xE020, 0x4021, 0x8020], receive_sink=ReceiveSink([])
+    )
+
+    assert mismatch == TraceMismatch(window=0, start=0, end=64)
+
+
+def test_decode_rejects_invalid_text():
+    with pytest.raises(ValueError, match="trace hashes"):
+        TraceHashes.decode("pin_values;50;0")
+
+
+def test_initial_state_must_match_recording():
+    trace_hashes = record_trace_hashes([0xA042], clock=10)
+
+    with pytest.raises(ValueError, match="initial_state"):
+        check_trace_hashes(trace_hashes, [0xA042], initial_state=State(clock=5))
@@ -0,0 +1,77 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from pioemu import State, clock_cycles_reached, emulate
+
+from ..opcodes import Opcodes
+from ..support import emulate_single_instruction
+
+
+@pytest.mark.parametrize(
+    "opcode, initial_flags, expected_flags",
+    [
+        pytest.param(0xC003, 0x00, 0x08, id="irq set 3"),
+        pytest.param(0xC007, 0x01, 0x81, id="irq set 7"),
+        pytest.param(0xC043, 0xFF, 0xF7, id="irq clear 3"),
+        pytest.param(0xC040, 0x00, 0x00, id="irq clear 0"),
+    ],
+)
+def test_irq_sets_and_clears_flags(
+    opcode: int, initial_flags: int, expected_flags: int
+):
+    _, new_state = emulate_single_instruction(
+        opcode,
+        initial_state=State(irq_flags=initial_flags),
+        advance_program_counter=True,
+    )
+
+    assert new_state.irq_flags == expected_flags
+    assert new_state.program_counter == 1
+
+
+@pytest.mark.parametrize(
+    "opcode, state_machine_number, expected_flags",
+    [
+        pytest.param(0xC011, 0, 0x02, id="irq set 1 rel on sm0"),
+        pytest.param(0xC011, 2, 0x08, id="irq set 1 rel on sm2"),
+        pytest.param(0xC011, 3, 0x01, id="irq set 1 rel on sm3"),
+        pytest.param(0xC016, 3, 0x20, id="irq set 6 rel on sm3"),
+    ],
+)
+def test_irq_supports_relative_indexes(
+    opcode: int, state_machine_number: int, expected_flags: int
+):
+    _, new_state = next(
+        emulate(
+            [opcode, Opcodes.nop()],
+            stop_when=clock_cycles_reached(1),
+            state_machine_number=state_machine_number,
+        )
+    )
+
+    assert new_state.irq_flags == expected_flags
+
+
+def test_irq_wait_sets_flag_and_stalls_while_flag_remains_set():
+    generator = emulate(
+        [0xC122, Opcodes.nop()],  # irq wait 2 [1]
+        stop_when=clock_cycles_reached(2),
+    )
+
+    states = [new_state for _, new_state in generator]
+
+    assert [state.irq_flags for state in states] == [0x04, 0x04]
+    assert [state.program_counter for state in states] == [0, 0]
+    assert [state.clock for state in states] == [1, 2]
@@ -11,9 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from collections import deque
+
 import pytest
 
-from pioemu import ShiftRegister, State
+from pioemu import ShiftRegister, State, clock_cycles_reached, emulate
 
 from ..support import emulate_single_instruction, instruction_param
 
@@ -206,6 +208,30 @@ instructions_to_test = [
         State(y_register=0x1_0000_0000),
         State(y_register=0x1_0000_0000, output_shift_register=ShiftRegister(0xFFFF_FFFF, 0)),
     ),
+    instruction_param(
+        "mov x :: y",
+        0xA032,
+        State(y_register=0x1234_5678),
+        State(y_register=0x1234_5678, x_register=0x1E6A_2C48),
+    ),
+    instruction_param(
+        "mov osr :: osr",
+        0xA0F7,
+        State(output_shift_register=ShiftRegister(0x0000_00F1, 24)),
+        State(output_shift_register=ShiftRegister(0x8F00_0000, 0)),
+    ),
+    instruction_param(
+        "mov isr :: pins",
+        0xA0D0,
+        State(pin_values=0x0000_0003),
+        State(pin_values=0x0000_0003, input_shift_register=ShiftRegister(0xC000_0000, 0)),
+    ),
+    instruction_param(
+        "mov exec x",
+        0xA081,
+        State(x_register=0x1234_E021),
+        State(x_register=0x1234_E021, exec_opcode=0xE021),
+    ),
 ]
 # fmt: on
 
@@ -217,3 +243,53 @@ def test_mov_instruction(opcode: int, initial_state: State, expected_state: Stat
     )
 
     assert new_state == expected_state
+
+
+# fmt: off
+@pytest.mark.parametrize("status_sel, status_n, initial_state, expected_value", [
+    pytest.param(0, 1, State(), 0xFFFF_FFFF, id="transmit fifo below level"),
+    pytest.param(0, 1, State(transmit_fifo=deque([1])), 0, id="transmit fifo at level"),
+    pytest.param(1, 2, State(receive_fifo=deque([1])), 0xFFFF_FFFF, id="receive fifo below level"),
+    pytest.param(1, 2, State(receive_fifo=deque([1, 2, 3])), 0, id="receive fifo above level"),
+    pytest.param(1, 0, State(), 0, id="never below level of zero"),
+])
+# fmt: on
+def test_mov_from_status(
+    status_sel: int, status_n: int, initial_state: State, expected_value: int
+):
+    # mov x, status
+    _, new_state = next(
+        emulate(
+            [0xA025],
+            stop_when=clock_cycles_reached(1),
+            initial_state=initial_state,
+            status_sel=status_sel,
+            status_n=status_n,
+        )
+    )
+
+    assert new_state.x_register == expected_value
+
+
+def test_mov_to_pins_uses_out_pins():
+    # mov pins, x
+    _, new_state = emulate_single_instruction(
+        0xA001,
+        initial_state=State(pin_values=0xFFFF_FFFF, x_register=0),
+        out_base=4,
+        out_count=8,
+    )
+
+    assert new_state.pin_values == 0xFFFF_F00F
+
+
+@pytest.mark.parametrize(
+    "opcode",
+    [
+        pytest.param(0xA038, id="reserved operation"),
+        pytest.param(0xA061, id="reserved destination"),
+        pytest.param(0xA024, id="reserved source"),
+    ],
+)
+def test_reserved_mov_variants_not_supported(opcode: int):
+    assert list(emulate([opcode], stop_when=clock_cycles_reached(1))) == []
@@ -120,6 +120,13 @@ def test_out_instruction_when_shifting_right(
         State(output_shift_register=ShiftRegister(0x06F5_6DF7, 5), input_shift_register=ShiftRegister(0x0000_000F, 5)),
         id="out isr, 5",
     ),
+
+    pytest.param(
+        0x60F0,
+        State(output_shift_register=ShiftRegister(0xDEAD_E021, 0)),
+        State(output_shift_register=ShiftRegister(0x0000_DEAD, 16), exec_opcode=0xE021),
+        id="out exec, 16",
+    ),
 ])
 # fmt: on
 def test_out_instruction(opcode, initial_state: State, expected_state: State):
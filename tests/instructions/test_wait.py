@@ -1,4 +1,4 @@
-# Copyright 2021, 2022, 2023 Nathan Young
+# Copyright 2021, 2022, 2023, 2026 Nathan Young
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -23,6 +23,8 @@ from ..support import emulate_single_instruction
     [
         pytest.param(0x2080, State(pin_values=0), id="wait 1 gpio, 0"),
         pytest.param(0x2020, State(pin_values=1), id="wait 0 pin, 0"),
+        pytest.param(0x20C2, State(irq_flags=0x00), id="wait 1 irq, 2"),
+        pytest.param(0x2042, State(irq_flags=0x04), id="wait 0 irq, 2"),
     ],
 )
 def test_wait_stalls_when_condition_not_met(opcode: int, initial_state: State):
@@ -38,6 +40,8 @@ def test_wait_stalls_when_condition_not_met(opcode: int, initial_state: State):
     [
         pytest.param(0x2080, State(pin_values=1), id="wait 1 gpio, 0"),
         pytest.param(0x2020, State(pin_values=0), id="wait 0 pin, 0"),
+        pytest.param(0x20C2, State(irq_flags=0x04), id="wait 1 irq, 2"),
+        pytest.param(0x2042, State(irq_flags=0x00), id="wait 0 irq, 2"),
     ],
 )
 def test_wait_advances_when_condition_met(opcode: int, initial_state: State):
@@ -46,3 +50,20 @@ def test_wait_advances_when_condition_met(opcode: int, initial_state: State):
     )
 
     assert new_state.program_counter == 1
+
+
+@pytest.mark.parametrize(
+    "opcode, initial_state, expected_irq_flags",
+    [
+        pytest.param(0x20C2, State(irq_flags=0x05), 0x01, id="wait 1 irq, 2"),
+        pytest.param(0x2042, State(irq_flags=0x01), 0x01, id="wait 0 irq, 2"),
+    ],
+)
+def test_wait_for_irq_clears_flag_when_polarity_is_one(
+    opcode: int, initial_state: State, expected_irq_flags: int
+):
+    _, new_state = emulate_single_instruction(
+        opcode, initial_state=initial_state, advance_program_counter=True
+    )
+
+    assert new_state.irq_flags == expected_irq_flags
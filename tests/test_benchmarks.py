@@ -0,0 +1,51 @@
+# Copyright 2026 Nathan Young
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from benchmarks.microbenchmarks import run_microbenchmarks
+from benchmarks.programs import PROGRAMS
+from benchmarks.run_benchmarks import run_benchmarks, run_program
+from benchmarks.startup import run_startup_benchmarks
+
+
+@pytest.mark.parametrize("engine", ["emulate", "emulate_until"])
+@pytest.mark.parametrize("program", PROGRAMS, ids=lambda program: program.name)
+def test_benchmark_program_runs_for_requested_cycles(program, engine):
+    assert run_program(program, 500, engine) >= 500
+
+
+def test_results_include_throughput_and_memory():
+    results = run_benchmarks(100, 1, ["square_wave"])
+
+    assert list(results["benchmarks"]) == ["square_wave"]
+    assert results["benchmarks"]["square_wave"]["cycles_per_second"] > 0
+    assert results["benchmarks"]["square_wave"]["peak_memory_bytes"] > 0
+
+
+def test_microbenchmark_results_include_time_and_allocations():
+    results = run_microbenchmarks(10, ["jmp_always", "set_x"])
+
+    assert list(results["microbenchmarks"]) == ["jmp_always", "set_x"]
+    assert results["microbenchmarks"]["set_x"]["nanoseconds_per_step"] > 0
+    assert results["microbenchmarks"]["set_x"]["retained_blocks_per_step"] > 0
+
+
+@pytest.mark.slow
+def test_startup_results_include_each_scenario():
+    results = run_startup_benchmarks(2, cold_runs=1)
+
+    assert all(
+        microseconds > 0 for microseconds in results["microseconds_per_call"].values()
+    )
+    assert results["cold_start_milliseconds"]["import_and_first_cycle"] > 0
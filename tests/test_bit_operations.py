@@ -13,7 +13,7 @@
 # limitations under the License.
 import pytest
 
-from pioemu.bit_operations import update_bits_32
+from pioemu.bit_operations import reverse_bits_32, update_bits_32
 
 
 @pytest.mark.parametrize(
@@ -35,3 +35,17 @@ def test_update_bits_32(
         update_bits_32(existing_value, new_value, bit_position, bit_count)
         == expected_value
     )
+
+
+@pytest.mark.parametrize(
+    "value, expected_value",
+    [
+        pytest.param(0x0000_0000, 0x0000_0000),
+        pytest.param(0x0000_0001, 0x8000_0000),
+        pytest.param(0x8000_0000, 0x0000_0001),
+        pytest.param(0x1234_5678, 0x1E6A_2C48),
+        pytest.param(0x1_0000_0003, 0xC000_0000),
+    ],
+)
+def test_reverse_bits_32(value, expected_value):
+    assert reverse_bits_32(value) == expected_value